@@ -13,6 +13,9 @@ sys.path.insert(0, str(project_root / "src"))
 
 from game.tablature_mode import TablatureGameMode
 from game.tuner_mode import TunerMode
+from game.calibration_mode import CalibrationMode
+from game.score_store import ScoreStore
+from game.ui.tablature_list import TablatureList
 from utils.config import *
 from music.tablature_manager import TablatureManager
 
@@ -22,57 +25,84 @@ class GameMenu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.clock = pygame.time.Clock()
         self.font_huge = pygame.font.Font(None, 96)
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 36)
+        self.font_small = pygame.font.Font(None, 26)
         
         self.manager = TablatureManager()
+        self.scores = ScoreStore()
+        self._leaderboard_cache = {}  # tablatura -> superficies del panel
+        self._text_cache = {}  # (fuente, texto, color) -> superficie renderizada
+    
+    def _text(self, font, text, color):
+        """Renderiza un texto una sola vez y reutiliza la superficie"""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color).convert_alpha()
+            self._text_cache[key] = surface
+        return surface
+    
+    def _wait_events(self):
+        """
+        Bloquea hasta el siguiente evento o MENU_EVENT_TIMEOUT_MS
+        
+        Returns:
+            list: Eventos pendientes (vacía si venció el timeout)
+        """
+        event = pygame.event.wait(MENU_EVENT_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
     
     def show_main_menu(self):
         """Muestra el menú principal"""
-        running = True
         selected = 0
-        options = ["Modo Juego", "Detector de Notas", "Salir"]
+        options = ["Modo Juego", "Detector de Notas", "Calibrar Latencia", "Salir"]
+        dirty = True  # Solo se redibuja tras un cambio
         
-        while running:
-            self.screen.fill(BACKGROUND_COLOR)
-            
-            # Título
-            title = self.font_huge.render("UKULELE HERO", True, (255, 100, 100))
-            title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 50))
-            self.screen.blit(title, title_rect)
-            
-            # Opciones
-            for idx, option in enumerate(options):
-                color = (255, 255, 100) if idx == selected else TEXT_COLOR
-                text = self.font_large.render(option, True, color)
-                text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, 200 + idx * 80))
-                self.screen.blit(text, text_rect)
-            
-            # Instrucciones
-            instr = self.font_medium.render("[FLECHAS]: Navegar | [ENTER]: Seleccionar", True, (150, 150, 150))
-            instr_rect = instr.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
-            self.screen.blit(instr, instr_rect)
-            
-            pygame.display.flip()
+        while True:
+            if dirty:
+                self._draw_main_menu(options, selected)
+                pygame.display.flip()
+                dirty = False
             
             # Manejo de eventos
-            for event in pygame.event.get():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     return None
                 
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty = True
+                
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_UP:
                         selected = (selected - 1) % len(options)
+                        dirty = True
                     elif event.key == pygame.K_DOWN:
                         selected = (selected + 1) % len(options)
+                        dirty = True
                     elif event.key == pygame.K_RETURN:
                         return selected
-            
-            self.clock.tick(FPS)
+    
+    def _draw_main_menu(self, options, selected):
+        """Dibuja el menú principal con superficies cacheadas"""
+        self.screen.fill(BACKGROUND_COLOR)
+        
+        # Título
+        title = self._text(self.font_huge, "UKULELE HERO", (255, 100, 100))
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH // 2, 50)))
+        
+        # Opciones
+        for idx, option in enumerate(options):
+            color = (255, 255, 100) if idx == selected else TEXT_COLOR
+            text = self._text(self.font_large, option, color)
+            self.screen.blit(text, text.get_rect(center=(WINDOW_WIDTH // 2, 200 + idx * 80)))
         
-        return None
+        # Instrucciones
+        instr = self._text(self.font_medium, "[FLECHAS]: Navegar | [ENTER]: Seleccionar", (150, 150, 150))
+        self.screen.blit(instr, instr.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50)))
     
     def show_tablature_select(self):
         """Muestra selector de tablaturas"""
@@ -83,49 +113,92 @@ class GameMenu:
             input("Presiona ENTER para continuar...")
             return None
         
-        running = True
-        selected = 0
+        # Solo se dibujan las filas visibles; los metadatos se leen al mostrarlas
+        tab_list = TablatureList(
+            tablatures, pygame.Rect(40, 80, WINDOW_WIDTH - 420, WINDOW_HEIGHT - 180),
+            self.font_medium, self.font_small, info_provider=self.manager.get_tablature_info
+        )
+        dirty = True
         
-        while running:
-            self.screen.fill(BACKGROUND_COLOR)
-            
-            # Título
-            title = self.font_large.render("Selecciona una Tablatura", True, TEXT_COLOR)
-            title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 40))
-            self.screen.blit(title, title_rect)
-            
-            # Lista de tablaturas
-            for idx, tab_name in enumerate(tablatures):
-                color = (255, 255, 100) if idx == selected else TEXT_COLOR
-                text = self.font_medium.render(f"  {tab_name}", True, color)
-                self.screen.blit(text, (50, 120 + idx * 50))
-            
-            # Instrucciones
-            instr = self.font_medium.render("[FLECHAS]: Navegar | [ENTER]: Seleccionar | [ESC]: Atrás", 
-                                           True, (150, 150, 150))
-            instr_rect = instr.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
-            self.screen.blit(instr, instr_rect)
-            
-            pygame.display.flip()
+        while True:
+            if dirty:
+                self._draw_tablature_select(tab_list)
+                pygame.display.flip()
+                dirty = False
             
             # Manejo de eventos
-            for event in pygame.event.get():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     return None
                 
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    dirty = True
+                
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP:
-                        selected = (selected - 1) % len(tablatures)
-                    elif event.key == pygame.K_DOWN:
-                        selected = (selected + 1) % len(tablatures)
-                    elif event.key == pygame.K_RETURN:
-                        return tablatures[selected]
-                    elif event.key == pygame.K_ESCAPE:
+                    action = tab_list.handle_key(event)
+                    if action == TablatureList.SELECT:
+                        return tab_list.get_selected()
+                    elif action == TablatureList.BACK:
                         return None
+                    elif action:
+                        dirty = True
+    
+    def _draw_tablature_select(self, tab_list):
+        """Dibuja el selector de tablaturas con superficies cacheadas"""
+        self.screen.fill(BACKGROUND_COLOR)
+        
+        # Título
+        title = self._text(self.font_large, "Selecciona una Tablatura", TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH // 2, 40)))
+        
+        # Lista de tablaturas (solo filas visibles)
+        tab_list.draw(self.screen)
+        
+        # Mejores puntuaciones de la tablatura seleccionada
+        selected = tab_list.get_selected()
+        if selected:
+            self._draw_leaderboard(selected)
+        
+        # Instrucciones
+        instr = self._text(self.font_small,
+                           "[FLECHAS/RePág/AvPág]: Navegar | [Escribir]: Buscar | [ENTER]: Seleccionar | [ESC]: Atrás",
+                           (150, 150, 150))
+        self.screen.blit(instr, instr.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50)))
+    
+    def _draw_leaderboard(self, tab_name):
+        """Dibuja el top de puntuaciones y la mejor marca personal de una tablatura"""
+        lines = self._leaderboard_cache.get(tab_name)
+        
+        if lines is None:
+            top = self.scores.top_scores(tab_name, DEFAULT_DIFFICULTY, LEADERBOARD_SIZE)
+            best = self.scores.personal_best(tab_name, PLAYER_NAME, DEFAULT_DIFFICULTY)
             
-            self.clock.tick(FPS)
+            lines = [self.font_medium.render("Mejores puntuaciones", True, (255, 255, 100))]
+            if not top:
+                lines.append(self.font_small.render("Sin partidas todavía", True, (150, 150, 150)))
+            for rank, entry in enumerate(top, 1):
+                text = f"{rank}. {entry['player']}  {entry['score']}  ({entry['accuracy']:.0f}%)"
+                lines.append(self.font_small.render(text, True, TEXT_COLOR))
+            if best:
+                text = f"Tu mejor marca: {best['score']} ({best['accuracy']:.0f}%)"
+                lines.append(self.font_small.render(text, True, (100, 255, 100)))
+            
+            self._leaderboard_cache[tab_name] = lines
         
-        return None
+        y = 120
+        for surface in lines:
+            self.screen.blit(surface, (WINDOW_WIDTH - 340, y))
+            y += 34
+    
+    def refresh_scores(self, tab_name):
+        """Invalida el panel de una tablatura tras jugarla"""
+        self.scores.flush()
+        self._leaderboard_cache.pop(tab_name, None)
+    
+    def close(self):
+        """Guarda las puntuaciones y tablaturas pendientes"""
+        self.scores.close()
+        self.manager.flush()
 
 
 def main():
@@ -152,20 +225,26 @@ def main():
             
             if tab_name:
                 # Crear modo juego
-                game_mode = TablatureGameMode(screen)
+                game_mode = TablatureGameMode(screen, score_store=menu.scores, tab_manager=menu.manager)
                 
                 # Cargar tablatura
                 if game_mode.load_tablature(tab_name):
                     # Iniciar juego
                     game_mode.start()
+                    menu.refresh_scores(tab_name)
         
         elif choice == 1:  # Detector de Notas
             tuner = TunerMode(screen)
             tuner.start()
         
-        elif choice == 2:  # Salir
+        elif choice == 2:  # Calibrar Latencia
+            calibration = CalibrationMode(screen)
+            calibration.start()
+        
+        elif choice == 3:  # Salir
             break
     
+    menu.close()
     pygame.quit()
     print("\n¡Gracias por jugar Ukulele Hero!")
 
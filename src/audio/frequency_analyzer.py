@@ -13,12 +13,16 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 from utils.config import SAMPLE_RATE, MIN_FREQUENCY, MAX_FREQUENCY
+from music.instruments import get_instrument
 
 
 class FrequencyAnalyzer:
     """Analizador de frecuencia para detectar notas musicales"""
     
-    def __init__(self, sample_rate=SAMPLE_RATE, window_size=4096):
+    # Muestras por análisis FFT (por defecto)
+    WINDOW_SIZE = 4096
+    
+    def __init__(self, sample_rate=SAMPLE_RATE, window_size=WINDOW_SIZE, instrument=None):
         self.sample_rate = sample_rate
         self.window_size = window_size
         
@@ -28,9 +32,15 @@ class FrequencyAnalyzer:
         # Frecuencias correspondientes a cada bin de la FFT
         self.freqs = np.fft.rfftfreq(window_size, 1/sample_rate)
         
-        # Rango de frecuencias de interés (para ukulele: desde C3 hasta E6)
-        self.min_freq = MIN_FREQUENCY
-        self.max_freq = MAX_FREQUENCY
+        # Rango de frecuencias de interés (por defecto el del instrumento de
+        # config; para ukulele soprano: desde C3 hasta E6)
+        if instrument is None:
+            self.min_freq = MIN_FREQUENCY
+            self.max_freq = MAX_FREQUENCY
+        else:
+            profile = get_instrument(instrument)
+            self.min_freq = profile.min_frequency
+            self.max_freq = profile.max_frequency
         
     def analyze_frequency(self, audio_data):
         """
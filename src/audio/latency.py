@@ -0,0 +1,165 @@
+"""
+Calibración de la latencia de entrada de audio
+Mide el retraso entre una pulsación y su detección, y lo guarda por dispositivo
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import LATENCY_PROFILE_FILE, CALIBRATION_MATCH_WINDOW, CALIBRATION_CLICK_REJECT_CENTS
+
+
+class LatencyCalibrator:
+    """Compara onsets detectados con los tiempos esperados de una pista de clicks"""
+
+    def __init__(self, expected_times, match_window=CALIBRATION_MATCH_WINDOW, click_frequency=None,
+                 reject_cents=CALIBRATION_CLICK_REJECT_CENTS):
+        """
+        Inicializa el calibrador
+
+        Args:
+            expected_times (list): Tiempos esperados de cada click (segundos)
+            match_window (float): Distancia máxima aceptada entre click y onset
+            click_frequency (float): Tono del click en Hz; los onsets a esa
+                                     altura son el propio click oído por el
+                                     micrófono y se descartan
+            reject_cents (float): Distancia al tono del click que se descarta
+        """
+        self.expected_times = np.asarray(sorted(expected_times), dtype=np.float64)
+        self.match_window = match_window
+        self.click_frequency = click_frequency
+        self.reject_cents = reject_cents
+        self.onsets = []
+
+    def add_onset(self, onset_time, frequency=None):
+        """
+        Registra un onset detectado
+
+        Args:
+            onset_time (float): Tiempo del onset en la misma línea de tiempo que los clicks
+            frequency (float): Frecuencia detectada en Hz (para descartar el click)
+
+        Returns:
+            bool: False si el onset se descartó por ser el click
+        """
+        if self.click_frequency and frequency:
+            cents = 1200 * np.log2(frequency / self.click_frequency)
+            if abs(cents) < self.reject_cents:
+                return False
+
+        self.onsets.append(onset_time)
+        return True
+
+    def get_errors(self):
+        """
+        Empareja cada click con el primer onset dentro de su ventana
+
+        Returns:
+            numpy.array: Errores (onset - click) de los clicks emparejados
+        """
+        if not self.onsets or len(self.expected_times) == 0:
+            return np.array([])
+
+        onsets = np.sort(np.asarray(self.onsets, dtype=np.float64))
+        errors = []
+
+        for expected in self.expected_times:
+            # Primer onset dentro de la ventana alrededor del click
+            idx = np.searchsorted(onsets, expected - self.match_window)
+            if idx < len(onsets) and onsets[idx] <= expected + self.match_window:
+                errors.append(onsets[idx] - expected)
+
+        return np.array(errors)
+
+    def compute_offset(self, min_matches=4):
+        """
+        Calcula el offset de latencia
+
+        Usa la mediana de los errores y descarta valores atípicos (más de 3
+        desviaciones absolutas medianas) antes de promediar.
+
+        Args:
+            min_matches (int): Mínimo de clicks emparejados para un resultado válido
+
+        Returns:
+            dict: {'offset': float, 'jitter': float, 'matches': int} o None
+        """
+        errors = self.get_errors()
+        if len(errors) < min_matches:
+            return None
+
+        median = np.median(errors)
+        mad = np.median(np.abs(errors - median))
+        if mad > 0:
+            errors = errors[np.abs(errors - median) <= 3 * mad]
+
+        return {
+            'offset': float(np.mean(errors)),
+            'jitter': float(np.std(errors)),
+            'matches': int(len(errors))
+        }
+
+
+class LatencyProfileStore:
+    """Persiste el offset de latencia calibrado para cada dispositivo de entrada"""
+
+    def __init__(self, profile_file=LATENCY_PROFILE_FILE):
+        self.profile_file = Path(profile_file)
+
+    def _load(self):
+        """Lee el archivo de perfiles"""
+        if not self.profile_file.exists():
+            return {}
+
+        try:
+            with open(self.profile_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('devices', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No se pudo leer perfil de latencia: {e}")
+            return {}
+
+    def get_offset(self, device_name):
+        """
+        Obtiene el offset calibrado de un dispositivo
+
+        Args:
+            device_name (str): Nombre del dispositivo de entrada
+
+        Returns:
+            float: Offset en segundos (0.0 si no está calibrado)
+        """
+        profile = self._load().get(device_name or 'default')
+        if not profile:
+            return 0.0
+        return profile.get('offset', 0.0)
+
+    def save_offset(self, device_name, result):
+        """
+        Guarda el resultado de una calibración
+
+        Args:
+            device_name (str): Nombre del dispositivo de entrada
+            result (dict): Resultado de LatencyCalibrator.compute_offset
+        """
+        devices = self._load()
+        devices[device_name or 'default'] = {
+            'offset': result['offset'],
+            'jitter': result['jitter'],
+            'matches': result['matches'],
+            'updated': datetime.now().isoformat(timespec='seconds')
+        }
+
+        self.profile_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.profile_file, 'w', encoding='utf-8') as f:
+            json.dump({'devices': devices}, f, indent=2, ensure_ascii=False)
+
+        print(f"✅ Latencia guardada para '{device_name}': {result['offset'] * 1000:.1f} ms")
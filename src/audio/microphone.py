@@ -15,6 +15,7 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 from utils.config import SAMPLE_RATE, BUFFER_SIZE, CHANNELS
+from utils.clock import AudioClockSync
 
 
 class MicrophoneCapture:
@@ -33,8 +34,14 @@ class MicrophoneCapture:
         self.audio_buffer = np.zeros(buffer_size * 4)  # Buffer más grande para análisis
         self.buffer_lock = threading.Lock()
         
+        # Relación entre el reloj del stream y perf_counter (timestamps de detección)
+        self.clock_sync = AudioClockSync()
+        self.block_listeners = []  # Callables (bloque, tiempo de stream) por bloque capturado
+        
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback para procesar datos de audio entrantes"""
+        host_ns = time.perf_counter_ns()
+        
         if status:
             print(f"Estado de audio: {status}")
         
@@ -47,9 +54,23 @@ class MicrophoneCapture:
             self.audio_buffer[:-len(audio_data)] = self.audio_buffer[len(audio_data):]
             # Agregar nuevos datos
             self.audio_buffer[-len(audio_data):] = audio_data
+        
+        # Registrar el bloque en el reloj de audio
+        self.clock_sync.observe_block(
+            time_info.inputBufferAdcTime,
+            time_info.currentTime,
+            frames,
+            self.sample_rate,
+            host_ns
+        )
+        
+        for listener in self.block_listeners:
+            listener(audio_data, self.clock_sync.last_block_end)
     
     def start_capture(self):
         """Inicia la captura de audio"""
+        self.clock_sync.reset()
+        
         try:
             # Configurar stream de audio con sounddevice
             self.stream = sd.InputStream(
@@ -112,6 +133,20 @@ class MicrophoneCapture:
                 
         return devices
     
+    def get_device_name(self):
+        """
+        Obtiene el nombre del dispositivo de entrada en uso
+        
+        Returns:
+            str: Nombre del dispositivo ('default' si no se puede consultar)
+        """
+        try:
+            if self.device_index is None:
+                return sd.query_devices(kind='input')['name']
+            return sd.query_devices(self.device_index)['name']
+        except Exception:
+            return 'default'
+    
     def set_input_device(self, device_index):
         """
         Configura el dispositivo de entrada
@@ -10,19 +10,34 @@ current_dir = Path(__file__).parent.parent
 if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
-from audio.microphone import MicrophoneCapture
 from audio.frequency_analyzer import FrequencyAnalyzer
 from utils.helpers import frequency_to_note, get_tuning_status
-from utils.config import MIN_VOLUME_THRESHOLD
+from utils.config import MIN_VOLUME_THRESHOLD, ONSET_ENERGY_RATIO, INSTRUMENT
+from music.instruments import get_instrument
 import time
 
 
 class NoteDetector:
     """Detector de notas musicales en tiempo real"""
     
-    def __init__(self):
-        self.microphone = MicrophoneCapture()
+    def __init__(self, microphone=None, instrument=None):
+        """
+        Inicializa el detector
+        
+        Args:
+            microphone: Fuente de audio (por defecto MicrophoneCapture). Cualquier
+                        objeto con su misma interfaz sirve, p. ej. RecordedAudioSource
+            instrument (str): Perfil de music.instruments que fija la banda de
+                              detección y las notas posibles (por defecto INSTRUMENT)
+        """
+        if microphone is None:
+            # Import diferido: sounddevice requiere PortAudio instalado
+            from audio.microphone import MicrophoneCapture
+            microphone = MicrophoneCapture()
+        
+        self.microphone = microphone
         self.analyzer = FrequencyAnalyzer()
+        self.set_instrument(instrument or INSTRUMENT)
         
         self.is_detecting = False
         self.current_note = None
@@ -34,6 +49,24 @@ class NoteDetector:
         self.detection_history = []
         self.history_size = 5
         
+        # Onsets: ataque detectado por subida de energía entre bloques (también
+        # con la misma nota) o cambio de nota sin ataque (ligados)
+        self._last_reported_note = None
+        self._last_volume = 0.0
+        self._attack_pending = False
+        
+    def set_instrument(self, instrument):
+        """
+        Ajusta la banda de detección y las notas posibles a un instrumento
+        
+        Args:
+            instrument (str): Perfil de music.instruments
+        """
+        self.instrument = get_instrument(instrument)
+        self.analyzer.min_freq = self.instrument.min_frequency
+        self.analyzer.max_freq = self.instrument.max_frequency
+        self.note_frequencies = self.instrument.note_frequencies()
+        
     def start_detection(self):
         """Inicia la detección de notas"""
         success = self.microphone.start_capture()
@@ -58,15 +91,25 @@ class NoteDetector:
         if not self.is_detecting:
             return None
         
-        # Obtener datos de audio
+        # Obtener datos de audio y el tiempo de stream de su último sample
+        stream_time = self.microphone.clock_sync.last_block_end
         audio_data = self.microphone.get_audio_data()
         
         # Verificar volumen mínimo
         volume = self.microphone.get_volume_level()
         if volume < MIN_VOLUME_THRESHOLD:
             self._reset_detection()
+            self._last_volume = volume
+            self._attack_pending = False
             return None
         
+        # Ataque: la energía sube respecto al bloque anterior. El suavizado
+        # empieza de cero y el onset queda pendiente hasta reportar una nota
+        if volume > self._last_volume * ONSET_ENERGY_RATIO:
+            self.detection_history.clear()
+            self._attack_pending = True
+        self._last_volume = volume
+        
         # Analizar frecuencia
         analysis = self.analyzer.analyze_frequency(audio_data)
         frequency = analysis['frequency']
@@ -78,7 +121,7 @@ class NoteDetector:
             return None
         
         # Convertir frecuencia a nota
-        note, deviation = frequency_to_note(frequency)
+        note, deviation = frequency_to_note(frequency, self.note_frequencies)
         if note is None:
             self._reset_detection()
             return None
@@ -100,6 +143,10 @@ class NoteDetector:
         
         # Actualizar estado actual
         if note_result:
+            onset = self._attack_pending or note_result['note'] != self._last_reported_note
+            self._attack_pending = False
+            self._last_reported_note = note_result['note']
+            
             self.current_note = note_result['note']
             self.current_frequency = note_result['frequency']
             self.current_confidence = note_result['confidence']
@@ -111,7 +158,9 @@ class NoteDetector:
                 'confidence': self.current_confidence,
                 'deviation': self.current_deviation,
                 'tuning_status': get_tuning_status(self.current_deviation),
-                'volume': volume
+                'volume': volume,
+                'stream_time': stream_time,
+                'onset': onset
             }
         
         return None
@@ -123,6 +172,7 @@ class NoteDetector:
         self.current_confidence = 0.0
         self.current_deviation = 0.0
         self.detection_history.clear()
+        self._last_reported_note = None
     
     def _get_most_likely_note(self):
         """
@@ -214,6 +264,10 @@ class NoteDetector:
             print("No se detectó la nota durante la calibración")
             return None
     
+    def get_device_name(self):
+        """Obtiene el nombre del dispositivo de entrada en uso"""
+        return self.microphone.get_device_name()
+    
     def get_available_input_devices(self):
         """Obtiene lista de dispositivos de entrada disponibles"""
         return self.microphone.get_input_devices()
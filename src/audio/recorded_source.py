@@ -0,0 +1,139 @@
+"""
+Fuente de audio grabado con la misma interfaz que MicrophoneCapture
+Permite ejecutar la detección sobre un WAV o un array NumPy sin hardware de audio
+"""
+
+import numpy as np
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import SAMPLE_RATE, BUFFER_SIZE
+from utils.clock import AudioClockSync
+
+
+class RecordedAudioSource:
+    """Reproduce una grabación en bloques bajo demanda (tiempo virtual)"""
+
+    def __init__(self, audio, sample_rate=SAMPLE_RATE, buffer_size=BUFFER_SIZE):
+        """
+        Inicializa la fuente
+
+        Args:
+            audio (numpy.array): Samples (mono o multicanal)
+            sample_rate (int): Frecuencia de muestreo de 'audio'
+            buffer_size (int): Tamaño de bloque, igual que el stream en vivo
+        """
+        audio = np.asarray(audio, dtype=np.float64)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+
+        # El analizador trabaja a SAMPLE_RATE: remuestrear si hace falta
+        if sample_rate != SAMPLE_RATE:
+            from math import gcd
+            from scipy.signal import resample_poly
+            factor = gcd(int(sample_rate), SAMPLE_RATE)
+            audio = resample_poly(audio, SAMPLE_RATE // factor, int(sample_rate) // factor)
+
+        self.audio = audio
+        self.sample_rate = SAMPLE_RATE
+        self.buffer_size = buffer_size
+
+        self.audio_buffer = np.zeros(buffer_size * 4)
+        self.clock_sync = AudioClockSync()
+        self.block_listeners = []  # Callables (bloque, tiempo de stream) por bloque entregado
+        self.host_offset = 0.0  # Segundos host - stream para las observaciones
+        self.position = 0  # Siguiente sample a entregar
+        self.is_recording = False
+
+    @classmethod
+    def from_wav(cls, wav_path, buffer_size=BUFFER_SIZE):
+        """
+        Crea la fuente a partir de un archivo WAV
+
+        Args:
+            wav_path (str): Ruta al archivo WAV
+
+        Returns:
+            RecordedAudioSource: Fuente con el audio normalizado a [-1, 1]
+        """
+        from scipy.io import wavfile
+
+        sample_rate, data = wavfile.read(str(wav_path))
+        if np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float64) / np.iinfo(data.dtype).max
+        return cls(data, sample_rate, buffer_size)
+
+    @property
+    def duration(self):
+        """Duración de la grabación en segundos"""
+        return len(self.audio) / self.sample_rate
+
+    def start_capture(self):
+        """Reinicia la reproducción desde el principio"""
+        self.clock_sync.reset()
+        self.audio_buffer[:] = 0
+        self.position = 0
+        self.is_recording = True
+        return True
+
+    def stop_capture(self):
+        """Detiene la reproducción"""
+        self.is_recording = False
+
+    def advance_to(self, stream_time):
+        """
+        Entrega todos los bloques completos hasta stream_time
+
+        Args:
+            stream_time (float): Tiempo de stream actual en segundos
+        """
+        if not self.is_recording:
+            return
+
+        target = int(stream_time * self.sample_rate)
+
+        while self.position + self.buffer_size <= target:
+            block = self.audio[self.position:self.position + self.buffer_size]
+            frames = self.buffer_size
+
+            self.audio_buffer[:-frames] = self.audio_buffer[frames:]
+            self.audio_buffer[-frames:] = 0
+            self.audio_buffer[-frames:][:len(block)] = block
+
+            block_start = self.position / self.sample_rate
+            block_end = (self.position + frames) / self.sample_rate
+            self.clock_sync.observe_block(
+                block_start, block_end, frames, self.sample_rate,
+                host_ns=int((block_end + self.host_offset) * 1e9)
+            )
+            for listener in self.block_listeners:
+                listener(block, block_end)
+            self.position += frames
+
+    def get_audio_data(self, length=None):
+        """Obtiene los samples más recientes entregados"""
+        if length is None:
+            length = self.buffer_size
+        return self.audio_buffer[-length:].copy()
+
+    def get_volume_level(self):
+        """Nivel RMS del último bloque"""
+        audio_data = self.get_audio_data()
+        return np.sqrt(np.mean(audio_data ** 2))
+
+    def get_device_name(self):
+        """Nombre del dispositivo (fijo para grabaciones)"""
+        return 'recording'
+
+    def get_input_devices(self):
+        """Las grabaciones no tienen dispositivos de entrada"""
+        return []
+
+    def is_active(self):
+        """Verifica si la reproducción está activa"""
+        return self.is_recording
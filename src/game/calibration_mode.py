@@ -0,0 +1,198 @@
+"""
+Modo Calibración de Latencia
+Reproduce una pista de clicks y mide el retraso con el que se detecta cada pulsación
+"""
+
+import pygame
+import numpy as np
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from audio.note_detector import NoteDetector
+from audio.latency import LatencyCalibrator, LatencyProfileStore
+from utils.clock import GameClock
+from utils.config import *
+
+
+class CalibrationMode:
+    """Modo de calibración de la latencia de entrada por dispositivo"""
+
+    LEAD_IN = 2.0  # Segundos antes del primer click
+    TAIL = 1.0  # Segundos de espera después del último click
+    CLICK_DURATION = 0.08  # Duración del click en segundos
+    FLASH_DURATION = 0.1  # Duración del destello visual del click
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.clock = pygame.time.Clock()
+
+        self.note_detector = NoteDetector()
+        self.game_clock = GameClock()
+        self.profile_store = LatencyProfileStore()
+
+        # Fuentes
+        self.font_large = pygame.font.Font(None, FONT_XLARGE)
+        self.font_medium = pygame.font.Font(None, FONT_MEDIUM)
+        self.font_small = pygame.font.Font(None, FONT_SMALL)
+
+        # Pista de clicks
+        self.click_times = [
+            self.LEAD_IN + i * CALIBRATION_CLICK_INTERVAL
+            for i in range(CALIBRATION_CLICK_COUNT)
+        ]
+        self.click_sound = self._create_click_sound()
+        self.next_click = 0
+
+        # Estado
+        self.is_running = False
+        self.calibrator = None
+        self.result = None
+        self.saved = False
+        self.device_name = None
+        self.current_time = 0.0
+
+    def _create_click_sound(self):
+        """
+        Sintetiza el click como un tono corto de CALIBRATION_CLICK_FREQUENCY
+
+        Returns:
+            pygame.mixer.Sound: Sonido del click o None si no hay mixer
+        """
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            mixer_freq, _, mixer_channels = pygame.mixer.get_init()
+        except pygame.error as e:
+            print(f"⚠️ Sin salida de audio, calibración solo visual: {e}")
+            return None
+
+        n_samples = int(mixer_freq * self.CLICK_DURATION)
+        t = np.arange(n_samples) / mixer_freq
+        envelope = np.exp(-t * 40)  # Decaimiento rápido tipo pulsación
+        wave = np.sin(2 * np.pi * CALIBRATION_CLICK_FREQUENCY * t) * envelope
+        samples = (wave * 0.8 * 32767).astype(np.int16)
+
+        if mixer_channels > 1:
+            samples = np.repeat(samples[:, np.newaxis], mixer_channels, axis=1)
+
+        return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+    def start(self):
+        """Inicia la calibración"""
+        print("[CALIBRATION] Iniciando calibración de latencia...")
+
+        if not self.note_detector.start_detection():
+            print("[ERROR] No se pudo iniciar la detección de audio")
+            return False
+
+        self.device_name = self.note_detector.get_device_name()
+        self._reset()
+
+        self.is_running = True
+        self.run()
+        return True
+
+    def stop(self):
+        """Detiene la calibración"""
+        self.is_running = False
+        self.note_detector.stop_detection()
+
+    def _reset(self):
+        """Reinicia la pista de clicks y las mediciones"""
+        self.calibrator = LatencyCalibrator(self.click_times, click_frequency=CALIBRATION_CLICK_FREQUENCY)
+        self.result = None
+        self.saved = False
+        self.next_click = 0
+
+        self.game_clock.attach_audio(self.note_detector.microphone.clock_sync)
+        self.game_clock.start()
+
+    def run(self):
+        """Bucle principal de la calibración"""
+        while self.is_running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.stop()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        self.stop()
+                    elif event.key == pygame.K_r:
+                        self._reset()
+                    elif event.key == pygame.K_RETURN and self.result and not self.saved:
+                        self.profile_store.save_offset(self.device_name, self.result)
+                        self.saved = True
+
+            self._update()
+            self._draw()
+            self.clock.tick(FPS)
+
+    def _update(self):
+        """Reproduce clicks pendientes y registra onsets detectados"""
+        self.current_time = self.game_clock.now()
+
+        # Disparar el click cuando llega su tiempo
+        if self.next_click < len(self.click_times):
+            if self.current_time >= self.click_times[self.next_click]:
+                if self.click_sound:
+                    self.click_sound.play()
+                self.next_click += 1
+
+        detection = self.note_detector.update()
+        if detection and detection['onset'] and self.result is None:
+            onset_time = self.game_clock.stream_to_game_time(detection['stream_time'])
+            if onset_time is None:
+                onset_time = self.current_time
+            self.calibrator.add_onset(onset_time, detection['frequency'])
+
+        # Calcular resultado al terminar la pista
+        if self.result is None and self.current_time > self.click_times[-1] + self.TAIL:
+            self.result = self.calibrator.compute_offset() or {}
+
+    def _draw(self):
+        """Dibuja la interfaz de calibración"""
+        self.screen.fill(BACKGROUND_COLOR)
+
+        title = self.font_large.render("CALIBRACIÓN DE LATENCIA", True, HIGHLIGHT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(WINDOW_WIDTH // 2, 80)))
+
+        device = self.font_small.render(f"Dispositivo: {self.device_name}", True, TEXT_COLOR)
+        self.screen.blit(device, device.get_rect(center=(WINDOW_WIDTH // 2, 120)))
+
+        # Indicador visual de cada click
+        flashing = any(
+            0 <= self.current_time - t < self.FLASH_DURATION for t in self.click_times
+        )
+        color = SUCCESS_COLOR if flashing else (60, 60, 60)
+        pygame.draw.circle(self.screen, color, (WINDOW_WIDTH // 2, 300), 60)
+
+        if self.result is None:
+            lines = [
+                "Toca una cuerda al ritmo de cada click",
+                f"Click {self.next_click}/{len(self.click_times)} | "
+                f"Onsets detectados: {len(self.calibrator.onsets)}"
+            ]
+        elif self.result:
+            status = "[GUARDADO]" if self.saved else "ENTER: Guardar"
+            lines = [
+                f"Latencia: {self.result['offset'] * 1000:.1f} ms "
+                f"(±{self.result['jitter'] * 1000:.1f} ms, {self.result['matches']} clicks)",
+                status
+            ]
+        else:
+            lines = ["No se detectaron suficientes pulsaciones", "R: Repetir"]
+
+        y = 420
+        for line in lines:
+            text = self.font_medium.render(line, True, TEXT_COLOR)
+            self.screen.blit(text, text.get_rect(center=(WINDOW_WIDTH // 2, y)))
+            y += 40
+
+        instructions = self.font_small.render("R: Repetir | ESC: Volver", True, (150, 150, 150))
+        self.screen.blit(instructions, instructions.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40)))
+
+        pygame.display.flip()
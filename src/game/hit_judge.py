@@ -0,0 +1,149 @@
+"""
+Motor de juicio de notas
+Empareja detecciones con notas pendientes dentro de ventanas de tiempo y afinación
+"""
+
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import JUDGMENT_WINDOWS, DEFAULT_DIFFICULTY
+
+
+class HitJudge:
+    """
+    Juzga detecciones contra las notas de una tablatura
+
+    Las notas se mantienen ordenadas por start_time; cada detección busca con
+    bisect solo las notas dentro de la ventana OK alrededor de su timestamp,
+    así que el coste por detección es O(log n) más las pocas notas de la ventana.
+    """
+
+    PERFECT = 'PERFECT'
+    GOOD = 'GOOD'
+    OK = 'OK'
+
+    def __init__(self, notes, difficulty=DEFAULT_DIFFICULTY, windows=None, start_times=None):
+        """
+        Inicializa el juez
+
+        Args:
+            notes (list): Notas con 'start_time' y 'pitch', ordenadas por start_time
+            difficulty (str): Dificultad en JUDGMENT_WINDOWS
+            windows (dict): Ventanas explícitas (sustituyen a la dificultad)
+            start_times (list): Columna start_time ya ordenada de las notas
+                                (se comparte; por defecto se extrae de notes)
+        """
+        self.notes = notes
+        if start_times is None:
+            start_times = [note['start_time'] for note in notes]
+        self.start_times = start_times
+        self.windows = windows or JUDGMENT_WINDOWS[difficulty]
+
+        self.judged = [False] * len(notes)
+        self._miss_cursor = 0  # Primera nota que aún puede no haber expirado
+
+    @staticmethod
+    def notes_from_tablature(ui_tablature, strings):
+        """
+        Construye la lista de notas a juzgar a partir del formato UI
+
+        Args:
+            ui_tablature (dict): Resultado de TablatureManager.export_to_ui_format
+            strings (list): Orden de las cuerdas
+
+        Returns:
+            list: Copias de las notas (con 'string') ordenadas por start_time
+        """
+        notes = []
+        for string_name in strings:
+            for note in ui_tablature['strings'][string_name]:
+                # Copia por partida: el juego anota 'x' y 'hit' en cada nota
+                notes.append(dict(note, string=string_name))
+
+        notes.sort(key=lambda n: n['start_time'])
+        return notes
+
+    def _grade(self, time_error):
+        """Clasifica un error de tiempo absoluto"""
+        if time_error <= self.windows['perfect']:
+            return self.PERFECT
+        if time_error <= self.windows['good']:
+            return self.GOOD
+        return self.OK
+
+    def judge(self, detection_time, detected_pitch):
+        """
+        Juzga una detección
+
+        Args:
+            detection_time (float): Tiempo de juego de la detección (compensado)
+            detected_pitch (float): Número MIDI fraccionario detectado
+
+        Returns:
+            dict: {'grade', 'note', 'index', 'time_error', 'cents_error'} o None
+        """
+        ok_window = self.windows['ok']
+        lo = bisect_left(self.start_times, detection_time - ok_window)
+        hi = bisect_right(self.start_times, detection_time + ok_window)
+
+        best_index = None
+        best_error = None
+        best_cents = None
+
+        for idx in range(lo, hi):
+            if self.judged[idx]:
+                continue
+
+            cents_error = (detected_pitch - self.notes[idx]['pitch']) * 100
+            if abs(cents_error) > self.windows['cents']:
+                continue
+
+            time_error = detection_time - self.start_times[idx]
+            if best_error is None or abs(time_error) < abs(best_error):
+                best_index = idx
+                best_error = time_error
+                best_cents = cents_error
+
+        if best_index is None:
+            return None
+
+        self.judged[best_index] = True
+
+        return {
+            'grade': self._grade(abs(best_error)),
+            'note': self.notes[best_index],
+            'index': best_index,
+            'time_error': best_error,
+            'cents_error': best_cents
+        }
+
+    def expire(self, current_time):
+        """
+        Marca como perdidas las notas cuya ventana ya pasó
+
+        Args:
+            current_time (float): Tiempo de juego actual
+
+        Returns:
+            list: Notas perdidas desde la última llamada
+        """
+        missed = []
+        deadline = current_time - self.windows['ok']
+
+        while self._miss_cursor < len(self.notes) and self.start_times[self._miss_cursor] < deadline:
+            if not self.judged[self._miss_cursor]:
+                self.judged[self._miss_cursor] = True
+                missed.append(self.notes[self._miss_cursor])
+            self._miss_cursor += 1
+
+        return missed
+
+    def is_finished(self):
+        """Indica si todas las notas ya fueron juzgadas"""
+        return self._miss_cursor >= len(self.notes)
@@ -0,0 +1,373 @@
+"""
+Grabación y reproducción de partidas (replays)
+Formato binario append-only de registros de tamaño fijo: detecciones, juicios y
+teclas, con pista opcional de audio crudo en un archivo .pcm (float32) aparte
+"""
+
+import json
+import math
+import re
+import struct
+import sys
+from datetime import datetime
+from pathlib import Path
+from queue import SimpleQueue, Empty
+
+import numpy as np
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import REPLAY_FOLDER, REPLAY_KEEP_PER_SONG
+from game.hit_judge import HitJudge
+
+
+MAGIC = b'UKRP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHI')  # magic, versión, longitud de los metadatos JSON
+
+# Registro de 32 bytes: tipo, código, aux, valor, tiempo, reloj, a, b
+RECORD = struct.Struct('<BBHIddff')
+RECORD_DTYPE = np.dtype([
+    ('type', '<u1'), ('code', '<u1'), ('aux', '<u2'), ('value', '<u4'),
+    ('time', '<f8'), ('clock', '<f8'), ('a', '<f4'), ('b', '<f4')
+])
+
+# Tipos de registro
+DETECTION = 1  # code=onset, time=tiempo de juego sin compensar, a=pitch MIDI, b=confianza
+JUDGMENT = 2   # code=grado, value=índice de nota, time=inicio de nota, a=error (s), b=error (cents)
+KEY = 3        # code=pulsada, aux=modificadores, value=tecla
+AUDIO = 4      # value=samples del bloque, time=tiempo de stream del final, a=tiempo de juego (o NaN)
+END = 5        # clock=tiempo de juego al terminar
+
+# Códigos de grado (0 = nota perdida)
+MISS = 'MISS'
+GRADE_CODES = {MISS: 0, HitJudge.PERFECT: 1, HitJudge.GOOD: 2, HitJudge.OK: 3}
+GRADE_NAMES = {code: grade for grade, code in GRADE_CODES.items()}
+
+
+def notes_to_metadata(notes):
+    """Serializa las notas juzgadas para que el replay no dependa de la tablatura guardada"""
+    return [[n['start_time'], n['end_time'], n['pitch'], n.get('string'), n.get('fret')]
+            for n in notes]
+
+
+def notes_from_metadata(rows):
+    """Reconstruye las notas guardadas por notes_to_metadata"""
+    return [{'start_time': start, 'end_time': end, 'pitch': pitch, 'string': string, 'fret': fret}
+            for start, end, pitch, string, fret in rows]
+
+
+def prune_replays(folder, tablature_name, keep):
+    """
+    Borra los replays más antiguos de una tablatura (y su audio .pcm)
+
+    Solo considera los archivos con el nombre de ReplayWriter.create:
+    <tablatura>_<AAAAMMDD>_<HHMMSS>.ukr
+
+    Args:
+        folder (Path): Carpeta de replays
+        tablature_name (str): Tablatura de la partida
+        keep (int): Replays a conservar (los más recientes)
+
+    Returns:
+        list: Rutas borradas
+    """
+    pattern = re.compile(re.escape(tablature_name) + r'_\d{8}_\d{6}\.ukr')
+    # La fecha del nombre ordena cronológicamente
+    replays = sorted(path for path in Path(folder).glob('*.ukr') if pattern.fullmatch(path.name))
+
+    removed = []
+    for path in replays[:max(len(replays) - keep, 0)]:
+        for old in (path, path.with_suffix('.pcm')):
+            try:
+                old.unlink()
+                removed.append(old)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ No se pudo borrar el replay {old.name}: {e}")
+    return removed
+
+
+class ReplayWriter:
+    """
+    Escribe un replay de forma incremental
+
+    Los registros se acumulan en un bytearray y se vuelcan al archivo cada
+    'flush_every' registros; un replay cortado a mitad sigue siendo legible
+    hasta el último registro completo.
+    """
+
+    def __init__(self, path, metadata, record_audio=False, flush_every=256):
+        """
+        Inicializa el escritor
+
+        Args:
+            path (str): Archivo .ukr a crear
+            metadata (dict): Metadatos de la partida (tablatura, notas, ventanas...)
+            record_audio (bool): Guardar también el audio crudo en un .pcm
+            flush_every (int): Registros acumulados antes de escribir al disco
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+
+        self.audio_path = self.path.with_suffix('.pcm') if record_audio else None
+        self._audio_file = open(self.audio_path, 'wb') if record_audio else None
+        self._audio_queue = SimpleQueue()
+
+        metadata = dict(metadata, format_version=FORMAT_VERSION,
+                        audio_file=self.audio_path.name if self.audio_path else None)
+        meta_bytes = json.dumps(metadata).encode('utf-8')
+
+        self._file = open(self.path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta_bytes)))
+        self._file.write(meta_bytes)
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self.record_count = 0
+
+        # Retención (la fija create): al cerrar se conservan keep_last replays de la tablatura
+        self.tablature_name = None
+        self.keep_last = None
+
+    @classmethod
+    def create(cls, tablature_name, metadata, record_audio=False):
+        """Crea un replay con nombre por fecha en REPLAY_FOLDER"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = REPLAY_FOLDER / f"{tablature_name}_{stamp}.ukr"
+        writer = cls(path, dict(metadata, tablature=tablature_name, created=stamp), record_audio)
+        writer.tablature_name = tablature_name
+        writer.keep_last = REPLAY_KEEP_PER_SONG
+        return writer
+
+    def _append(self, rtype, code, aux, value, time, clock, a=0.0, b=0.0):
+        """Agrega un registro al buffer"""
+        self._buffer += RECORD.pack(rtype, code, aux, value, time, clock, a, b)
+        self._pending += 1
+        self.record_count += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def record_detection(self, clock, detection_time, pitch, confidence, onset):
+        """
+        Registra una detección
+
+        Args:
+            clock (float): Tiempo de juego al procesarla
+            detection_time (float): Tiempo de juego de la detección, SIN compensar latencia
+            pitch (float): Número MIDI fraccionario
+            confidence (float): Confianza del detector
+            onset (bool): Si la detección inicia una nota nueva
+        """
+        self._append(DETECTION, int(onset), 0, 0, detection_time, clock, pitch, confidence)
+
+    def record_judgment(self, clock, judgment):
+        """Registra un juicio devuelto por HitJudge.judge"""
+        self._append(JUDGMENT, GRADE_CODES[judgment['grade']], 0, judgment['index'],
+                     judgment['note']['start_time'], clock,
+                     judgment['time_error'], judgment['cents_error'])
+
+    def record_miss(self, clock, index, note):
+        """Registra una nota perdida"""
+        self._append(JUDGMENT, GRADE_CODES[MISS], 0, index, note['start_time'], clock)
+
+    def record_key(self, clock, key, mod=0, down=True):
+        """Registra un evento de teclado"""
+        self._append(KEY, int(down), mod & 0xFFFF, key & 0xFFFFFFFF, clock, clock)
+
+    def on_audio_block(self, block, stream_time):
+        """
+        Encola un bloque de audio (llamado desde el callback de captura)
+
+        Solo copia y encola: la escritura al disco ocurre en drain_audio.
+        """
+        if self._audio_file is not None:
+            self._audio_queue.put((np.array(block, dtype=np.float32), stream_time))
+
+    def drain_audio(self, to_game_time=None):
+        """
+        Escribe los bloques de audio encolados
+
+        Args:
+            to_game_time (callable): Convierte tiempo de stream a tiempo de juego
+        """
+        if self._audio_file is None:
+            return
+
+        while True:
+            try:
+                block, stream_time = self._audio_queue.get_nowait()
+            except Empty:
+                break
+
+            game_time = to_game_time(stream_time) if to_game_time and stream_time is not None else None
+            self._audio_file.write(block.tobytes())
+            self._append(AUDIO, 0, 0, len(block),
+                         stream_time if stream_time is not None else math.nan, 0.0,
+                         game_time if game_time is not None else math.nan)
+
+    def flush(self):
+        """Vuelca los registros pendientes al disco"""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._pending = 0
+        self._file.flush()
+
+    def close(self, clock=None):
+        """
+        Cierra el replay
+
+        Args:
+            clock (float): Tiempo de juego final (escribe el registro END)
+        """
+        if self._file.closed:
+            return
+        self.drain_audio()
+        if clock is not None:
+            self._append(END, 0, 0, 0, clock, clock)
+        self.flush()
+        self._file.close()
+        if self._audio_file is not None:
+            self._audio_file.close()
+
+        if self.tablature_name and self.keep_last:
+            prune_replays(self.path.parent, self.tablature_name, self.keep_last)
+
+
+class ReplayPlayer:
+    """Lee un replay y vuelve a ejecutar el juicio de forma determinista"""
+
+    def __init__(self, path):
+        """
+        Carga un replay
+
+        Args:
+            path (str): Archivo .ukr
+        """
+        self.path = Path(path)
+
+        with open(self.path, 'rb') as f:
+            magic, version, meta_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"No es un replay: {self.path}")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Versión de replay no soportada: {version}")
+            self.metadata = json.loads(f.read(meta_length).decode('utf-8'))
+
+        # Ignorar un registro final incompleto (partida interrumpida)
+        offset = HEADER.size + meta_length
+        count = max(self.path.stat().st_size - offset, 0) // RECORD_DTYPE.itemsize
+        self.records = np.fromfile(self.path, dtype=RECORD_DTYPE, count=count, offset=offset)
+
+        self.notes = notes_from_metadata(self.metadata.get('notes', []))
+
+    def _of_type(self, rtype):
+        return self.records[self.records['type'] == rtype]
+
+    def get_detections(self, onsets_only=False):
+        """Registros de detección (array estructurado)"""
+        detections = self._of_type(DETECTION)
+        return detections[detections['code'] == 1] if onsets_only else detections
+
+    def get_judgments(self):
+        """Registros de juicio (array estructurado)"""
+        return self._of_type(JUDGMENT)
+
+    def get_key_events(self):
+        """Registros de teclado (array estructurado)"""
+        return self._of_type(KEY)
+
+    def get_end_clock(self):
+        """Tiempo de juego final o None si el replay no se cerró"""
+        end = self._of_type(END)
+        return float(end['clock'][-1]) if len(end) else None
+
+    def get_audio(self):
+        """
+        Carga la pista de audio crudo si existe
+
+        Returns:
+            numpy.array: Samples float32 o None
+        """
+        audio_file = self.metadata.get('audio_file')
+        if not audio_file:
+            return None
+        audio_path = self.path.with_name(audio_file)
+        if not audio_path.exists():
+            return None
+        return np.fromfile(audio_path, dtype=np.float32)
+
+    def get_recorded_outcomes(self):
+        """
+        Resultado grabado por nota
+
+        Returns:
+            dict: {índice de nota: grado o MISS}
+        """
+        judgments = self.get_judgments()
+        return {int(index): GRADE_NAMES[int(code)]
+                for index, code in zip(judgments['value'], judgments['code'])}
+
+    def rejudge(self, windows=None, latency_offset=None):
+        """
+        Vuelve a juzgar las detecciones grabadas
+
+        Reproduce el orden del juego: antes de cada onset expiran las notas
+        hasta el reloj con que se procesó, y al final hasta el reloj de END.
+
+        Args:
+            windows (dict): Ventanas de juicio (por defecto las de la partida)
+            latency_offset (float): Latencia a compensar (por defecto la de la partida)
+
+        Returns:
+            dict: 'outcomes' {índice: grado}, 'hits', 'misses', 'grades',
+                  'judgments' y 'differences' (índices que cambian respecto a lo grabado)
+        """
+        windows = windows or self.metadata['windows']
+        if latency_offset is None:
+            latency_offset = self.metadata.get('latency_offset', 0.0)
+
+        judge = HitJudge(self.notes, windows=windows)
+        outcomes = {}
+        judgments = []
+
+        def expire(clock):
+            for note in judge.expire(clock):
+                outcomes[index_of[id(note)]] = MISS
+
+        index_of = {id(note): idx for idx, note in enumerate(self.notes)}
+        onsets = self.get_detections(onsets_only=True)
+
+        for clock, detection_time, pitch in zip(onsets['clock'], onsets['time'], onsets['a']):
+            expire(float(clock))
+            judgment = judge.judge(float(detection_time) - latency_offset, float(pitch))
+            if judgment:
+                outcomes[judgment['index']] = judgment['grade']
+                judgments.append(judgment)
+
+        end_clock = self.get_end_clock()
+        if end_clock is not None:
+            expire(end_clock)
+
+        recorded = self.get_recorded_outcomes()
+        differences = sorted(idx for idx in set(recorded) | set(outcomes)
+                             if recorded.get(idx) != outcomes.get(idx))
+
+        grades = {grade: 0 for grade in GRADE_CODES if grade != MISS}
+        for judgment in judgments:
+            grades[judgment['grade']] += 1
+
+        return {
+            'outcomes': outcomes,
+            'hits': len(judgments),
+            'misses': sum(1 for grade in outcomes.values() if grade == MISS),
+            'grades': grades,
+            'judgments': judgments,
+            'differences': differences,
+        }
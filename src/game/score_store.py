@@ -0,0 +1,207 @@
+"""
+Almacén persistente de puntuaciones (SQLite)
+Resultados por tablatura, jugador y dificultad, con escrituras en lote en un hilo aparte
+"""
+
+import queue
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import SCORES_DB_FILE
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    tablature TEXT NOT NULL,
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    accuracy REAL NOT NULL,
+    max_combo INTEGER NOT NULL,
+    hits INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    perfect INTEGER NOT NULL DEFAULT 0,
+    good INTEGER NOT NULL DEFAULT 0,
+    ok INTEGER NOT NULL DEFAULT 0,
+    played_at TEXT NOT NULL
+);
+-- Top-N por canción y dificultad: recorre el índice ya ordenado por score
+CREATE INDEX IF NOT EXISTS idx_results_leaderboard
+    ON results (tablature, difficulty, score DESC);
+-- Mejor marca personal: búsqueda puntual en el índice
+CREATE INDEX IF NOT EXISTS idx_results_player
+    ON results (player, tablature, difficulty, score DESC);
+"""
+
+INSERT = """
+INSERT INTO results (tablature, player, difficulty, score, accuracy, max_combo,
+                     hits, misses, perfect, good, ok, played_at)
+VALUES (:tablature, :player, :difficulty, :score, :accuracy, :max_combo,
+        :hits, :misses, :perfect, :good, :ok, :played_at)
+"""
+
+COLUMNS = "player, score, accuracy, max_combo, hits, misses, perfect, good, ok, played_at"
+
+
+class ScoreStore:
+    """
+    Resultados de partidas en SQLite
+
+    Las escrituras se encolan y un hilo de fondo las inserta en lotes dentro de
+    una sola transacción, así que el juego nunca espera al disco. Las consultas
+    usan su propia conexión; con WAL pueden leer mientras el hilo escribe.
+    """
+
+    BATCH_SIZE = 256  # Máximo de resultados por transacción
+
+    def __init__(self, db_file=SCORES_DB_FILE):
+        """
+        Inicializa el almacén (crea la base de datos si no existe)
+
+        Args:
+            db_file (str): Ruta del archivo SQLite (':memory:' no se admite:
+                           lector y escritor usan conexiones distintas)
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = self._connect()
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="ScoreStoreWriter", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        """Abre una conexión con WAL"""
+        conn = sqlite3.connect(str(self.db_file), timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def submit(self, tablature, player, difficulty, results):
+        """
+        Encola un resultado para guardarlo en segundo plano
+
+        Args:
+            tablature (str): Nombre de la tablatura
+            player (str): Nombre del jugador
+            difficulty (str): Dificultad jugada
+            results (dict): Resultado de TablatureGameMode.get_results
+        """
+        grades = results.get('grades', {})
+        self._queue.put({
+            'tablature': tablature,
+            'player': player,
+            'difficulty': difficulty,
+            'score': results['score'],
+            'accuracy': results['accuracy'],
+            'max_combo': results['max_combo'],
+            'hits': results['hits'],
+            'misses': results['misses'],
+            'perfect': grades.get('PERFECT', 0),
+            'good': grades.get('GOOD', 0),
+            'ok': grades.get('OK', 0),
+            'played_at': datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _write_loop(self):
+        """Hilo escritor: inserta los resultados encolados en lotes"""
+        conn = self._connect()
+
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = False
+
+            # Agrupar todo lo que ya esté esperando en una transacción
+            while True:
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(INSERT, batch)
+                except sqlite3.Error as e:
+                    print(f"⚠️ No se pudieron guardar {len(batch)} puntuaciones: {e}")
+
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+
+            if stop:
+                break
+
+        conn.close()
+
+    def flush(self):
+        """Espera a que todos los resultados encolados estén en disco"""
+        self._queue.join()
+
+    def close(self):
+        """Guarda lo pendiente y cierra el almacén"""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
+
+    def top_scores(self, tablature, difficulty, limit=10):
+        """
+        Obtiene la tabla de líderes de una tablatura
+
+        Args:
+            tablature (str): Nombre de la tablatura
+            difficulty (str): Dificultad
+            limit (int): Número de resultados
+
+        Returns:
+            list: Diccionarios ordenados por score descendente
+        """
+        rows = self._conn.execute(
+            f"SELECT {COLUMNS} FROM results WHERE tablature = ? AND difficulty = ? "
+            "ORDER BY score DESC LIMIT ?",
+            (tablature, difficulty, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def personal_best(self, tablature, player, difficulty):
+        """
+        Obtiene la mejor marca de un jugador
+
+        Returns:
+            dict: Mejor resultado o None si nunca jugó esa tablatura
+        """
+        row = self._conn.execute(
+            f"SELECT {COLUMNS} FROM results WHERE player = ? AND tablature = ? AND difficulty = ? "
+            "ORDER BY score DESC LIMIT 1",
+            (player, tablature, difficulty)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def count_results(self, tablature=None):
+        """Número de resultados guardados (de una tablatura o en total)"""
+        if tablature is None:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM results WHERE tablature = ?", (tablature,)
+        ).fetchone()[0]
@@ -0,0 +1,200 @@
+"""
+Simulación headless del modo juego
+Reproduce una tablatura contra una grabación, más rápido que tiempo real y sin
+ventana ni hardware de audio, y genera un reporte de puntuación y precisión
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Agregar src al path para imports absolutos
+current_dir = Path(__file__).parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import *
+from utils.clock import GameClock
+from audio.recorded_source import RecordedAudioSource
+from audio.frequency_analyzer import FrequencyAnalyzer
+
+# Latencia del detector sobre audio grabado: una nota se detecta cuando llena
+# la ventana de análisis. Es el latency_offset a usar con synthesize_performance
+DETECTION_LATENCY = FrequencyAnalyzer.WINDOW_SIZE / SAMPLE_RATE
+
+
+class VirtualTimeSource:
+    """Fuente de tiempo en nanosegundos avanzada manualmente"""
+
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+class HeadlessSimulation:
+    """Ejecuta TablatureGameMode sobre audio grabado con un reloj virtual"""
+
+    def __init__(self, tablature_name, audio_source, difficulty=DEFAULT_DIFFICULTY,
+                 audio_start=0.0, latency_offset=0.0, frame_rate=FPS, render=False,
+                 replay_path=None, tab_manager=None):
+        """
+        Inicializa la simulación
+
+        Args:
+            tablature_name (str): Tablatura guardada a reproducir
+            audio_source (RecordedAudioSource): Grabación de la interpretación
+            difficulty (str): Dificultad en JUDGMENT_WINDOWS
+            audio_start (float): Tiempo de juego que corresponde al sample 0
+            latency_offset (float): Latencia a compensar en las detecciones (s)
+            frame_rate (int): Frames simulados por segundo (polling del detector)
+            render (bool): Dibujar cada frame en una superficie fuera de pantalla
+            replay_path (str): Archivo donde grabar el replay de la simulación
+            tab_manager (TablatureManager): Gestor de donde cargar la tablatura
+                                            (por defecto, el de assets/tablatures)
+        """
+        self.tablature_name = tablature_name
+        self.audio_source = audio_source
+        self.difficulty = difficulty
+        self.audio_start = audio_start
+        self.latency_offset = latency_offset
+        self.frame_rate = frame_rate
+        self.render = render
+        self.replay_path = replay_path
+        self.tab_manager = tab_manager
+
+        self.time_source = VirtualTimeSource()
+        self.game = None
+
+    @classmethod
+    def from_wav(cls, tablature_name, wav_path, **kwargs):
+        """Crea la simulación a partir de un archivo WAV"""
+        return cls(tablature_name, RecordedAudioSource.from_wav(wav_path), **kwargs)
+
+    def _create_game(self):
+        """Crea el modo juego sobre el driver de video dummy de SDL"""
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        import pygame
+        from audio.note_detector import NoteDetector
+        from game.tablature_mode import TablatureGameMode
+
+        pygame.font.init()
+        screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+        game = TablatureGameMode(
+            screen,
+            difficulty=self.difficulty,
+            note_detector=NoteDetector(self.audio_source),
+            game_clock=GameClock(time_source=self.time_source),
+            tab_manager=self.tab_manager
+        )
+        game.verbose = False
+        game.record_replays = False
+        return game
+
+    def run(self):
+        """
+        Ejecuta la partida completa
+
+        Returns:
+            dict: Reporte de la simulación o None si la tablatura no carga
+        """
+        self.game = game = self._create_game()
+
+        if not game.load_tablature(self.tablature_name):
+            return None
+
+        game.note_detector.start_detection()
+        game.latency_offset = self.latency_offset
+
+        # El host virtual arranca en 0 con el reloj del juego en -pre_game_total
+        self.time_source.ns = 0
+        game.reset_session(replay_path=self.replay_path)
+
+        # Tiempo de stream s <-> host h: h = s + audio_start + pre_game_total
+        self.audio_source.host_offset = self.audio_start + game.pre_game_total
+
+        frame_ns = int(1e9 / self.frame_rate)
+        frames = 0
+        wall_start = time.perf_counter()
+
+        while game.is_running:
+            self.time_source.ns += frame_ns
+            host_time = self.time_source.ns / 1e9
+            self.audio_source.advance_to(host_time - self.audio_source.host_offset)
+
+            game.step(render=self.render)
+            frames += 1
+
+        wall_time = time.perf_counter() - wall_start
+        game.finish()
+        game.note_detector.stop_detection()
+
+        return self._build_report(frames, wall_time)
+
+    def _build_report(self, frames, wall_time):
+        """Resume resultados, errores de tiempo y rendimiento de la simulación"""
+        game = self.game
+        report = game.get_results()
+
+        time_errors = np.array([j['time_error'] for j in game.judgments])
+        cents_errors = np.array([j['cents_error'] for j in game.judgments])
+        simulated_time = self.time_source.ns / 1e9
+
+        report.update({
+            'tablature': self.tablature_name,
+            'difficulty': self.difficulty,
+            'total_notes': len(game.upcoming_notes),
+            'time_error_ms': {
+                'mean': float(time_errors.mean() * 1000) if len(time_errors) else 0.0,
+                'mean_abs': float(np.abs(time_errors).mean() * 1000) if len(time_errors) else 0.0,
+                'p95_abs': float(np.percentile(np.abs(time_errors), 95) * 1000) if len(time_errors) else 0.0,
+            },
+            'cents_error_mean_abs': float(np.abs(cents_errors).mean()) if len(cents_errors) else 0.0,
+            'frames': frames,
+            'simulated_seconds': simulated_time,
+            'wall_seconds': wall_time,
+            'speedup': simulated_time / wall_time if wall_time > 0 else 0.0,
+        })
+        return report
+
+
+def synthesize_performance(notes, sample_rate=SAMPLE_RATE, amplitude=0.5, tail=1.0):
+    """
+    Sintetiza una interpretación perfecta de las notas (tonos con decaimiento)
+
+    Sirve como grabación de referencia para pruebas de regresión sin músico:
+    el sample 0 corresponde al tiempo de juego 0.
+
+    Args:
+        notes (list): Notas con 'pitch', 'start_time' y 'end_time' (tiempo de juego)
+        sample_rate (int): Frecuencia de muestreo
+        amplitude (float): Amplitud de cada nota
+        tail (float): Segundos de silencio tras la última nota
+
+    Returns:
+        numpy.array: Audio mono en float64
+    """
+    if not notes:
+        return np.zeros(int(tail * sample_rate))
+
+    total = max(note['end_time'] for note in notes) + tail
+    audio = np.zeros(int(total * sample_rate))
+
+    for note in notes:
+        start = int(note['start_time'] * sample_rate)
+        length = max(int((note['end_time'] - note['start_time']) * sample_rate), 1)
+        t = np.arange(length) / sample_rate
+        frequency = 440.0 * 2 ** ((note['pitch'] - 69) / 12)
+        tone = amplitude * np.sin(2 * np.pi * frequency * t) * np.exp(-t * 3)
+
+        # Las notas no se solapan en el instrumento: cada una corta la anterior
+        audio[start:start + length] = tone[:len(audio) - start]
+
+    return audio
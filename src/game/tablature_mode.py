@@ -5,6 +5,7 @@ Las notas se desplazan de derecha a izquierda según el tempo
 
 import pygame
 import sys
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 
 # Agregar src al path para imports absolutos
@@ -12,22 +13,30 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from audio.note_detector import NoteDetector
+from audio.latency import LatencyProfileStore
 from utils.config import *
-from utils.helpers import format_frequency
+from utils.helpers import format_frequency, frequency_to_midi
+from utils.clock import GameClock
+from utils.profiler import FrameProfiler
+from music.instruments import get_instrument
 from music.tablature_manager import TablatureManager
+from game.hit_judge import HitJudge
+from game.replay import ReplayWriter, notes_to_metadata
+from game.ui.perf_overlay import PerfOverlay
 
 
 class TablatureGameMode:
     """Modo juego con tablaturas - notas desplazándose horizontalmente"""
     
-    # Configuración de layout
-    STRINGS = ['G', 'C', 'E', 'A']
-    STRING_COLORS = {
-        'G': (255, 100, 100),  # Rojo
-        'C': (100, 255, 100),  # Verde
-        'E': (100, 100, 255),  # Azul
-        'A': (255, 255, 100),  # Amarillo
-    }
+    # Colores de las cuerdas en orden físico (ukulele: G, C, E, A)
+    STRING_PALETTE = [
+        (255, 100, 100),  # Rojo
+        (100, 255, 100),  # Verde
+        (100, 100, 255),  # Azul
+        (255, 255, 100),  # Amarillo
+        (255, 165, 0),    # Naranja
+        (200, 120, 255),  # Violeta
+    ]
     
     HIT_ZONE_X = 150  # X donde las notas deben tocarse (izquierda)
     HIT_ZONE_WIDTH = 40  # Ancho de la zona de golpeo
@@ -37,15 +46,36 @@ class TablatureGameMode:
     NOTE_HEIGHT = 50  # Alto fijo de las notas (rectángulos)
     NOTE_SPEED_PIXELS_PER_SECOND = 400  # Velocidad en pixels/segundo
     
-    def __init__(self, screen):
+    # Puntos y feedback por juicio
+    JUDGMENT_POINTS = {
+        HitJudge.PERFECT: (1000, "PERFECT!", (0, 255, 0)),
+        HitJudge.GOOD: (500, "GOOD!", (100, 255, 100)),
+        HitJudge.OK: (100, "OK", (255, 255, 100)),
+    }
+    FEEDBACK_DURATION = 0.5  # Segundos que se muestra el último juicio
+    
+    def __init__(self, screen, difficulty=DEFAULT_DIFFICULTY, note_detector=None, game_clock=None,
+                 score_store=None, tab_manager=None):
+        """
+        Inicializa el modo juego
+        
+        Args:
+            screen: Superficie de pygame donde dibujar
+            difficulty (str): Dificultad en JUDGMENT_WINDOWS
+            note_detector (NoteDetector): Detector a usar (por defecto, micrófono)
+            game_clock (GameClock): Reloj a usar (por defecto, perf_counter_ns)
+            score_store (ScoreStore): Almacén donde guardar el resultado (opcional)
+            tab_manager (TablatureManager): Gestor compartido (conserva su cache entre partidas)
+        """
         self.screen = screen
         self.clock = pygame.time.Clock()
         
         # Gestor de tablaturas
-        self.tab_manager = TablatureManager()
+        self.tab_manager = tab_manager or TablatureManager()
         
         # Estado del juego
         self.current_tablature = None
+        self.tablature_name = None
         self.is_running = False
         self.game_paused = False
         self.countdown_active = False  # Countdown antes de empezar
@@ -53,14 +83,32 @@ class TablatureGameMode:
         self.countdown_remaining = 3.0
         self.silence_time = 1.0  # Segundos de silencio después del countdown (1 seg)
         self.pre_game_total = 4.0  # Total: 3 seg countdown + 1 seg silencio
-        self.current_time = 0.0  # Tiempo en segundos
-        self.start_time = 0.0
+        self.current_time = 0.0  # Tiempo de la simulación en segundos
+        self.render_time = 0.0  # Tiempo interpolado para dibujar
+        
+        # Simulación a paso fijo
+        self.logic_step = 1.0 / LOGIC_HZ
+        self.previous_sim_time = 0.0
+        self.frames_skipped = 0
+        
+        # Reloj del juego: una sola línea de tiempo para notas, juicios y detecciones
+        self.game_clock = game_clock or GameClock()
         
         # Notas activas (en pantalla)
         self.active_notes = []  # Lista de notas que se están mostrando
         self.upcoming_notes = []  # Cola de notas por aparecer
+        self.note_start_times = []  # start_time de upcoming_notes, para bisect
         self.note_index = 0
         
+        # Juicio de notas
+        self.difficulty = difficulty
+        self.hit_judge = None
+        self.song_end_time = 0.0
+        self.last_judgment = None
+        self.last_judgment_time = 0.0
+        self.judgments = []  # Juicios de la partida, en orden
+        self.verbose = True  # Imprimir cada hit/miss por consola
+        
         # Scoring
         self.score = 0
         self.combo = 0
@@ -69,7 +117,18 @@ class TablatureGameMode:
         self.misses = 0
         
         # Detector de notas (para validar si se tocó la nota correcta)
-        self.note_detector = NoteDetector()
+        self.note_detector = note_detector or NoteDetector()
+        
+        # Latencia de entrada calibrada para el dispositivo (segundos)
+        self.latency_offset = 0.0
+        
+        # Puntuaciones persistentes
+        self.score_store = score_store
+        self.player_name = PLAYER_NAME
+        
+        # Replay de la partida en curso
+        self.record_replays = RECORD_REPLAYS
+        self.replay_writer = None
         
         # Fuentes
         self.font_huge = pygame.font.Font(None, 96)
@@ -79,15 +138,39 @@ class TablatureGameMode:
         self.font_countdown = pygame.font.Font(None, 150)
         self.font_fret = pygame.font.Font(None, 40)
         
+        # Instrumentación por etapas (F3: overlay, F4: exportar traza)
+        self.profiler = FrameProfiler()
+        self.perf_overlay = PerfOverlay(screen, self.profiler)
+        
+        # Sprites de notas pre-renderizados: {(cuerda, traste): (surface, offset_x)}
+        self.note_sprites = {}
+        
+        # Carriles: uno por cuerda del instrumento (cambia con cada tablatura)
+        self._set_instrument(INSTRUMENT)
+    
+    def _set_instrument(self, instrument):
+        """
+        Configura carriles, colores y detección para un instrumento
+        
+        Args:
+            instrument (str): Perfil de music.instruments
+        """
+        self.instrument = get_instrument(instrument)
+        self.strings = list(self.instrument.string_names)
+        self.string_colors = {name: self.STRING_PALETTE[idx % len(self.STRING_PALETTE)]
+                              for idx, name in enumerate(self.strings)}
+        if hasattr(self.note_detector, 'set_instrument'):
+            self.note_detector.set_instrument(self.instrument)
+        
         # Cálculos de layout
         self._calculate_layout()
     
     def _calculate_layout(self):
-        """Calcula posiciones de las 4 cuerdas"""
+        """Calcula posiciones de las cuerdas"""
         self.string_y_positions = {}
-        self.string_height = (WINDOW_HEIGHT - 200) // len(self.STRINGS)
+        self.string_height = (WINDOW_HEIGHT - 200) // len(self.strings)
         
-        for idx, string_name in enumerate(self.STRINGS):
+        for idx, string_name in enumerate(self.strings):
             y = 100 + (idx * self.string_height)
             self.string_y_positions[string_name] = y
     
@@ -103,15 +186,16 @@ class TablatureGameMode:
         """
         print(f"[LOADING] Cargando tablatura: {tablature_name}...")
         
-        # Cargar datos JSON
-        tab_data = self.tab_manager.load_tablature(tablature_name)
+        # Formato UI digitado desde las columnas (memmap), cacheado entre reintentos
+        ui_data = self.tab_manager.load_ui_format(tablature_name)
         
-        if not tab_data:
+        if ui_data is None:
             print("[ERROR] Error al cargar tablatura")
             return False
         
-        # Convertir a formato UI
-        self.current_tablature = self.tab_manager.export_to_ui_format(tab_data)
+        self.current_tablature = ui_data
+        self.tablature_name = tablature_name
+        self._set_instrument(self.current_tablature.get('instrument', INSTRUMENT))
         
         # Preparar notas
         self._prepare_notes()
@@ -125,24 +209,69 @@ class TablatureGameMode:
             return
         
         # Construir lista de todas las notas ordenadas por tiempo
-        self.upcoming_notes = []
+        self.upcoming_notes = HitJudge.notes_from_tablature(self.current_tablature, self.strings)
+        self.note_start_times = [note['start_time'] for note in self.upcoming_notes]
+        
+        # Las notas en pantalla se obtienen como un slice de upcoming_notes
+        self.active_notes = []
+        self.note_index = 0
+        
+        # Juez de notas y fin de la canción (última nota + ventana de juicio)
+        self.hit_judge = HitJudge(self.upcoming_notes, self.difficulty, start_times=self.note_start_times)
+        if self.upcoming_notes:
+            last_end = max(note['end_time'] for note in self.upcoming_notes)
+            self.song_end_time = last_end + self.hit_judge.windows['ok']
+        
+        # Pre-renderizar un sprite por cada combinación (cuerda, traste) usada
+        self._build_note_sprites()
+    
+    def _build_note_sprites(self):
+        """Pre-renderiza los sprites de nota usados por la tablatura actual"""
+        self.note_sprites = {}
+        
+        for note in self.upcoming_notes:
+            key = (note['string'], note['fret'])
+            if key not in self.note_sprites:
+                self.note_sprites[key] = self._render_note_sprite(*key)
+    
+    def _render_note_sprite(self, string_name, fret):
+        """
+        Renderiza una vez el sprite de una nota (cuerpo, borde y traste)
         
-        for string_name in self.STRINGS:
-            string_notes = self.current_tablature['strings'][string_name]
-            for note in string_notes:
-                note['string'] = string_name
-                self.upcoming_notes.append(note)
+        Args:
+            string_name (str): Nombre de la cuerda
+            fret (int): Número de traste
+            
+        Returns:
+            tuple: (surface, offset_x) donde offset_x centra el sprite sobre la nota
+        """
+        color = self.string_colors[string_name]
+        border_color = tuple(c // 2 for c in color)
+        fret_text = self.font_fret.render(str(fret), True, (0, 0, 0))
+        
+        # El número de traste puede ser más ancho que la nota (trastes de 2 dígitos)
+        width = max(self.NOTE_WIDTH, fret_text.get_width())
+        offset_x = (width - self.NOTE_WIDTH) // 2
         
-        # Ordenar por tiempo de inicio
-        self.upcoming_notes.sort(key=lambda n: n['start_time'])
+        sprite = pygame.Surface((width, self.NOTE_HEIGHT))
+        body_rect = pygame.Rect(offset_x, 0, self.NOTE_WIDTH, self.NOTE_HEIGHT)
         
-        # AGREGAR TODAS LAS NOTAS A active_notes DESDE EL INICIO
-        # Esto permite renderizarlas durante el countdown
-        self.active_notes = self.upcoming_notes.copy()
-        self.note_index = len(self.active_notes)  # Todas las notas ya están cargadas
+        if width > self.NOTE_WIDTH:
+            # Fondo transparente fuera del cuerpo de la nota
+            transparent = (255, 0, 255) if color != (255, 0, 255) else (0, 255, 255)
+            sprite.fill(transparent)
+            sprite.set_colorkey(transparent)
         
-        # Control de pausa
-        self.pause_start_time = None  # Momento en que se pausó
+        pygame.draw.rect(sprite, color, body_rect)
+        pygame.draw.rect(sprite, border_color, body_rect, 2)
+        sprite.blit(fret_text, fret_text.get_rect(center=(width // 2, self.NOTE_HEIGHT // 2)))
+        
+        # Convertir al formato de la pantalla para blits rápidos
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        
+        return sprite, offset_x
+    
     def start(self):
         """Inicia el modo juego"""
         if not self.current_tablature:
@@ -155,34 +284,187 @@ class TablatureGameMode:
         if not self.note_detector.start_detection():
             print("⚠️ No se pudo iniciar detección de audio, continuando sin validación")
         
+        # Compensar la latencia calibrada del dispositivo de entrada
+        device_name = self.note_detector.get_device_name()
+        self.latency_offset = LatencyProfileStore().get_offset(device_name)
+        if self.latency_offset:
+            print(f"[LATENCY] {device_name}: {self.latency_offset * 1000:.1f} ms")
+        
+        self.reset_session()
+        self.run()
+        self.finish()
+        return True
+    
+    def reset_session(self, replay_path=None):
+        """
+        Reinicia puntuación, juicios y reloj para una nueva partida
+        
+        Args:
+            replay_path (str): Archivo donde grabar el replay (por defecto,
+                               REPLAY_FOLDER si record_replays está activo)
+        """
         self.is_running = True
+        self.game_paused = False
         self.countdown_active = True  # Activar countdown
         self.countdown_remaining = 3.0
         self.score = 0
         self.combo = 0
+        self.max_combo = 0
         self.hits = 0
         self.misses = 0
-        self.current_time = 0.0
-        self.start_time = pygame.time.get_ticks() / 1000.0
+        self.last_judgment = None
+        self.judgments = []
+        
+        for note in self.upcoming_notes:
+            note.pop('hit', None)
+        self.hit_judge = HitJudge(self.upcoming_notes, self.difficulty, start_times=self.note_start_times)
+        
+        # Countdown: el reloj arranca en negativo y el juego real empieza en t=0
+        self.game_clock.attach_audio(self.note_detector.microphone.clock_sync)
+        self.game_clock.start(-self.pre_game_total)
+        self.current_time = self.game_clock.now()
+        self.previous_sim_time = self.current_time
+        self.render_time = self.current_time
+        self.frames_skipped = 0
+        
+        if replay_path or self.record_replays:
+            self._open_replay(replay_path)
+    
+    def _open_replay(self, path=None):
+        """Empieza a grabar el replay de la partida"""
+        self._close_replay()
+        
+        metadata = {
+            'tablature': self.tablature_name,
+            'difficulty': self.difficulty,
+            'windows': self.hit_judge.windows,
+            'latency_offset': self.latency_offset,
+            'device': self.note_detector.get_device_name(),
+            'sample_rate': SAMPLE_RATE,
+            'notes': notes_to_metadata(self.upcoming_notes),
+        }
+        
+        try:
+            if path:
+                self.replay_writer = ReplayWriter(path, metadata, REPLAY_RECORD_AUDIO)
+            else:
+                self.replay_writer = ReplayWriter.create(self.tablature_name, metadata, REPLAY_RECORD_AUDIO)
+        except OSError as e:
+            print(f"⚠️ No se pudo crear el replay: {e}")
+            self.replay_writer = None
+            return
         
-        self.run()
-        return True
+        if REPLAY_RECORD_AUDIO:
+            self.note_detector.microphone.block_listeners.append(self.replay_writer.on_audio_block)
+    
+    def _close_replay(self):
+        """Cierra el replay en curso registrando el tiempo final"""
+        writer = self.replay_writer
+        if writer is None:
+            return
+        
+        listeners = self.note_detector.microphone.block_listeners
+        if writer.on_audio_block in listeners:
+            listeners.remove(writer.on_audio_block)
+        
+        writer.close(self.current_time)
+        self.replay_writer = None
+        
+        if self.verbose:
+            print(f"[REPLAY] Guardado: {writer.path}")
     
     def stop(self):
         """Detiene el juego"""
         self.is_running = False
+        self._close_replay()
         
         # Detener detector
         self.note_detector.stop_detection()
     
     def run(self):
-        """Loop principal del juego"""
+        """
+        Loop principal del juego
+        
+        La lógica avanza en pasos fijos de 1/LOGIC_HZ hasta alcanzar el reloj del
+        juego; el render dibuja en un tiempo interpolado entre los dos últimos
+        pasos. Si la lógica va atrasada se omiten hasta MAX_FRAME_SKIP renders.
+        """
+        profiler = self.profiler
+        
         while self.is_running:
-            self._handle_events()
-            self._update()
-            self._render()
+            profiler.begin_frame()
+            
+            with profiler.span('events'):
+                self._handle_events()
+            behind = self.step()
+            
+            if behind and self.frames_skipped < MAX_FRAME_SKIP:
+                self.frames_skipped += 1
+            else:
+                self.frames_skipped = 0
+                self._render()
+            
+            profiler.end_frame()
             self.clock.tick(FPS)
     
+    def step(self, now=None, render=False):
+        """
+        Avanza un frame: lee las detecciones y ejecuta la lógica hasta 'now'
+        
+        Lo usan el loop principal y la simulación headless, que lleva su propio
+        reloj virtual y no necesita ventana ni eventos.
+        
+        Args:
+            now (float): Tiempo de juego a alcanzar (por defecto, el del reloj)
+            render (bool): Dibujar el frame en self.screen (sin presentarlo)
+            
+        Returns:
+            bool: True si la simulación sigue atrasada más de un paso
+        """
+        with self.profiler.span('detection'):
+            self._poll_detection()
+        with self.profiler.span('update'):
+            behind = self._advance_simulation(self.game_clock.now() if now is None else now)
+        
+        if render:
+            self._render_frame()
+        
+        return behind
+    
+    def finish(self):
+        """Cierra la partida tras el loop: guarda el replay en curso"""
+        self._close_replay()
+    
+    def _advance_simulation(self, target_time):
+        """
+        Ejecuta los pasos fijos de lógica necesarios para llegar a target_time
+        
+        Args:
+            target_time (float): Tiempo de juego a alcanzar
+            
+        Returns:
+            bool: True si la simulación sigue atrasada más de un paso
+        """
+        steps = 0
+        while (self.is_running and not self.game_paused
+               and self.current_time + self.logic_step <= target_time
+               and steps < MAX_LOGIC_STEPS_PER_FRAME):
+            self.previous_sim_time = self.current_time
+            self._update(self.current_time + self.logic_step)
+            steps += 1
+        
+        lag = target_time - self.current_time
+        
+        if lag > self.logic_step * MAX_LOGIC_STEPS_PER_FRAME * (MAX_FRAME_SKIP + 1):
+            # Sobrecarga sostenida: descartar atraso en vez de entrar en espiral
+            self.previous_sim_time = self.current_time = target_time - self.logic_step
+        
+        # Interpolar el tiempo de render entre los dos últimos pasos
+        alpha = min(max(lag / self.logic_step, 0.0), 1.0) if not self.game_paused else 1.0
+        self.render_time = self.previous_sim_time + (self.current_time - self.previous_sim_time) * alpha
+        
+        return lag > self.logic_step
+    
     def _handle_events(self):
         """Maneja eventos del usuario"""
         for event in pygame.event.get():
@@ -190,70 +472,129 @@ class TablatureGameMode:
                 self.is_running = False
             
             elif event.type == pygame.KEYDOWN:
+                if self.replay_writer:
+                    self.replay_writer.record_key(self.current_time, event.key, event.mod)
+                
+                if self.perf_overlay.handle_key(event.key):
+                    continue
+                
                 if event.key == pygame.K_ESCAPE:
                     self.is_running = False
                 
                 elif event.key == pygame.K_SPACE:
                     self.game_paused = not self.game_paused
                     
+                    # El reloj descuenta el tiempo en pausa para mantener current_time
                     if self.game_paused:
-                        # Guardar el tiempo de pausa
-                        self.pause_start_time = pygame.time.get_ticks() / 1000.0
+                        self.game_clock.pause()
                     else:
-                        # Reanudar: Ajustar start_time para mantener current_time
-                        if self.pause_start_time is not None:
-                            pause_duration = (pygame.time.get_ticks() / 1000.0) - self.pause_start_time
-                            self.start_time += pause_duration
-                            self.pause_start_time = None
-    
-    def _update(self):
-        """Actualiza la lógica del juego"""
-        if self.game_paused:
-            return
+                        self.game_clock.resume()
+    
+    def _update(self, sim_time):
+        """
+        Actualiza la lógica del juego un paso fijo
         
-        # Calcular tiempo según si estamos en countdown o en juego
-        elapsed = (pygame.time.get_ticks() / 1000.0) - self.start_time
+        Args:
+            sim_time (float): Tiempo de la simulación al final del paso
+        """
+        # Durante countdown current_time es NEGATIVO (-4 a 0); en juego avanza desde 0
+        self.current_time = sim_time
         
-        if self.countdown_active:
-            # Durante countdown: current_time es NEGATIVO
-            # Countdown: -4 a -1 (4 segundos de espera antes de 0)
-            self.current_time = elapsed - self.pre_game_total
-            
-            if elapsed >= self.pre_game_total:
-                # Countdown terminó, pasar a juego real
-                self.countdown_active = False
-                self.start_time = pygame.time.get_ticks() / 1000.0
-                self.current_time = 0.0
-        else:
-            # Durante juego: current_time avanza desde 0
-            self.current_time = elapsed
+        if self.countdown_active and self.current_time >= 0:
+            # Countdown terminó, pasar a juego real
+            self.countdown_active = False
+        
+        # Notas perdidas solo en juego real
+        if not self.countdown_active:
+            for note in self.hit_judge.expire(self.current_time):
+                self._on_note_miss(note)
+        
+        # Verificar fin del juego
+        if not self.countdown_active and self.current_time > self.song_end_time:
+            self._on_game_end()
+    
+    def _update_visible_notes(self):
+        """Calcula el slice de notas en pantalla con bisect sobre start_time"""
+        speed = self.NOTE_SPEED_PIXELS_PER_SECOND
+        earliest = self.render_time - (self.HIT_ZONE_X + self.NOTE_WIDTH) / speed
+        latest = self.render_time + (WINDOW_WIDTH - self.HIT_ZONE_X) / speed
+        
+        lo = bisect_left(self.note_start_times, earliest)
+        hi = bisect_right(self.note_start_times, latest)
+        self.note_index = hi
+        self.active_notes = self.upcoming_notes[lo:hi]
         
-        # Actualizar posición de todas las notas
         for note in self.active_notes:
-            time_until_hit = note['start_time'] - self.current_time
-            pixels_until_hit = time_until_hit * self.NOTE_SPEED_PIXELS_PER_SECOND
-            note['x'] = self.HIT_ZONE_X + pixels_until_hit
+            time_until_hit = note['start_time'] - self.render_time
+            note['x'] = self.HIT_ZONE_X + time_until_hit * speed
+    
+    def _poll_detection(self):
+        """
+        Consulta el detector y juzga la detección si es un onset
+        
+        Se llama una vez por frame: el audio llega en bloques mucho más largos
+        que un paso de lógica y el juicio usa el timestamp propio de la detección.
+        """
+        if self.countdown_active or self.game_paused:
+            return
+        
+        if self.replay_writer:
+            self.replay_writer.drain_audio(self.game_clock.stream_to_game_time)
+        
+        detection = self.note_detector.update()
+        if not detection:
+            return
+        
+        detected_pitch = frequency_to_midi(detection['frequency'])
+        if detected_pitch is None:
+            return
+        
+        detection_time = self._detection_time(detection)
+        
+        if self.replay_writer:
+            self.replay_writer.record_detection(
+                self.current_time, detection_time + self.latency_offset,
+                detected_pitch, detection['confidence'], detection.get('onset', False)
+            )
+        
+        if not detection.get('onset'):
+            return
+        
+        self.profiler.record_latency(self.game_clock.now() - detection_time - self.latency_offset)
+        
+        judgment = self.hit_judge.judge(detection_time, detected_pitch)
+        if judgment:
+            self._on_note_hit(judgment)
+    
+    def _detection_time(self, detection):
+        """
+        Calcula el tiempo de juego de una detección compensando la latencia
+        
+        Args:
+            detection (dict): Resultado de NoteDetector.update()
             
-            # Detectar misses solo en juego real (no durante countdown)
-            if not self.countdown_active and self.current_time > note['end_time']:
-                if note not in getattr(self, '_hit_notes', []):
-                    self._on_note_miss(note)
-                if note in self.active_notes:
-                    self.active_notes.remove(note)
+        Returns:
+            float: Tiempo de juego en que se tocó la nota
+        """
+        detection_time = None
+        if detection.get('stream_time') is not None:
+            detection_time = self.game_clock.stream_to_game_time(detection['stream_time'])
         
-        # Verificar fin del juego
-        if not self.countdown_active and self.active_notes:
-            last_note_end = self.active_notes[-1]['end_time']
-            if self.current_time > last_note_end:
-                # Remover notas que pasaron
-                self.active_notes = [n for n in self.active_notes if self.current_time <= n['end_time']]
+        if detection_time is None:
+            detection_time = self.game_clock.now()
         
-        if not self.countdown_active and not self.active_notes and self.upcoming_notes:
-            if self.current_time > (self.upcoming_notes[-1]['end_time'] if self.upcoming_notes else 0):
-                self._on_game_end()
+        return detection_time - self.latency_offset
     
     def _render(self):
         """Renderiza la pantalla"""
+        with self.profiler.span('render'):
+            self._render_frame()
+            self.perf_overlay.draw()
+        with self.profiler.span('flip'):
+            pygame.display.flip()
+    
+    def _render_frame(self):
+        """Dibuja el frame actual en self.screen"""
         self.screen.fill(BACKGROUND_COLOR)
         
         # Título y estado
@@ -266,12 +607,11 @@ class TablatureGameMode:
         self._render_hit_zone()
         
         # Notas activas
+        self._update_visible_notes()
         self._render_notes()
         
         # HUD (Información)
         self._render_hud()
-        
-        pygame.display.flip()
     
     def _render_header(self):
         """Renderiza el encabezado con información"""
@@ -284,9 +624,9 @@ class TablatureGameMode:
             self.screen.blit(header_surface, (20, 10))
     
     def _render_strings(self):
-        """Renderiza las 4 líneas de cuerdas"""
+        """Renderiza las líneas de las cuerdas"""
         for string_name, y in self.string_y_positions.items():
-            color = self.STRING_COLORS[string_name]
+            color = self.string_colors[string_name]
             
             # Nombre de la cuerda
             string_label = self.font_large.render(string_name, True, color)
@@ -320,36 +660,28 @@ class TablatureGameMode:
         )
     
     def _render_notes(self):
-        """Renderiza las notas activas"""
+        """Renderiza las notas activas en un solo batch de blits"""
+        batch = []
+        top_offset = self.NOTE_HEIGHT // 2
+        
         for note in self.active_notes:
             x = note.get('x', WINDOW_WIDTH + 100)
-            y = self.string_y_positions[note['string']]
             
-            # No renderizar notas muy fuera de pantalla
-            if x < -self.NOTE_WIDTH or x > WINDOW_WIDTH:
+            # No renderizar notas muy fuera de pantalla ni notas ya acertadas
+            if x < -self.NOTE_WIDTH or x > WINDOW_WIDTH or note.get('hit'):
                 continue
             
-            color = self.STRING_COLORS[note['string']]
+            key = (note['string'], note['fret'])
+            sprite = self.note_sprites.get(key)
+            if sprite is None:
+                sprite = self.note_sprites[key] = self._render_note_sprite(*key)
             
-            # Dibuja la nota como un rectángulo de tamaño fijo
-            pygame.draw.rect(
-                self.screen,
-                color,
-                (x, y - self.NOTE_HEIGHT // 2, self.NOTE_WIDTH, self.NOTE_HEIGHT)
-            )
-            
-            # Borde más oscuro
-            pygame.draw.rect(
-                self.screen,
-                tuple(c // 2 for c in color),
-                (x, y - self.NOTE_HEIGHT // 2, self.NOTE_WIDTH, self.NOTE_HEIGHT),
-                2
-            )
-            
-            # Número de traste
-            fret_text = self.font_fret.render(str(note['fret']), True, (0, 0, 0))
-            fret_rect = fret_text.get_rect(center=(x + self.NOTE_WIDTH // 2, y))
-            self.screen.blit(fret_text, fret_rect)
+            surface, offset_x = sprite
+            y = self.string_y_positions[note['string']]
+            batch.append((surface, (x - offset_x, y - top_offset)))
+        
+        if batch:
+            self.screen.blits(batch, doreturn=False)
     
     def _render_hud(self):
         """Renderiza la información del HUD (puntuación, combo, etc)"""
@@ -377,6 +709,13 @@ class TablatureGameMode:
         combo_surface = self.font_medium.render(combo_text, True, combo_color)
         self.screen.blit(combo_surface, (20, hud_y + 35))
         
+        # Último juicio
+        if self.last_judgment and self.current_time - self.last_judgment_time < self.FEEDBACK_DURATION:
+            _, feedback, feedback_color = self.JUDGMENT_POINTS[self.last_judgment['grade']]
+            feedback_surface = self.font_large.render(feedback, True, feedback_color)
+            feedback_rect = feedback_surface.get_rect(center=(WINDOW_WIDTH // 2, 60))
+            self.screen.blit(feedback_surface, feedback_rect)
+        
         # Estadísticas
         stats_text = f"Hits: {self.hits} | Misses: {self.misses}"
         stats_surface = self.font_small.render(stats_text, True, TEXT_COLOR)
@@ -393,21 +732,9 @@ class TablatureGameMode:
             inst_surface = self.font_small.render(instructions, True, (150, 150, 150))
             self.screen.blit(inst_surface, (20, WINDOW_HEIGHT - 25))
     
-    def _on_note_hit(self, note, time_error):
+    def _on_note_hit(self, judgment):
         """Se ejecuta cuando se golpea una nota correctamente"""
-        # Calcular puntos basado en precisión
-        if time_error < 0.05:  # Perfecto
-            points = 1000
-            feedback = "PERFECT!"
-            feedback_color = (0, 255, 0)
-        elif time_error < 0.1:  # Bien
-            points = 500
-            feedback = "GOOD!"
-            feedback_color = (100, 255, 100)
-        else:  # Ok
-            points = 100
-            feedback = "OK"
-            feedback_color = (255, 255, 100)
+        points, feedback, _ = self.JUDGMENT_POINTS[judgment['grade']]
         
         self.score += points
         self.combo += 1
@@ -415,21 +742,44 @@ class TablatureGameMode:
         self.max_combo = max(self.max_combo, self.combo)
         
         # Marcar nota como golpeada
-        if not hasattr(self, '_hit_notes'):
-            self._hit_notes = []
-        self._hit_notes.append(note)
-        
-        print(f"[HIT] {feedback} | +{points} pts | Combo: {self.combo}")
+        judgment['note']['hit'] = True
+        self.judgments.append(judgment)
+        if self.replay_writer:
+            self.replay_writer.record_judgment(self.current_time, judgment)
+        self.last_judgment = judgment
+        self.last_judgment_time = self.current_time
+        
+        if self.verbose:
+            print(f"[HIT] {feedback} ({judgment['time_error'] * 1000:+.0f} ms) | "
+                  f"+{points} pts | Combo: {self.combo}")
     
     def _on_note_miss(self, note):
         """Se ejecuta cuando se pierde una nota"""
         self.misses += 1
         self.combo = 0
-        print(f"[MISS] Traste {note['fret']} en cuerda {note['string']}")
+        if self.replay_writer:
+            self.replay_writer.record_miss(self.current_time, self._note_index(note), note)
+        if self.verbose:
+            print(f"[MISS] Traste {note['fret']} en cuerda {note['string']}")
+    
+    def _note_index(self, note):
+        """Índice de una nota en upcoming_notes (bisect por start_time)"""
+        idx = bisect_left(self.note_start_times, note['start_time'])
+        while self.upcoming_notes[idx] is not note:
+            idx += 1
+        return idx
     
     def _on_game_end(self):
         """Se ejecuta cuando el juego termina"""
         self.is_running = False
+        self._close_replay()
+        
+        if self.score_store:
+            self.score_store.submit(self.tablature_name, self.player_name,
+                                    self.difficulty, self.get_results())
+        
+        if not self.verbose:
+            return
         
         print("\n" + "="*60)
         print("[GAME END]")
@@ -438,4 +788,25 @@ class TablatureGameMode:
         print(f"Combo Máximo: {self.max_combo}")
         print(f"Notas Correctas: {self.hits}")
         print(f"Notas Perdidas: {self.misses}")
-        print(f"Precisión: {(self.hits / (self.hits + self.misses) * 100):.1f}%")
+        print(f"Precisión: {self.get_results()['accuracy']:.1f}%")
+    
+    def get_results(self):
+        """
+        Obtiene el resumen de la partida
+        
+        Returns:
+            dict: Puntuación, combo, aciertos, fallos, precisión y juicios por tipo
+        """
+        judged = self.hits + self.misses
+        grades = {grade: 0 for grade in self.JUDGMENT_POINTS}
+        for judgment in self.judgments:
+            grades[judgment['grade']] += 1
+        
+        return {
+            'score': self.score,
+            'max_combo': self.max_combo,
+            'hits': self.hits,
+            'misses': self.misses,
+            'accuracy': (self.hits / judged * 100) if judged else 0.0,
+            'grades': grades
+        }
@@ -14,8 +14,11 @@ if str(current_dir) not in sys.path:
 
 from audio.note_detector import NoteDetector
 from game.ui.string_fret_display import StringFretDisplay
+from game.ui.perf_overlay import PerfOverlay
+from utils.profiler import FrameProfiler
 from utils.config import *
 from utils.helpers import format_frequency, format_cents
+from music.instruments import midi_to_frequency, midi_to_name
 
 
 class TunerMode:
@@ -31,6 +34,13 @@ class TunerMode:
         # String/Fret display
         self.string_fret_display = StringFretDisplay(screen)
         
+        # Referencia de las cuerdas del instrumento configurado
+        self.strings_info = self._build_strings_info(self.note_detector.instrument)
+        
+        # Instrumentación por etapas (F3: overlay, F4: exportar traza)
+        self.profiler = FrameProfiler()
+        self.perf_overlay = PerfOverlay(screen, self.profiler)
+        
         # Fuentes
         self.font_huge = pygame.font.Font(None, 96)
         self.font_large = pygame.font.Font(None, FONT_XLARGE)
@@ -66,28 +76,44 @@ class TunerMode:
     
     def run(self):
         """Bucle principal del modo detector de notas"""
+        profiler = self.profiler
+        
         while self.is_running:
+            profiler.begin_frame()
+            
             # Manejar eventos
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.stop()
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+            with profiler.span('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
                         self.stop()
-                        return
-                    elif event.key == pygame.K_SPACE:
-                        self._toggle_detection()
+                        pygame.quit()
+                        sys.exit()
+                    elif event.type == pygame.KEYDOWN:
+                        if self.perf_overlay.handle_key(event.key):
+                            continue
+                        if event.key == pygame.K_ESCAPE:
+                            self.stop()
+                            return
+                        elif event.key == pygame.K_SPACE:
+                            self._toggle_detection()
             
             # Actualizar detector de notas
-            self.current_detection = self.note_detector.update()
+            with profiler.span('detection'):
+                self.current_detection = self.note_detector.update()
             
             # Actualizar visualización
-            self._update_visuals()
+            with profiler.span('update'):
+                self._update_visuals()
             
             # Dibujar pantalla
-            self._draw()
+            with profiler.span('render'):
+                self._draw()
+            
+            # Flip fuera de 'render', igual que en el modo juego
+            with profiler.span('flip'):
+                pygame.display.flip()
+            
+            profiler.end_frame()
             
             # Control de FPS
             self.clock.tick(FPS)
@@ -148,7 +174,8 @@ class TunerMode:
         # Referencias de cuerdas del ukulele
         self._draw_ukulele_reference()
         
-        pygame.display.flip()
+        # Overlay de rendimiento (F3)
+        self.perf_overlay.draw()
     
     def _draw_note_detection(self):
         """Dibuja la información de la nota detectada"""
@@ -293,19 +320,35 @@ class TunerMode:
             self.screen.blit(text, text_rect)
             y_offset += 25
     
-    def _draw_ukulele_reference(self):
-        """Dibuja referencia técnica de las cuerdas del ukulele"""
-        # Cuerdas del ukulele con información técnica extendida
-        strings_info = [
-            ("4ª cuerda al aire", "G4", "392.0 Hz"),
-            ("3ª cuerda al aire", "C4", "261.6 Hz"),
-            ("2ª cuerda al aire", "E4", "329.6 Hz"),
-            ("1ª cuerda al aire", "A4", "440.0 Hz"),
+    @staticmethod
+    def _build_strings_info(instrument):
+        """
+        Cuerdas del instrumento con información técnica extendida
+        
+        Args:
+            instrument (InstrumentProfile): Perfil de music.instruments
+            
+        Returns:
+            list: (etiqueta, nota, frecuencia) por línea; ("", "", "") separa bloques
+        """
+        def row(label, pitch):
+            return (label, midi_to_name(pitch), f"{midi_to_frequency(pitch):.1f} Hz")
+        
+        count = instrument.string_count
+        strings_info = [row(f"{count - idx}ª cuerda al aire", pitch)
+                        for idx, pitch in enumerate(instrument.tuning)]
+        strings_info += [
             ("", "", ""),  # Separador
             ("Rango extendido:", "", ""),
-            ("Traste 12 (1ª)", "A5", "880.0 Hz"),
-            ("Armónicos hasta", "E6", "1318.5 Hz")
+            row(f"Traste 12 ({count - instrument.tuning.index(max(instrument.tuning))}ª)",
+                max(instrument.tuning) + 12),
+            row("Armónicos hasta", instrument.max_pitch),
         ]
+        return strings_info
+    
+    def _draw_ukulele_reference(self):
+        """Dibuja referencia técnica de las cuerdas del instrumento"""
+        strings_info = self.strings_info
         
         x_start = 50
         y_start = 200
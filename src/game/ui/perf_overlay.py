@@ -0,0 +1,121 @@
+"""
+Overlay de rendimiento: gráfica de tiempos de frame, percentiles y etapas
+"""
+
+import pygame
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Agregar src al path
+current_dir = Path(__file__).parent.parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import *
+
+
+class PerfOverlay:
+    """Overlay conmutable que muestra las métricas de un FrameProfiler"""
+
+    WIDTH = 300
+    GRAPH_HEIGHT = 60
+    GRAPH_FRAMES = 150  # Frames visibles en la gráfica
+    GRAPH_MAX_MS = 50.0  # Escala vertical de la gráfica
+    STATS_INTERVAL = 0.25  # Segundos entre recálculos de percentiles
+
+    def __init__(self, screen, profiler, x=None, y=10):
+        """
+        Inicializa el overlay
+
+        Args:
+            screen: Superficie de pygame
+            profiler (FrameProfiler): Perfilador a visualizar
+            x (int): Posición x (por defecto, esquina superior derecha)
+            y (int): Posición y
+        """
+        self.screen = screen
+        self.profiler = profiler
+        self.x = WINDOW_WIDTH - self.WIDTH - 10 if x is None else x
+        self.y = y
+        self.visible = False
+
+        self.font = pygame.font.Font(None, FONT_SMALL)
+        self.background = pygame.Surface((self.WIDTH, WINDOW_HEIGHT))
+        self.background.set_alpha(180)
+        self.background.fill((0, 0, 0))
+
+        self._stats = None
+        self._stats_time = 0
+
+    def toggle(self):
+        """Muestra u oculta el overlay"""
+        self.visible = not self.visible
+
+    def handle_key(self, key):
+        """
+        Procesa las teclas del overlay (F3: mostrar, F4: exportar traza)
+
+        Returns:
+            bool: True si la tecla fue consumida
+        """
+        if key == pygame.K_F3:
+            self.toggle()
+            return True
+        if key == pygame.K_F4:
+            self.export_trace()
+            return True
+        return False
+
+    def export_trace(self):
+        """Exporta la traza actual a USER_DATA_DIR/traces"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.profiler.export_chrome_trace(USER_DATA_DIR / "traces" / f"trace_{stamp}.json")
+
+    def draw(self):
+        """Dibuja el overlay si está visible"""
+        if not self.visible:
+            return
+
+        # Los percentiles se recalculan pocas veces por segundo
+        now = pygame.time.get_ticks() / 1000.0
+        if self._stats is None or now - self._stats_time >= self.STATS_INTERVAL:
+            self._stats = self.profiler.get_stats()
+            self._stats_time = now
+        stats = self._stats
+
+        lines = [
+            f"FPS {stats['fps']:.0f} | p50 {stats['frame_p50']:.1f} ms | p99 {stats['frame_p99']:.1f} ms",
+            f"Máx {stats['frame_max']:.1f} ms | Latencia det. {stats['latency_p50']:.0f} ms",
+        ]
+        lines += [f"  {name}: {avg:.2f} ms" for name, avg in stats['stages'].items()]
+
+        height = self.GRAPH_HEIGHT + 20 + len(lines) * 18
+        self.screen.blit(self.background, (self.x, self.y), (0, 0, self.WIDTH, height))
+
+        self._draw_graph()
+
+        text_y = self.y + self.GRAPH_HEIGHT + 12
+        for line in lines:
+            surface = self.font.render(line, True, TEXT_COLOR)
+            self.screen.blit(surface, (self.x + 6, text_y))
+            text_y += 18
+
+    def _draw_graph(self):
+        """Dibuja la gráfica de tiempos de frame recientes"""
+        frame_times = self.profiler.get_frame_times_ms()[-self.GRAPH_FRAMES:]
+        base_y = self.y + 6 + self.GRAPH_HEIGHT
+        step = self.WIDTH / self.GRAPH_FRAMES
+
+        # Línea de referencia del presupuesto de frame
+        budget_y = base_y - min(1000.0 / FPS / self.GRAPH_MAX_MS, 1.0) * self.GRAPH_HEIGHT
+        pygame.draw.line(self.screen, (80, 80, 80), (self.x, budget_y), (self.x + self.WIDTH, budget_y))
+
+        if len(frame_times) < 2:
+            return
+
+        points = [
+            (self.x + idx * step, base_y - min(ms / self.GRAPH_MAX_MS, 1.0) * self.GRAPH_HEIGHT)
+            for idx, ms in enumerate(frame_times)
+        ]
+        pygame.draw.lines(self.screen, SUCCESS_COLOR, False, points, 1)
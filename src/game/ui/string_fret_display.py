@@ -13,34 +13,28 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 from utils.config import *
+from music.instruments import get_instrument
 
 
 class StringFretDisplay:
     """Visual display of ukulele strings with fret positions"""
     
-    # Ukulele configuration
-    STRINGS = ['G', 'C', 'E', 'A']
-    STRING_MIDI_NOTES = {
-        'G': 67,  # G4
-        'C': 60,  # C4
-        'E': 64,  # E4
-        'A': 69,  # A4
-    }
-    
-    STRING_COLORS = {
-        'G': (100, 200, 100),  # Green
-        'C': (100, 150, 255),  # Blue
-        'E': (255, 100, 100),  # Red
-        'A': (255, 255, 100),  # Yellow
-    }
+    # String colors in physical order (ukulele: G, C, E, A)
+    STRING_PALETTE = [
+        (100, 200, 100),  # Green
+        (100, 150, 255),  # Blue
+        (255, 100, 100),  # Red
+        (255, 255, 100),  # Yellow
+        (255, 165, 0),    # Orange
+        (200, 120, 255),  # Purple
+    ]
     
     # Visual configuration
-    MAX_FRETS = 20  # Maximum fret to display
     FRET_WIDTH = 30
     FRET_HEIGHT = 40
     STRING_SPACING = 80
     
-    def __init__(self, screen, x=None, y=50, width=150):
+    def __init__(self, screen, x=None, y=50, width=150, instrument=None):
         """
         Initialize string/fret display
         
@@ -49,9 +43,18 @@ class StringFretDisplay:
             x: x position on screen (default: right side)
             y: y position on screen
             width: width of display area
+            instrument: music.instruments profile name (default: INSTRUMENT from config)
         """
         self.screen = screen
         
+        # Instrument configuration (strings, tuning and shared fret table)
+        self.instrument = get_instrument(instrument or INSTRUMENT)
+        self.strings = list(self.instrument.string_names)
+        self.string_colors = {name: self.STRING_PALETTE[idx % len(self.STRING_PALETTE)]
+                              for idx, name in enumerate(self.strings)}
+        self.max_frets = self.instrument.max_fret  # Maximum fret to display
+        self.fret_table = self.instrument.fret_table()
+        
         # Default to right side if not specified
         if x is None:
             x = WINDOW_WIDTH - width - 20
@@ -88,19 +91,13 @@ class StringFretDisplay:
         Returns:
             dict: {string_name: [fret_numbers]}
         """
-        frets = {}
-        
-        for string_name in self.STRINGS:
-            open_string_pitch = self.STRING_MIDI_NOTES[string_name]
-            
-            # Calculate fret number
-            fret = midi_pitch - open_string_pitch
-            
-            # Check if fret is within valid range (0-20)
-            if 0 <= fret <= self.MAX_FRETS:
-                frets[string_name] = [fret]
+        if not 0 <= midi_pitch < len(self.fret_table):
+            return {}
         
-        return frets
+        # Precomputed row: fret on each string, -1 when out of range (0-max_frets)
+        return {string_name: [fret]
+                for string_name, fret in zip(self.strings, self.fret_table[midi_pitch].tolist())
+                if fret >= 0}
     
     def update_from_frequency(self, frequency):
         """
@@ -131,11 +128,11 @@ class StringFretDisplay:
         self.screen.blit(title, (self.x, self.y))
         
         # Draw each string with only applicable frets
-        for idx, string_name in enumerate(self.STRINGS):
+        for idx, string_name in enumerate(self.strings):
             string_y = self.y + 30 + (idx * 50)
             
             # Draw string label
-            label = self.font_label.render(string_name, True, self.STRING_COLORS[string_name])
+            label = self.font_label.render(string_name, True, self.string_colors[string_name])
             self.screen.blit(label, (self.x, string_y))
             
             # Draw applicable frets for this string
@@ -146,7 +143,7 @@ class StringFretDisplay:
         Draw only applicable frets for a specific string
         
         Args:
-            string_name (str): String identifier ('G', 'C', 'E', 'A')
+            string_name (str): String identifier (e.g. 'G', 'C', 'E', 'A')
             y (int): Y position to draw
         """
         possible = self.possible_frets.get(string_name, [])
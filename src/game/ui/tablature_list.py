@@ -0,0 +1,217 @@
+"""
+Lista virtualizada de tablaturas
+Dibuja solo las filas visibles, pagina con el teclado y filtra al escribir
+"""
+
+import pygame
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+# Agregar src al path
+current_dir = Path(__file__).parent.parent.parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from utils.config import *
+
+
+class TablatureList:
+    """
+    Selector de tablaturas para bibliotecas grandes
+
+    El índice de búsqueda (nombres normalizados) se construye una vez; cada
+    tecla filtra los resultados anteriores si la consulta solo creció. Las
+    filas y los metadatos se generan al hacerse visibles y se cachean.
+    """
+
+    ROW_HEIGHT = 44
+    ROW_CACHE_SIZE = 256  # Superficies de fila conservadas (LRU)
+
+    SELECT = 'select'
+    BACK = 'back'
+
+    def __init__(self, names, rect, font=None, font_small=None, info_provider=None):
+        """
+        Inicializa la lista
+
+        Args:
+            names (list): Nombres de tablatura ordenados
+            rect (pygame.Rect): Área de la lista en pantalla
+            font: Fuente de los nombres
+            font_small: Fuente de los metadatos y la barra de búsqueda
+            info_provider (callable): nombre -> {'duration', 'total_notes'} o None
+        """
+        self.names = list(names)
+        self.rect = pygame.Rect(rect)
+        self.font = font
+        self.font_small = font_small
+        self.info_provider = info_provider
+
+        # Índice de búsqueda: mismo orden que names
+        self._keys = [self._normalize(name) for name in self.names]
+
+        self.query = ""
+        self.matches = list(range(len(self.names)))  # Índices en names que coinciden
+        self.selected = 0  # Posición en matches
+        self.top = 0  # Primera fila visible
+
+        # Una fila de búsqueda arriba; el resto son filas de la lista
+        self.visible_rows = max((self.rect.height - self.ROW_HEIGHT) // self.ROW_HEIGHT, 1)
+
+        self._info = {}  # nombre -> metadatos (None si no disponibles)
+        self._rows = OrderedDict()  # (nombre, resaltada) -> superficie
+
+    @staticmethod
+    def _normalize(text):
+        return text.lower().replace('_', ' ')
+
+    def get_selected(self):
+        """Nombre seleccionado o None si el filtro no deja resultados"""
+        if not self.matches:
+            return None
+        return self.names[self.matches[self.selected]]
+
+    def set_query(self, query):
+        """
+        Filtra la lista por subcadena
+
+        Args:
+            query (str): Texto de búsqueda
+        """
+        needle = self._normalize(query)
+        previous = self._normalize(self.query)
+
+        # Si la consulta solo creció, basta con filtrar los resultados actuales
+        candidates = self.matches if needle.startswith(previous) else range(len(self.names))
+        keys = self._keys
+        self.matches = [idx for idx in candidates if needle in keys[idx]]
+
+        self.query = query
+        self.selected = 0
+        self.top = 0
+
+    def move(self, delta):
+        """Mueve la selección delta filas (limitada a la lista)"""
+        if not self.matches:
+            return
+        self.selected = min(max(self.selected + delta, 0), len(self.matches) - 1)
+
+        # Desplazar la ventana visible para mantener la selección en pantalla
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.visible_rows:
+            self.top = self.selected - self.visible_rows + 1
+
+    def handle_key(self, event):
+        """
+        Procesa una tecla
+
+        Args:
+            event: Evento KEYDOWN
+
+        Returns:
+            str|bool: SELECT, BACK, True si cambió la lista o False si se ignoró
+        """
+        key = event.key
+
+        if key == pygame.K_RETURN:
+            return self.SELECT if self.matches else False
+        if key == pygame.K_ESCAPE:
+            if self.query:
+                self.set_query("")
+                return True
+            return self.BACK
+
+        moves = {
+            pygame.K_UP: -1,
+            pygame.K_DOWN: 1,
+            pygame.K_PAGEUP: -self.visible_rows,
+            pygame.K_PAGEDOWN: self.visible_rows,
+            pygame.K_HOME: -len(self.matches),
+            pygame.K_END: len(self.matches),
+        }
+        if key in moves:
+            self.move(moves[key])
+            return True
+
+        if key == pygame.K_BACKSPACE:
+            if not self.query:
+                return False
+            self.set_query(self.query[:-1])
+            return True
+
+        if event.unicode and event.unicode.isprintable():
+            self.set_query(self.query + event.unicode)
+            return True
+
+        return False
+
+    def _get_info(self, name):
+        """Metadatos de una tablatura, cargados la primera vez que se muestra"""
+        if name not in self._info:
+            self._info[name] = self.info_provider(name) if self.info_provider else None
+        return self._info[name]
+
+    def _render_row(self, name, highlighted):
+        """Superficie de una fila (nombre + duración y notas), con cache LRU"""
+        key = (name, highlighted)
+        surface = self._rows.get(key)
+        if surface is not None:
+            self._rows.move_to_end(key)
+            return surface
+
+        surface = pygame.Surface((self.rect.width, self.ROW_HEIGHT), pygame.SRCALPHA)
+        if highlighted:
+            surface.fill((60, 60, 90))
+
+        color = (255, 255, 100) if highlighted else TEXT_COLOR
+        surface.blit(self.font.render(name, True, color), (10, 8))
+
+        info = self._get_info(name)
+        if info:
+            minutes, seconds = divmod(int(info.get('duration', 0)), 60)
+            meta = self.font_small.render(
+                f"{minutes}:{seconds:02d} | {info.get('total_notes', 0)} notas", True, (150, 150, 150)
+            )
+            # El texto de metadatos tapa el final de nombres muy largos
+            meta_x = self.rect.width - meta.get_width() - 10
+            surface.fill((60, 60, 90) if highlighted else BACKGROUND_COLOR,
+                         (meta_x - 10, 0, meta.get_width() + 20, self.ROW_HEIGHT))
+            surface.blit(meta, (meta_x, 12))
+
+        self._rows[key] = surface
+        if len(self._rows) > self.ROW_CACHE_SIZE:
+            self._rows.popitem(last=False)
+        return surface
+
+    def draw(self, screen):
+        """Dibuja la barra de búsqueda y solo las filas visibles"""
+        x, y = self.rect.topleft
+
+        search = f"Buscar: {self.query}_" if self.query else "Escribe para buscar..."
+        counter = f"{len(self.matches)}/{len(self.names)}"
+        screen.blit(self.font_small.render(search, True, (150, 150, 150)), (x + 10, y + 10))
+        counter_surface = self.font_small.render(counter, True, (150, 150, 150))
+        screen.blit(counter_surface, (self.rect.right - counter_surface.get_width() - 10, y + 10))
+
+        list_y = y + self.ROW_HEIGHT
+        end = min(self.top + self.visible_rows, len(self.matches))
+        for row, pos in enumerate(range(self.top, end)):
+            name = self.names[self.matches[pos]]
+            screen.blit(self._render_row(name, pos == self.selected), (x, list_y + row * self.ROW_HEIGHT))
+
+        self._draw_scrollbar(screen, list_y)
+
+    def _draw_scrollbar(self, screen, list_y):
+        """Dibuja la barra de desplazamiento si la lista no cabe"""
+        total = len(self.matches)
+        if total <= self.visible_rows:
+            return
+
+        track_height = self.visible_rows * self.ROW_HEIGHT
+        thumb_height = max(track_height * self.visible_rows // total, 12)
+        thumb_y = list_y + (track_height - thumb_height) * self.top // (total - self.visible_rows)
+
+        pygame.draw.rect(screen, (60, 60, 60), (self.rect.right + 4, list_y, 6, track_height))
+        pygame.draw.rect(screen, (180, 180, 180), (self.rect.right + 4, thumb_y, 6, thumb_height))
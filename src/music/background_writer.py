@@ -0,0 +1,165 @@
+"""
+Escritura atómica de archivos en segundo plano
+Archivo temporal + os.replace ejecutado por un hilo escritor con cola acotada
+"""
+
+import atexit
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+def atomic_write(path: Union[str, Path], data: bytes, fsync: bool = True) -> Path:
+    """
+    Escribe un archivo de forma atómica
+
+    Los bytes van a un temporal en la misma carpeta que se renombra sobre el
+    destino con os.replace: un lector (o un corte de luz) ve el archivo
+    anterior completo o el nuevo completo, nunca uno a medias.
+
+    Args:
+        path (str): Archivo destino
+        data (bytes): Contenido
+        fsync (bool): Forzar los datos a disco antes de renombrar
+
+    Returns:
+        Path: Ruta escrita
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        # Persistir también la entrada de directorio del rename (POSIX)
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    return path
+
+
+class BackgroundWriter:
+    """
+    Hilo escritor de archivos
+
+    submit() devuelve un Future que se completa con la ruta escrita (o con la
+    excepción). La cola es acotada: si hay max_pending escrituras esperando,
+    submit bloquea al llamador en vez de acumular memoria sin límite.
+    """
+
+    def __init__(self, max_pending: int = 64, fsync: bool = True):
+        """
+        Inicializa el escritor (el hilo arranca con la primera escritura)
+
+        Args:
+            max_pending (int): Escrituras encoladas como máximo
+            fsync (bool): Forzar cada archivo a disco antes de renombrarlo
+        """
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter cerrado")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+                self._thread.start()
+                # Un hilo daemon muere con el intérprete: vaciar la cola antes
+                atexit.register(self.close)
+
+    def submit(self, path: Union[str, Path], data: bytes,
+               on_done: Optional[Callable[[Path], None]] = None) -> Future:
+        """
+        Encola una escritura atómica
+
+        Args:
+            path (str): Archivo destino
+            data (bytes): Contenido
+            on_done (callable): Se ejecuta en el hilo escritor tras escribir (recibe la ruta)
+
+        Returns:
+            Future: Se resuelve con la ruta escrita
+        """
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((Path(path), data, on_done, future))
+        return future
+
+    def _run(self):
+        """Bucle del hilo escritor"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                path, data, on_done, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    atomic_write(path, data, self.fsync)
+                    if on_done is not None:
+                        on_done(path)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(path)
+            finally:
+                self._queue.task_done()
+
+    def has_queued(self) -> bool:
+        """Indica si quedan escrituras en cola (sin contar la que está en curso)"""
+        return not self._queue.empty()
+
+    def flush(self):
+        """Espera a que terminen todas las escrituras encoladas"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Termina las escrituras pendientes y detiene el hilo"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+_default_writer = None
+_default_lock = threading.Lock()
+
+
+def get_default_writer() -> BackgroundWriter:
+    """Escritor compartido por los gestores que no reciben uno propio"""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = BackgroundWriter()
+        return _default_writer
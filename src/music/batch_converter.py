@@ -0,0 +1,224 @@
+"""
+Conversión por lotes de MIDI a tablaturas
+Recorre un árbol de carpetas y convierte cada archivo en un proceso aparte
+"""
+
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from . import note_array
+from .background_writer import atomic_write
+from .instruments import DEFAULT_INSTRUMENT
+from .midi_loader import MIDILoader
+from .tablature_binary import BINARY_SUFFIX, encode
+from .tablature_catalog import TablatureCatalog
+from .tablature_manager import TablatureManager
+
+
+# Programas General MIDI que no sirven como melodía (0-based)
+BASS_PROGRAMS = range(32, 40)
+EFFECT_PROGRAMS = range(112, 128)  # Percusión melódica y efectos de sonido
+
+
+def find_midi_files(root) -> List[Path]:
+    """
+    Recorre un árbol de carpetas buscando archivos MIDI (sin cargar ninguno)
+
+    Args:
+        root (str): Carpeta raíz
+
+    Returns:
+        List[Path]: Archivos .mid/.midi ordenados por ruta
+    """
+    return MIDILoader(root, recursive=True).midi_files
+
+
+def source_name(path: Path, root: Path) -> str:
+    """
+    Nombre de origen de un MIDI dentro del árbol
+
+    Los archivos de subcarpetas llevan la ruta relativa unida con '__' para
+    que dos canciones con el mismo nombre en carpetas distintas no choquen.
+    """
+    relative = Path(path).relative_to(root).with_suffix('')
+    return '__'.join(relative.parts)
+
+
+def select_melodic_tracks(tracks_info: List[Dict], min_notes: int = 8) -> List[Dict]:
+    """
+    Ordena las pistas candidatas a melodía
+
+    Descarta percusión, pistas con menos de min_notes notas y, si hay
+    alternativas, bajos y efectos. Las más densas van primero.
+
+    Args:
+        tracks_info (List[Dict]): Resultado de MIDILoader.get_track_info
+        min_notes (int): Notas mínimas de una pista
+
+    Returns:
+        List[Dict]: Pistas candidatas en orden de preferencia
+    """
+    candidates = [info for info in tracks_info
+                  if not info['is_drum'] and info['note_count'] >= min_notes]
+
+    melodic = [info for info in candidates
+               if info['program'] not in BASS_PROGRAMS and info['program'] not in EFFECT_PROGRAMS]
+    if melodic:
+        candidates = melodic
+
+    return sorted(candidates, key=lambda info: (-info['note_count'], info['index']))
+
+
+_loader = None  # MIDILoader del proceso de trabajo
+
+
+def _init_worker(midi_folder, cache_folder=None, use_cache=True):
+    """Inicializa el cargador (y su cache de notas) una vez por proceso"""
+    global _loader
+    _loader = MIDILoader(midi_folder, cache_folder=cache_folder, use_cache=use_cache)
+
+
+def convert_file(path, root, output_folder, max_tracks: int = 1,
+                 min_notes: int = 8, fsync: bool = True,
+                 instrument: str = DEFAULT_INSTRUMENT) -> Dict:
+    """
+    Convierte un archivo MIDI (se ejecuta en un proceso de trabajo)
+
+    Escribe cada tablatura .ukt de forma atómica y devuelve sus entradas de
+    catálogo: el catálogo lo escribe solo el proceso principal. Cualquier
+    error queda en el resultado en vez de propagarse, así un archivo roto
+    no detiene el lote.
+
+    Args:
+        path (Path): Archivo MIDI
+        root (Path): Carpeta raíz del lote (para el nombre de origen)
+        output_folder (Path): Carpeta de tablaturas
+        max_tracks (int): Pistas melódicas a convertir como máximo
+        min_notes (int): Notas mínimas (dentro del rango) de una pista
+        fsync (bool): Forzar cada tablatura a disco
+        instrument (str): Perfil de instruments.INSTRUMENTS (rango y digitación)
+
+    Returns:
+        Dict: {'file', 'tablatures' (nombre -> entrada de catálogo), 'error'}
+    """
+    name = source_name(path, root)
+    result = {'file': name, 'tablatures': {}, 'error': None}
+
+    try:
+        if _loader is None:
+            _init_worker(root)
+        loader = _loader
+        midi = loader.load_notes_file(path)
+        tempo = midi.initial_tempo
+
+        for info in select_melodic_tracks(loader.get_track_info(midi), min_notes):
+            if len(result['tablatures']) >= max_tracks:
+                break
+
+            notes = loader.get_track_array(midi, info['index'])
+            if len(notes) < min_notes:
+                continue  # Casi todo fuera del rango del ukulele
+
+            notes = loader.trim_silence(notes)
+            notes, octaves = loader.adjust_to_ukulele_range(notes, instrument)
+
+            tab_name, data = TablatureManager.build_tablature_data(
+                name, info['index'], note_array.to_tuples(notes), octaves, tempo,
+                metadata={"track_name": info['name'], "created_by": "Batch Converter"},
+                instrument=instrument
+            )
+            raw = encode(data)
+            tab_path = atomic_write(Path(output_folder) / f"{tab_name}{BINARY_SUFFIX}", raw, fsync)
+            result['tablatures'][tab_name] = TablatureCatalog.build_entry(
+                data, raw, tab_path.stat(), BINARY_SUFFIX
+            )
+
+        if not result['tablatures']:
+            result['error'] = "sin pistas melódicas"
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+
+    return result
+
+
+def convert_folder(midi_root,
+                   manager: TablatureManager = None,
+                   workers: Optional[int] = None,
+                   max_tracks: int = 1,
+                   min_notes: int = 8,
+                   skip_existing: bool = True,
+                   fsync: bool = True,
+                   cache_folder=None,
+                   use_cache: bool = True,
+                   instrument: str = DEFAULT_INSTRUMENT,
+                   progress: Callable[[int, int, Dict], None] = None) -> List[Dict]:
+    """
+    Convierte todos los MIDI de un árbol de carpetas en paralelo
+
+    Args:
+        midi_root (str): Carpeta raíz con archivos MIDI (se recorre entera)
+        manager (TablatureManager): Destino (por defecto, assets/tablatures)
+        workers (int): Procesos de trabajo (None = todos los núcleos, 1 = sin pool)
+        max_tracks (int): Pistas melódicas por archivo
+        min_notes (int): Notas mínimas de una pista
+        skip_existing (bool): Saltar MIDI que ya tienen tablaturas en el catálogo
+        fsync (bool): Forzar cada tablatura a disco
+        cache_folder (str): Carpeta de la cache de notas MIDI (ver MidiNoteCache)
+        use_cache (bool): Leer y guardar las notas en la cache
+        instrument (str): Perfil de instruments.INSTRUMENTS para el que se digita
+        progress (callable): progress(hechos, total, resultado) tras cada archivo
+
+    Returns:
+        List[Dict]: Un resultado por archivo procesado (ver convert_file)
+    """
+    midi_root = Path(midi_root)
+    manager = manager or TablatureManager()
+    output_folder = manager.tablature_folder
+
+    files = list(find_midi_files(midi_root))
+    if skip_existing:
+        manager.flush()
+        done_sources = manager.catalog.get_sources()
+        files = [path for path in files if source_name(path, midi_root) not in done_sources]
+
+    total = len(files)
+    results = []
+    entries = {}
+
+    def collect(result):
+        results.append(result)
+        entries.update(result['tablatures'])
+        if progress is not None:
+            progress(len(results), total, result)
+
+    try:
+        if workers == 1:
+            _init_worker(midi_root, cache_folder, use_cache)
+            for path in files:
+                collect(convert_file(path, midi_root, output_folder, max_tracks, min_notes, fsync,
+                                     instrument))
+        elif files:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(midi_root, cache_folder, use_cache)) as executor:
+                futures = {
+                    executor.submit(convert_file, path, midi_root, output_folder,
+                                    max_tracks, min_notes, fsync, instrument): path
+                    for path in files
+                }
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # El proceso murió (p. ej. sin memoria): solo falla ese archivo
+                        result = {'file': source_name(futures[future], midi_root),
+                                  'tablatures': {}, 'error': f"{type(e).__name__}: {e}"}
+                    collect(result)
+    finally:
+        # Una sola escritura del catálogo para todo el lote
+        if entries:
+            manager.register_tablatures(entries)
+
+    return results
@@ -0,0 +1,208 @@
+"""
+Digitación de tablaturas por programación dinámica
+Elige cuerda y traste de cada nota minimizando los desplazamientos de la mano
+"""
+
+from functools import lru_cache
+from itertools import permutations
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Afinación estándar GCEA (cuerdas en orden físico: G, C, E, A)
+STANDARD_TUNING = (67, 60, 64, 69)
+STRING_NAMES = ('G', 'C', 'E', 'A')
+
+MAX_FRET = 19  # Trastes 0-19, como el mapa de UkuleleTableGenerator
+
+CHORD_TOLERANCE = 0.03  # Notas que empiezan a menos de 30 ms forman un acorde
+MAX_SPAN = 3  # Distancia máxima entre trastes pisados de un acorde (4 dedos)
+REACH = 3  # Trastes alcanzables sin cambiar de posición
+
+# Pesos del coste
+FRET_WEIGHT = 0.25  # Por traste de altura: preferir posiciones bajas y cuerdas al aire
+MOVE_WEIGHT = 1.0  # Por traste que se desplaza la mano
+SHIFT_PENALTY = 2.0  # Cambio de posición (desplazamiento mayor que REACH)
+STRING_WEIGHT = 0.3  # Por cuerda de cruce
+
+BLOCK = 4096  # Eventos por bloque de matrices de transición (acota la memoria)
+
+
+def fret_table(tuning: Sequence[int] = STANDARD_TUNING, max_fret: int = MAX_FRET) -> np.ndarray:
+    """
+    Tabla de búsqueda pitch MIDI -> traste en cada cuerda
+
+    Se construye una sola vez por afinación y es de solo lectura, así que
+    puede compartirse entre instancias e hilos sin copias.
+
+    Returns:
+        np.ndarray: int16 de forma (128, cuerdas); -1 si la cuerda no da el pitch
+    """
+    return _fret_table(tuple(int(pitch) for pitch in tuning), int(max_fret))
+
+
+@lru_cache(maxsize=None)
+def _fret_table(tuning: Tuple[int, ...], max_fret: int) -> np.ndarray:
+    frets = np.arange(128, dtype=np.int16)[:, None] - np.asarray(tuning, dtype=np.int16)[None, :]
+    table = np.where((frets >= 0) & (frets <= max_fret), frets, -1).astype(np.int16)
+    table.setflags(write=False)
+    return table
+
+
+def fold_to_range(pitch: np.ndarray, low: int, high: int) -> np.ndarray:
+    """
+    Lleva cada pitch al rango [low, high] por octavas
+
+    Las notas que ninguna cuerda puede dar se digitan en la octava tocable
+    más cercana (el pitch guardado no cambia).
+    """
+    pitch = np.asarray(pitch, dtype=np.int32)
+    below = pitch < low
+    above = pitch > high
+    pitch = pitch.copy()
+    pitch[below] += 12 * ((low - pitch[below] + 11) // 12)
+    pitch[above] -= 12 * ((pitch[above] - high + 11) // 12)
+    return pitch
+
+
+def _chord_shapes(pitches: Sequence[int],
+                  table: np.ndarray) -> List[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """Formas tocables de un acorde: una cuerda distinta por nota y apertura acotada"""
+    shapes = []
+    rows = table[list(pitches)].tolist()
+    for strings in permutations(range(table.shape[1]), len(pitches)):
+        frets = tuple(row[string] for row, string in zip(rows, strings))
+        if min(frets) < 0:
+            continue
+        fretted = [fret for fret in frets if fret > 0]
+        if fretted and max(fretted) - min(fretted) > MAX_SPAN:
+            continue
+        shapes.append((strings, frets))
+    return shapes
+
+
+def assign_fingering(pitches: Sequence[int], starts: Sequence[float],
+                     tuning: Sequence[int] = STANDARD_TUNING,
+                     max_fret: int = MAX_FRET,
+                     events: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Asigna cuerda y traste a cada nota (Viterbi sobre las posiciones candidatas)
+
+    Las notas simultáneas forman un acorde con una cuerda por nota y una
+    apertura de como mucho MAX_SPAN trastes; si no hay forma tocable se
+    digitan como notas sueltas. Cada evento tiene k candidatos (k = número de
+    cuerdas para notas sueltas) y el camino de coste mínimo se encuentra en
+    O(n·k²): coste propio de cada candidato (altura de los trastes) más coste
+    de transición (desplazamiento de la mano, cambios de posición y cruce
+    de cuerdas).
+
+    Args:
+        pitches (Sequence[int]): Pitch MIDI de cada nota
+        starts (Sequence[float]): Inicio de cada nota en segundos
+        tuning (Sequence[int]): Pitch de cada cuerda al aire, en orden físico
+        max_fret (int): Último traste utilizable
+        events (Sequence[int]): Evento de cada nota (p. ej. la casilla de una
+            rejilla); las notas con el mismo valor forman un acorde. Por
+            defecto se agrupan las que empiezan a menos de CHORD_TOLERANCE
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (índice de cuerda, traste) de cada
+            nota, en el orden de entrada
+    """
+    table = fret_table(tuning, max_fret)
+    n_strings = table.shape[1]
+    count = len(pitches)
+    strings_out = np.zeros(count, dtype=np.int8)
+    frets_out = np.zeros(count, dtype=np.int16)
+    if count == 0:
+        return strings_out, frets_out
+
+    starts = np.asarray(starts, dtype=np.float64)
+    if events is None:
+        order = np.argsort(starts, kind='stable')
+        splits = np.flatnonzero(np.diff(starts[order]) > CHORD_TOLERANCE) + 1
+    else:
+        events = np.asarray(events, dtype=np.int64)
+        order = np.lexsort((starts, events))
+        splits = np.flatnonzero(np.diff(events[order]) != 0) + 1
+    playable = np.flatnonzero((table >= 0).any(axis=1))
+    played = fold_to_range(np.asarray(pitches)[order], int(playable[0]), int(playable[-1]))
+
+    # Eventos: una nota suelta o un acorde (notas casi simultáneas)
+    bounds = np.concatenate(([0], splits, [count]))
+    event_notes = []  # Índices (en el orden ordenado) de las notas de cada evento
+    chord_shapes = {}  # evento -> formas candidatas
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if hi - lo > 1:
+            shapes = _chord_shapes(played[lo:hi].tolist(), table)
+            if shapes:
+                chord_shapes[len(event_notes)] = shapes
+                event_notes.append(list(range(lo, hi)))
+                continue
+        event_notes.extend([idx] for idx in range(lo, hi))
+
+    n_events = len(event_notes)
+    width = max([n_strings] + [len(shapes) for shapes in chord_shapes.values()])
+
+    # Rasgos de cada candidato: posición de la mano (NaN si todo al aire),
+    # centro de las cuerdas usadas y coste propio (inf = candidato inexistente)
+    position = np.full((n_events, width), np.nan)
+    center = np.zeros((n_events, width))
+    unary = np.full((n_events, width), np.inf)
+
+    singles = np.array([event for event in range(n_events) if event not in chord_shapes], dtype=np.int64)
+    if len(singles):
+        single_pitch = played[[event_notes[event][0] for event in singles]]
+        frets = table[single_pitch]
+        valid = frets >= 0
+        position[singles, :n_strings] = np.where(frets > 0, frets, np.nan)
+        center[singles, :n_strings] = np.arange(n_strings)
+        unary[singles, :n_strings] = np.where(valid, FRET_WEIGHT * frets, np.inf)
+
+    for event, shapes in chord_shapes.items():
+        for j, (strings, frets) in enumerate(shapes):
+            fretted = [fret for fret in frets if fret > 0]
+            position[event, j] = min(fretted) if fretted else np.nan
+            center[event, j] = sum(strings) / len(strings)
+            unary[event, j] = FRET_WEIGHT * max(frets)
+
+    # Viterbi
+    score = unary[0].copy()
+    back = np.empty((max(n_events - 1, 0), width), dtype=np.int32)
+    columns = np.arange(width)
+
+    for block_start in range(0, n_events - 1, BLOCK):
+        block_end = min(block_start + BLOCK, n_events - 1)
+        prev = slice(block_start, block_end)
+        nxt = slice(block_start + 1, block_end + 1)
+
+        move = np.abs(position[prev, :, None] - position[nxt, None, :])
+        np.nan_to_num(move, copy=False, nan=0.0)  # Cuerdas al aire: la mano no se mueve
+        transition = (MOVE_WEIGHT * move + SHIFT_PENALTY * (move > REACH)
+                      + STRING_WEIGHT * np.abs(center[prev, :, None] - center[nxt, None, :]))
+
+        for offset, cost in enumerate(transition):
+            event = block_start + offset
+            total = score[:, None] + cost
+            best = total.argmin(axis=0)
+            back[event] = best
+            score = total[best, columns] + unary[event + 1]
+
+    # Recuperar el camino
+    choice = np.empty(n_events, dtype=np.int32)
+    choice[-1] = int(score.argmin())
+    for event in range(n_events - 1, 0, -1):
+        choice[event - 1] = back[event - 1, choice[event]]
+
+    for event, notes in enumerate(event_notes):
+        j = int(choice[event])
+        if event in chord_shapes:
+            strings, frets = chord_shapes[event][j]
+        else:
+            strings, frets = (j,), (int(table[played[notes[0]], j]),)
+        for note, string, fret in zip(notes, strings, frets):
+            strings_out[order[note]] = string
+            frets_out[order[note]] = fret
+
+    return strings_out, frets_out
@@ -0,0 +1,136 @@
+"""
+Perfiles de instrumento (afinación, trastes y rango de frecuencias)
+Registro único que usan los mapas de trastes, la digitación, la detección y el juego
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from .fingering import MAX_FRET, fret_table
+
+
+NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+
+def midi_to_frequency(pitch: float) -> float:
+    """Frecuencia en Hz de un pitch MIDI (A4 = 69 = 440 Hz)"""
+    return 440.0 * 2 ** ((pitch - 69) / 12)
+
+
+def midi_to_name(pitch: int) -> str:
+    """Nombre de nota con octava (60 -> 'C4')"""
+    return f"{NOTE_NAMES[pitch % 12]}{pitch // 12 - 1}"
+
+
+class InstrumentProfile:
+    """
+    Instrumento de cuerda: cuerdas en orden físico, último traste y banda de detección
+
+    Los perfiles son inmutables; las estructuras derivadas (tabla de trastes,
+    tabla de notas) se calculan una vez y se comparten.
+    """
+
+    def __init__(self, name: str, label: str, string_names: Sequence[str], tuning: Sequence[int],
+                 max_fret: int = MAX_FRET, min_frequency: float = None, max_frequency: float = None):
+        """
+        Args:
+            name (str): Clave del registro
+            label (str): Nombre para mostrar
+            string_names (Sequence[str]): Nombre de cada cuerda (únicos)
+            tuning (Sequence[int]): Pitch MIDI de cada cuerda al aire
+            max_fret (int): Último traste utilizable
+            min_frequency (float): Límite inferior de detección en Hz
+                                   (por defecto, una octava bajo la cuerda más grave)
+            max_frequency (float): Límite superior de detección en Hz
+                                   (por defecto, la nota más aguda)
+        """
+        if len(string_names) != len(tuning) or len(set(string_names)) != len(string_names):
+            raise ValueError(f"Perfil {name!r}: nombres de cuerda y afinación no coinciden")
+
+        self.name = name
+        self.label = label
+        self.string_names = tuple(string_names)
+        self.tuning = tuple(int(pitch) for pitch in tuning)
+        self.max_fret = int(max_fret)
+        self.min_pitch = min(self.tuning)
+        self.max_pitch = max(self.tuning) + self.max_fret
+        if min_frequency is None:
+            min_frequency = math.floor(midi_to_frequency(self.min_pitch - 12))
+        if max_frequency is None:
+            max_frequency = math.ceil(midi_to_frequency(self.max_pitch))
+        self.min_frequency = float(min_frequency)
+        self.max_frequency = float(max_frequency)
+
+    def __repr__(self):
+        return f"InstrumentProfile({self.name!r}, {''.join(self.string_names)})"
+
+    @property
+    def string_count(self) -> int:
+        return len(self.tuning)
+
+    @property
+    def open_strings(self) -> Dict[str, int]:
+        """Nombre de cuerda -> pitch MIDI al aire"""
+        return dict(zip(self.string_names, self.tuning))
+
+    def fret_table(self) -> np.ndarray:
+        """Tabla pitch -> traste por cuerda (ver fingering.fret_table), compartida"""
+        return fret_table(self.tuning, self.max_fret)
+
+    def string_frequencies(self) -> Dict[str, float]:
+        """Nota de cada cuerda al aire -> frecuencia en Hz, en orden físico"""
+        return {midi_to_name(pitch): round(midi_to_frequency(pitch), 2) for pitch in self.tuning}
+
+    def note_frequencies(self) -> Dict[str, float]:
+        """Notas dentro de la banda de detección -> frecuencia en Hz (compartido, no modificar)"""
+        return _note_frequencies(self.min_frequency, self.max_frequency)
+
+
+@lru_cache(maxsize=None)
+def _note_frequencies(min_frequency: float, max_frequency: float) -> Dict[str, float]:
+    low = math.ceil(69 + 12 * math.log2(min_frequency / 440.0) - 1e-9)
+    high = math.floor(69 + 12 * math.log2(max_frequency / 440.0) + 1e-9)
+    return {midi_to_name(pitch): round(midi_to_frequency(pitch), 2) for pitch in range(low, high + 1)}
+
+
+# Registro de instrumentos
+INSTRUMENTS = {
+    profile.name: profile for profile in (
+        # Banda histórica del juego: C3 (130 Hz) a E6 (1320 Hz)
+        InstrumentProfile('soprano', 'Ukulele soprano/concierto (GCEA)', ('G', 'C', 'E', 'A'),
+                          (67, 60, 64, 69), min_frequency=130, max_frequency=1320),
+        InstrumentProfile('low_g', 'Ukulele con G grave (gCEA)', ('G', 'C', 'E', 'A'), (55, 60, 64, 69)),
+        InstrumentProfile('tenor', 'Ukulele tenor (GCEA)', ('G', 'C', 'E', 'A'), (67, 60, 64, 69)),
+        InstrumentProfile('baritone', 'Ukulele barítono (DGBE)', ('D', 'G', 'B', 'E'), (50, 55, 59, 64)),
+        InstrumentProfile('guitar', 'Guitarra (EADGBe)', ('E', 'A', 'D', 'G', 'B', 'e'),
+                          (40, 45, 50, 55, 59, 64)),
+    )
+}
+
+DEFAULT_INSTRUMENT = 'soprano'
+
+
+def get_instrument(name: str = None) -> InstrumentProfile:
+    """
+    Devuelve el perfil registrado con ese nombre
+
+    Args:
+        name (str): Clave del registro (por defecto, DEFAULT_INSTRUMENT)
+
+    Raises:
+        ValueError: Si el instrumento no existe
+    """
+    if isinstance(name, InstrumentProfile):
+        return name
+    try:
+        return INSTRUMENTS[name or DEFAULT_INSTRUMENT]
+    except KeyError:
+        raise ValueError(f"Instrumento desconocido: {name!r} (disponibles: {', '.join(INSTRUMENTS)})") from None
+
+
+def instrument_names() -> Tuple[str, ...]:
+    """Claves de los instrumentos registrados"""
+    return tuple(INSTRUMENTS)
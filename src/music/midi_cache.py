@@ -0,0 +1,141 @@
+"""
+Cache en disco de notas MIDI
+Guarda las pistas ya parseadas indexadas por el hash del contenido del archivo
+"""
+
+import hashlib
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .background_writer import atomic_write
+from .midi_notes import MidiNotes
+
+
+DEFAULT_CACHE_FOLDER = Path.home() / ".ukulele_hero" / "midi_cache"
+
+ARRAYS = ('pitch', 'start', 'end', 'offsets', 'tempo_times', 'tempi')
+
+
+class MidiNoteCache:
+    """
+    Notas de archivos MIDI en formato .npz, una entrada por contenido
+
+    La clave es el SHA-1 de los bytes del MIDI: renombrar o copiar un archivo
+    sigue acertando, y editarlo falla aunque conserve el nombre. Dentro del
+    proceso se recuerda (ruta, mtime, tamaño) -> hash para no releer
+    archivos ya vistos.
+    """
+
+    VERSION = 1  # Cambiar si cambia lo que se extrae del MIDI
+
+    def __init__(self, cache_folder=None):
+        """
+        Inicializa la cache (la carpeta se crea con la primera escritura)
+
+        Args:
+            cache_folder (str): Carpeta de la cache (por defecto, ~/.ukulele_hero/midi_cache)
+        """
+        self.cache_folder = Path(cache_folder or DEFAULT_CACHE_FOLDER)
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def file_hash(self, path) -> str:
+        """
+        Hash del contenido de un archivo (memorizado por mtime y tamaño)
+
+        Args:
+            path (str): Archivo MIDI
+
+        Returns:
+            str: SHA-1 hexadecimal
+        """
+        path = str(path)
+        stat = os.stat(path)
+        known = self._hashes.get(path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _entry_path(self, key: str) -> Path:
+        # Subcarpetas por prefijo: evita directorios con decenas de miles de archivos
+        return self.cache_folder / key[:2] / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[MidiNotes]:
+        """
+        Busca las notas de un contenido
+
+        Args:
+            key (str): Hash del archivo MIDI
+
+        Returns:
+            MidiNotes: Notas cacheadas o None (ausentes, de otra versión o dañadas)
+        """
+        try:
+            with np.load(self._entry_path(key), allow_pickle=False) as npz:
+                meta = json.loads(npz['meta'].tobytes().decode('utf-8'))
+                if meta.get('version') != self.VERSION:
+                    return None
+                arrays = {name: npz[name] for name in ARRAYS}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"⚠️ Entrada de cache MIDI dañada, se regenera: {e}")
+            return None
+
+        return MidiNotes(meta['tracks'], **arrays)
+
+    def put(self, key: str, notes: MidiNotes):
+        """
+        Guarda las notas de un contenido (escritura atómica)
+
+        Args:
+            key (str): Hash del archivo MIDI
+            notes (MidiNotes): Notas extraídas
+        """
+        path = self._entry_path(key)
+        try:
+            meta = json.dumps({'version': self.VERSION, 'tracks': notes.tracks},
+                              ensure_ascii=False).encode('utf-8')
+            buffer = io.BytesIO()
+            np.savez(buffer, meta=np.frombuffer(meta, dtype=np.uint8),
+                     **{name: getattr(notes, name) for name in ARRAYS})
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Sin fsync: si se pierde, se vuelve a parsear el MIDI
+            atomic_write(path, buffer.getvalue(), fsync=False)
+        except (OSError, TypeError, ValueError) as e:
+            # La cache es opcional: un fallo al guardar no impide usar las notas
+            print(f"⚠️ No se pudo escribir la cache MIDI: {e}")
+
+    def load(self, path, parse: Callable[[Path], MidiNotes]) -> MidiNotes:
+        """
+        Notas de un archivo: de la cache o parseándolo (y cacheando el resultado)
+
+        Args:
+            path (str): Archivo MIDI
+            parse (callable): ruta -> MidiNotes, usado solo si no está en cache
+
+        Returns:
+            MidiNotes: Notas del archivo
+        """
+        key = self.file_hash(path)
+        notes = self.get(key)
+        if notes is not None:
+            self.hits += 1
+            return notes
+
+        self.misses += 1
+        notes = parse(Path(path))
+        self.put(key, notes)
+        return notes
@@ -4,8 +4,20 @@ Cargador de archivos MIDI para extraer información de pistas
 
 import os
 from pathlib import Path
-import pretty_midi
-from typing import Optional, List, Tuple, Dict
+import numpy as np
+from typing import TYPE_CHECKING, Optional, List, Tuple, Dict, Union
+
+from .midi_cache import MidiNoteCache
+from . import note_array
+from .instruments import get_instrument
+from .midi_notes import MidiNotes
+from .midi_parser import MidiParseError, parse_midi_file
+
+if TYPE_CHECKING:
+    import pretty_midi  # Se importa al parsear (load_midi_file): es lento de cargar
+
+
+MIDI_SUFFIXES = ('.mid', '.midi')  # Se comparan en minúsculas (.MID, .Mid...)
 
 
 class MIDILoader:
@@ -15,13 +27,19 @@ class MIDILoader:
     UKULELE_MIN_NOTE = 36  # C2
     UKULELE_MAX_NOTE = 88  # E6
     
-    def __init__(self, midi_folder: str = None):
+    def __init__(self, midi_folder: str = None, cache_folder: str = None, use_cache: bool = True,
+                 fast_parser: bool = True, recursive: bool = False):
         """
         Inicializa el cargador MIDI
         
         Args:
             midi_folder (str): Ruta a la carpeta con archivos MIDI
                               Por defecto, usa assets/midi
+            cache_folder (str): Carpeta de la cache de notas (ver MidiNoteCache)
+            use_cache (bool): Usar la cache de notas en load_notes
+            fast_parser (bool): Leer las notas con midi_parser en vez de pretty_midi
+            recursive (bool): Listar también los MIDI de subcarpetas
+                              (nombres relativos, p. ej. "rock/cancion")
         """
         if midi_folder is None:
             # Usar carpeta assets/midi por defecto
@@ -29,34 +47,107 @@ class MIDILoader:
             midi_folder = project_root / "assets" / "midi"
         
         self.midi_folder = Path(midi_folder)
-        self.midi_files = []
-        self._scan_midi_files()
+        self.cache = MidiNoteCache(cache_folder) if use_cache else None
+        self.fast_parser = fast_parser
+        self.recursive = recursive
+        
+        # La carpeta se lista bajo demanda y se relista solo si cambia su mtime
+        self._dirs: Dict[Path, Tuple[int, List[Path], List[Path]]] = {}  # carpeta -> (mtime, MIDI, subcarpetas)
+        self._files: Optional[List[Path]] = None
+        self._warned_missing = False
+    
+    @property
+    def midi_files(self) -> List[Path]:
+        """Rutas de los archivos MIDI de la carpeta, ordenadas"""
+        self._refresh_files()
+        return self._files
     
-    def _scan_midi_files(self):
-        """Escanea la carpeta y lista todos los archivos .mid"""
-        if not self.midi_folder.exists():
-            print(f"⚠️ Carpeta MIDI no encontrada: {self.midi_folder}")
-            return
-        
-        self.midi_files = list(self.midi_folder.glob("*.mid")) + \
-                         list(self.midi_folder.glob("*.midi"))
-        self.midi_files.sort()
-        
-        if self.midi_files:
-            print(f"✅ {len(self.midi_files)} archivos MIDI encontrados")
+    def _refresh_files(self):
+        """
+        Actualiza el listado de archivos MIDI
+        
+        Cada carpeta se relee con os.scandir solo si su mtime cambió (se
+        crearon, borraron o renombraron entradas); si no, basta un stat.
+        """
+        files = []
+        seen = set()
+        changed = self._files is None
+        stack = [self.midi_folder]
+        
+        while stack:
+            folder = stack.pop()
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except OSError:
+                if folder == self.midi_folder and not self._warned_missing:
+                    print(f"⚠️ Carpeta MIDI no encontrada: {self.midi_folder}")
+                    self._warned_missing = True
+                continue
+            
+            cached = self._dirs.get(folder)
+            if cached is None or cached[0] != mtime_ns:
+                cached = self._scan_folder(folder, mtime_ns)
+                self._dirs[folder] = cached
+                changed = True
+            
+            seen.add(folder)
+            files.extend(cached[1])
+            if self.recursive:
+                stack.extend(cached[2])
+        
+        if len(seen) != len(self._dirs):
+            # Subcarpetas borradas
+            self._dirs = {folder: self._dirs[folder] for folder in seen}
+            changed = True
+        
+        if changed:
+            self._files = sorted(files)
+    
+    @staticmethod
+    def _scan_folder(folder: Path, mtime_ns: int) -> Tuple[int, List[Path], List[Path]]:
+        """Lista una carpeta: (mtime, archivos MIDI, subcarpetas)"""
+        files, subfolders = [], []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(Path(entry.path))
+                    elif entry.name.lower().endswith(MIDI_SUFFIXES) and entry.is_file():
+                        files.append(Path(entry.path))
+        except OSError as e:
+            print(f"⚠️ No se pudo leer {folder}: {e}")
+        return mtime_ns, files, subfolders
     
     def get_midi_files(self) -> List[str]:
         """
         Retorna lista de nombres de archivos MIDI disponibles
         
         Returns:
-            List[str]: Nombres de los archivos MIDI
+            List[str]: Nombres de los archivos MIDI (sin extensión; con la
+                       subcarpeta delante si el cargador es recursivo)
         """
-        return [f.stem for f in self.midi_files]
+        return [f.relative_to(self.midi_folder).with_suffix('').as_posix() for f in self.midi_files]
     
-    def load_midi(self, filename: str) -> Optional[pretty_midi.PrettyMIDI]:
+    def _find_midi_file(self, filename: str) -> Optional[Path]:
+        """Ruta de un MIDI de la carpeta (.mid o .midi, sin distinguir mayúsculas) o None"""
+        for suffix in MIDI_SUFFIXES:
+            midi_file = self.midi_folder / f"{filename}{suffix}"
+            if midi_file.exists():
+                return midi_file
+        
+        # Extensión con otras mayúsculas (cancion.MID, cancion.Mid): buscar en el listado
+        for midi_file in self.midi_files:
+            if midi_file.relative_to(self.midi_folder).with_suffix('').as_posix() == filename:
+                return midi_file
+        return None
+    
+    def load_midi(self, filename: str) -> Optional['pretty_midi.PrettyMIDI']:
         """
-        Carga un archivo MIDI
+        Carga un archivo MIDI completo
+        
+        Para pistas y notas es más rápido load_notes (usa la cache).
         
         Args:
             filename (str): Nombre del archivo (sin extensión)
@@ -64,33 +155,97 @@ class MIDILoader:
         Returns:
             pretty_midi.PrettyMIDI: Objeto MIDI o None si no existe
         """
-        # Buscar archivo con extensión .mid o .midi
-        midi_file = self.midi_folder / f"{filename}.mid"
-        if not midi_file.exists():
-            midi_file = self.midi_folder / f"{filename}.midi"
-        
-        if not midi_file.exists():
+        midi_file = self._find_midi_file(filename)
+        if midi_file is None:
             print(f"❌ Archivo MIDI no encontrado: {filename}")
             return None
         
         try:
-            midi = pretty_midi.PrettyMIDI(str(midi_file))
+            midi = self.load_midi_file(midi_file)
             print(f"✅ MIDI cargado: {filename}")
             return midi
         except Exception as e:
             print(f"❌ Error al cargar MIDI: {e}")
             return None
     
-    def get_track_info(self, midi: pretty_midi.PrettyMIDI) -> List[Dict]:
+    def load_notes(self, filename: str) -> Optional[MidiNotes]:
+        """
+        Carga las pistas y notas de un archivo MIDI
+        
+        Acepta lo mismo que load_midi y el resultado sirve igual para
+        get_track_info y get_track_notes, pero no usa pretty_midi: el archivo
+        se lee con midi_parser y, si el contenido ya se leyó alguna vez, sale
+        de la cache en disco.
+        
+        Args:
+            filename (str): Nombre del archivo (sin extensión)
+            
+        Returns:
+            MidiNotes: Notas del archivo o None si no existe o no es válido
+        """
+        midi_file = self._find_midi_file(filename)
+        if midi_file is None:
+            print(f"❌ Archivo MIDI no encontrado: {filename}")
+            return None
+        
+        try:
+            notes = self.load_notes_file(midi_file)
+            print(f"✅ MIDI cargado: {filename}")
+            return notes
+        except Exception as e:
+            print(f"❌ Error al cargar MIDI: {e}")
+            return None
+    
+    def load_notes_file(self, path) -> MidiNotes:
+        """
+        Notas de un archivo MIDI por ruta, a través de la cache
+        
+        Args:
+            path (str): Ruta del archivo .mid/.midi
+            
+        Returns:
+            MidiNotes: Notas (lanza excepción si el archivo no es válido)
+        """
+        if self.cache is None:
+            return self._parse_notes(Path(path))
+        return self.cache.load(path, self._parse_notes)
+    
+    def _parse_notes(self, path: Path) -> MidiNotes:
+        """Extrae las notas de un archivo (lector rápido; pretty_midi si no lo interpreta)"""
+        if self.fast_parser:
+            try:
+                return parse_midi_file(path)
+            except MidiParseError:
+                pass
+        return MidiNotes.from_pretty_midi(self.load_midi_file(path))
+    
+    @staticmethod
+    def load_midi_file(path) -> 'pretty_midi.PrettyMIDI':
+        """
+        Carga un archivo MIDI por ruta (fuera de la carpeta del cargador)
+        
+        Args:
+            path (str): Ruta del archivo .mid/.midi
+            
+        Returns:
+            pretty_midi.PrettyMIDI: Objeto MIDI (lanza excepción si no es válido)
+        """
+        import pretty_midi
+        return pretty_midi.PrettyMIDI(str(path))
+    
+    def get_track_info(self, midi: Union['pretty_midi.PrettyMIDI', MidiNotes]) -> List[Dict]:
         """
         Obtiene información de todas las pistas
         
         Args:
-            midi (pretty_midi.PrettyMIDI): Objeto MIDI cargado
+            midi (pretty_midi.PrettyMIDI | MidiNotes): MIDI cargado
             
         Returns:
             List[Dict]: Lista con info de cada pista
         """
+        if isinstance(midi, MidiNotes):
+            return [dict(info) for info in midi.tracks]
+        
         tracks_info = []
         
         for idx, instrument in enumerate(midi.instruments):
@@ -107,18 +262,21 @@ class MIDILoader:
         
         return tracks_info
     
-    def get_track_notes(self, midi: pretty_midi.PrettyMIDI, 
+    def get_track_notes(self, midi: Union['pretty_midi.PrettyMIDI', MidiNotes], 
                        track_index: int = 0) -> List[Tuple[int, float, float]]:
         """
         Extrae las notas de una pista específica
         
         Args:
-            midi (pretty_midi.PrettyMIDI): Objeto MIDI
+            midi (pretty_midi.PrettyMIDI | MidiNotes): MIDI cargado
             track_index (int): Índice de la pista (por defecto 0)
             
         Returns:
             List[Tuple[int, float, float]]: Lista de (pitch, start_time, end_time)
         """
+        if isinstance(midi, MidiNotes):
+            return self._get_track_notes_arrays(midi, track_index)
+        
         if track_index >= len(midi.instruments):
             print(f"❌ Pista {track_index} no existe")
             return []
@@ -135,6 +293,40 @@ class MIDILoader:
         notes.sort(key=lambda x: x[1])
         return notes
     
+    def _get_track_notes_arrays(self, midi: MidiNotes,
+                                track_index: int) -> List[Tuple[int, float, float]]:
+        """get_track_notes sobre columnas: mismo filtro y mismo orden (estable)"""
+        if track_index >= midi.track_count:
+            print(f"❌ Pista {track_index} no existe")
+            return []
+        return note_array.to_tuples(self.get_track_array(midi, track_index))
+    
+    def get_track_array(self, midi: Union['pretty_midi.PrettyMIDI', MidiNotes],
+                        track_index: int = 0) -> np.ndarray:
+        """
+        Notas de una pista como array estructurado (note_array.NOTE_DTYPE)
+        
+        Mismo filtro de rango y mismo orden que get_track_notes; el resultado
+        sirve directamente para transpose_notes, adjust_to_ukulele_range y
+        trim_silence, que lo procesan sin bucles de Python.
+        
+        Args:
+            midi (pretty_midi.PrettyMIDI | MidiNotes): MIDI cargado
+            track_index (int): Índice de la pista
+            
+        Returns:
+            np.ndarray: Notas (vacío si la pista no existe)
+        """
+        if not isinstance(midi, MidiNotes):
+            return note_array.from_tuples(self.get_track_notes(midi, track_index))
+        if track_index >= midi.track_count:
+            return np.empty(0, dtype=note_array.NOTE_DTYPE)
+        
+        pitch, start, end = midi.track_arrays(track_index)
+        mask = (pitch >= self.UKULELE_MIN_NOTE) & (pitch <= self.UKULELE_MAX_NOTE)
+        notes = note_array.from_columns(pitch[mask], start[mask], end[mask])
+        return notes[np.argsort(notes['start'], kind='stable')]
+    
     @staticmethod
     def midi_note_to_name(pitch: int) -> str:
         """
@@ -172,11 +364,15 @@ class MIDILoader:
         
         Args:
             notes (List[Tuple[int, float, float]]): Lista de (pitch, start_time, end_time)
+                                                   o array de note_array.NOTE_DTYPE
             octaves (int): Número de octavas a transponer (+/- 12 semitones por octava)
             
         Returns:
-            List[Tuple[int, float, float]]: Notas transponidas
+            List[Tuple[int, float, float]]: Notas transponidas (array si se pasó un array)
         """
+        if isinstance(notes, np.ndarray):
+            return note_array.transpose(notes, octaves)
+        
         semitones = octaves * 12
         transposed = []
         
@@ -198,44 +394,42 @@ class MIDILoader:
         Returns:
             Tuple[int, int]: (nota_mínima, nota_máxima) en MIDI
         """
-        if not notes:
+        if len(notes) == 0:
             return (0, 0)
         
+        if isinstance(notes, np.ndarray):
+            return (int(notes['pitch'].min()), int(notes['pitch'].max()))
+        
         pitches = [pitch for pitch, _, _ in notes]
         return (min(pitches), max(pitches))
     
-    def adjust_to_ukulele_range(self, notes: List[Tuple[int, float, float]]) -> Tuple[List[Tuple[int, float, float]], int]:
+    def adjust_to_ukulele_range(self, notes: List[Tuple[int, float, float]],
+                                instrument: str = None) -> Tuple[List[Tuple[int, float, float]], int]:
         """
         Ajusta automáticamente notas al rango del ukulele
         
+        Si todas las notas quedan por debajo de C4 (60) o por encima de E6 (88)
+        se transponen las octavas mínimas para entrar, calculadas de una vez.
+        Con otro instrumento el rango va de su cuerda más grave a su nota más aguda.
+        
         Args:
             notes (List[Tuple[int, float, float]]): Lista de (pitch, start_time, end_time)
+                                                   o array de note_array.NOTE_DTYPE
+            instrument (str): Perfil de instruments.INSTRUMENTS (por defecto, soprano)
             
         Returns:
             Tuple: (notas_ajustadas, octavas_transponidas)
         """
-        min_note, max_note = self.get_notes_range(notes)
-        
-        # Rango típico del ukulele soprano: C4 (60) a E6 (88)
-        uke_min = 60  # C4
-        uke_max = 88  # E6
+        if len(notes) == 0:
+            return notes, 0
         
-        octaves_needed = 0
-        adjusted_notes = notes
-        
-        # Si las notas están todas demasiado bajas
-        if max_note < uke_min:
-            while max(pitch for pitch, _, _ in adjusted_notes) < uke_min:
-                octaves_needed += 1
-                adjusted_notes = self.transpose_notes(adjusted_notes, 1)
-        
-        # Si las notas están todas demasiado altas
-        elif min_note > uke_max:
-            while min(pitch for pitch, _, _ in adjusted_notes) > uke_max:
-                octaves_needed -= 1
-                adjusted_notes = self.transpose_notes(adjusted_notes, -1)
+        min_note, max_note = self.get_notes_range(notes)
+        profile = get_instrument(instrument)
+        octaves_needed = note_array.octaves_to_fit(min_note, max_note, profile.min_pitch, profile.max_pitch)
         
-        return adjusted_notes, octaves_needed
+        if octaves_needed == 0:
+            return notes, 0
+        return self.transpose_notes(notes, octaves_needed), octaves_needed
     
     @staticmethod
     def trim_silence(notes: List[Tuple[int, float, float]], 
@@ -245,11 +439,15 @@ class MIDILoader:
         
         Args:
             notes (List[Tuple[int, float, float]]): Lista de (pitch, start_time, end_time)
+                                                   o array de note_array.NOTE_DTYPE
             silence_threshold (float): Duración mínima considerada como silencio (segundos)
             
         Returns:
             List[Tuple[int, float, float]]: Notas sin silencios al inicio/final
         """
+        if isinstance(notes, np.ndarray):
+            return note_array.trim_silence(notes)
+        
         if not notes:
             return notes
         
@@ -0,0 +1,98 @@
+"""
+Notas de un archivo MIDI como arrays NumPy
+Lo único que usan el juego y las herramientas: pistas, notas y tempo
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class MidiNotes:
+    """
+    Notas de todas las pistas de un MIDI, concatenadas en columnas
+
+    Las notas de la pista i ocupan [offsets[i], offsets[i + 1]) en pitch,
+    start y end, en el orden del archivo. tracks tiene el mismo formato que
+    MIDILoader.get_track_info. Se obtiene de pretty_midi (from_pretty_midi)
+    o de la cache en disco sin volver a parsear el archivo.
+    """
+
+    def __init__(self, tracks: List[Dict], pitch: np.ndarray, start: np.ndarray,
+                 end: np.ndarray, offsets: np.ndarray, tempo_times: np.ndarray,
+                 tempi: np.ndarray):
+        self.tracks = tracks
+        self.pitch = pitch
+        self.start = start
+        self.end = end
+        self.offsets = offsets
+        self.tempo_times = tempo_times
+        self.tempi = tempi
+
+    @property
+    def track_count(self) -> int:
+        return len(self.tracks)
+
+    @property
+    def initial_tempo(self) -> float:
+        """Tempo inicial en BPM (120 si el archivo no define ninguno)"""
+        return float(self.tempi[0]) if len(self.tempi) else 120.0
+
+    def track_arrays(self, track_index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Columnas (pitch, start, end) de una pista, sin copiar
+
+        Args:
+            track_index (int): Índice de la pista
+
+        Returns:
+            Tuple: Vistas de pitch, start y end
+        """
+        lo, hi = self.offsets[track_index], self.offsets[track_index + 1]
+        return self.pitch[lo:hi], self.start[lo:hi], self.end[lo:hi]
+
+    @classmethod
+    def from_pretty_midi(cls, midi) -> 'MidiNotes':
+        """
+        Extrae las notas de un objeto pretty_midi.PrettyMIDI
+
+        Args:
+            midi (pretty_midi.PrettyMIDI): MIDI cargado
+
+        Returns:
+            MidiNotes: Pistas, notas y cambios de tempo
+        """
+        tracks = []
+        counts = []
+        pitches, starts, ends = [], [], []
+
+        for idx, instrument in enumerate(midi.instruments):
+            notes = instrument.notes
+            # Tipos nativos: pretty_midi puede devolver escalares NumPy
+            tracks.append({
+                'index': idx,
+                'name': instrument.name or f"Pista {idx}",
+                'program': int(instrument.program),
+                'is_drum': bool(instrument.is_drum),
+                'note_count': len(notes),
+                'start_time': float(notes[0].start) if notes else 0,
+                'end_time': float(notes[-1].end) if notes else 0,
+            })
+            counts.append(len(notes))
+            pitches.extend(note.pitch for note in notes)
+            starts.extend(note.start for note in notes)
+            ends.extend(note.end for note in notes)
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        tempo_times, tempi = midi.get_tempo_changes()
+
+        return cls(
+            tracks,
+            np.asarray(pitches, dtype=np.int16),
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(ends, dtype=np.float64),
+            offsets,
+            np.asarray(tempo_times, dtype=np.float64),
+            np.asarray(tempi, dtype=np.float64),
+        )
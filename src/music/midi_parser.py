@@ -0,0 +1,288 @@
+"""
+Lector rápido de archivos MIDI estándar (SMF)
+Extrae solo notas, pistas y tempo en una pasada, sin crear objetos por evento
+"""
+
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .midi_notes import MidiNotes
+
+
+# Bytes de datos de los mensajes de sistema que pueden aparecer en un archivo
+SYSTEM_DATA_LENGTH = {
+    0xF1: 1, 0xF2: 2, 0xF3: 1, 0xF6: 0,
+    0xF8: 0, 0xFA: 0, 0xFB: 0, 0xFC: 0, 0xFE: 0,
+}
+
+META_TRACK_NAME = 0x03
+META_SET_TEMPO = 0x51
+
+
+class MidiParseError(ValueError):
+    """Archivo que este lector no interpreta (MIDILoader recurre a pretty_midi)"""
+
+
+def parse_midi_file(path: Union[str, Path], charset: str = 'latin1') -> MidiNotes:
+    """
+    Lee un archivo MIDI
+
+    Args:
+        path (str): Ruta del archivo .mid/.midi
+        charset (str): Codificación de los nombres de pista
+
+    Returns:
+        MidiNotes: Mismas pistas, notas y tempos que MidiNotes.from_pretty_midi
+    """
+    with open(path, 'rb') as f:
+        return parse_midi_bytes(f.read(), charset)
+
+
+def parse_midi_bytes(data: bytes, charset: str = 'latin1') -> MidiNotes:
+    """
+    Interpreta el contenido de un archivo MIDI
+
+    Reproduce las reglas de pretty_midi: tempo solo de la pista 0, un
+    instrumento por (programa, canal, pista) en orden de creación, y cada
+    note-off cierra las notas abiertas en ticks anteriores de ese canal y
+    pitch. Los ticks se convierten a segundos al final, con NumPy.
+
+    Args:
+        data (bytes): Archivo completo
+        charset (str): Codificación de los nombres de pista
+
+    Returns:
+        MidiNotes: Pistas, notas y cambios de tempo
+    """
+    if data[:4] != b'MThd' or len(data) < 14:
+        raise MidiParseError("Falta la cabecera MThd")
+
+    header_size = int.from_bytes(data[4:8], 'big')
+    _, track_count, resolution = struct.unpack('>hhh', data[8:14])
+    if resolution <= 0:
+        raise MidiParseError("División SMPTE no soportada")
+
+    instruments: Dict[Tuple[int, int, int], list] = {}
+    tempo_events: List[Tuple[int, int]] = []
+
+    pos = 8 + header_size
+    for track_idx in range(track_count):
+        if data[pos:pos + 4] != b'MTrk':
+            raise MidiParseError(f"Falta la cabecera MTrk de la pista {track_idx}")
+        size = int.from_bytes(data[pos + 4:pos + 8], 'big')
+        start = pos + 8
+        pos = start + size
+        if pos > len(data):
+            raise MidiParseError(f"Pista {track_idx} truncada")
+
+        _parse_track(data, start, pos, track_idx, charset, instruments,
+                     tempo_events if track_idx == 0 else None)
+
+    tempo_ticks, tick_scales = _tick_scales(tempo_events, resolution)
+    return _build_notes(instruments, tempo_ticks, tick_scales, resolution)
+
+
+def _parse_track(data: bytes, pos: int, end: int, track_idx: int, charset: str,
+                 instruments: Dict[Tuple[int, int, int], list], tempo_events) -> None:
+    """Recorre los eventos de una pista acumulando notas por instrumento"""
+    tick = 0
+    last_status = None
+    track_name = ''
+    programs = [0] * 16
+    open_notes: Dict[int, List[int]] = {}  # (canal << 7 | pitch) -> ticks de note-on
+
+    try:
+        while pos < end:
+            # Delta en formato de longitud variable
+            byte = data[pos]
+            pos += 1
+            delta = byte & 0x7F
+            while byte & 0x80:
+                byte = data[pos]
+                pos += 1
+                delta = (delta << 7) | (byte & 0x7F)
+            tick += delta
+
+            status = data[pos]
+            pos += 1
+            running = status < 0x80
+            if running:
+                if last_status is None:
+                    raise MidiParseError("Running status sin estado previo")
+                status = last_status
+            elif status != 0xFF:
+                last_status = status  # Los meta eventos no fijan running status
+
+            if status < 0xF0:
+                if running:
+                    pos -= 1  # El byte leído era el primer dato
+                kind = status & 0xF0
+                channel = status & 0x0F
+
+                if kind == 0x90 or kind == 0x80:
+                    pitch = data[pos]
+                    velocity = data[pos + 1]
+                    pos += 2
+                    if pitch > 127 or velocity > 127:
+                        raise MidiParseError("Byte de datos fuera de rango")
+
+                    key = (channel << 7) | pitch
+                    if kind == 0x90 and velocity > 0:
+                        open_notes.setdefault(key, []).append(tick)
+                        continue
+
+                    # Note-off (o note-on con velocidad 0)
+                    started = open_notes.get(key)
+                    if started is None:
+                        continue
+                    to_close = [start for start in started if start != tick]
+                    if to_close:
+                        program = programs[channel]
+                        instrument = instruments.get((program, channel, track_idx))
+                        if instrument is None:
+                            instrument = [track_name, program, channel == 9, [], [], []]
+                            instruments[(program, channel, track_idx)] = instrument
+                        instrument[3].extend(to_close)
+                        instrument[4].extend([tick] * len(to_close))
+                        instrument[5].extend([pitch] * len(to_close))
+                        if len(to_close) < len(started):
+                            # Un note-on en este mismo tick sigue sonando
+                            open_notes[key] = [start for start in started if start == tick]
+                            continue
+                    del open_notes[key]
+
+                elif kind == 0xC0:
+                    program = data[pos]
+                    pos += 1
+                    if program > 127:
+                        raise MidiParseError("Byte de datos fuera de rango")
+                    programs[channel] = program
+                else:
+                    length = 1 if kind == 0xD0 else 2
+                    if max(data[pos:pos + length]) > 127:
+                        raise MidiParseError("Byte de datos fuera de rango")
+                    pos += length
+
+            elif status == 0xFF:
+                meta_type = data[pos]
+                pos += 1
+                length, pos = _read_varint(data, pos)
+                payload = data[pos:pos + length]
+                pos += length
+
+                if meta_type == META_TRACK_NAME:
+                    track_name = payload.decode(charset)
+                elif meta_type == META_SET_TEMPO and tempo_events is not None:
+                    if len(payload) < 3:
+                        raise MidiParseError("Evento de tempo incompleto")
+                    tempo_events.append((tick, int.from_bytes(payload[:3], 'big')))
+
+            elif status == 0xF0 or status == 0xF7:
+                # Con running status el byte leído se descarta (igual que mido)
+                length, pos = _read_varint(data, pos)
+                pos += length
+
+            else:
+                length = SYSTEM_DATA_LENGTH.get(status)
+                if length is None:
+                    raise MidiParseError(f"Byte de estado no definido 0x{status:02x}")
+                if running:
+                    pos -= 1
+                pos += length
+    except IndexError:
+        raise MidiParseError(f"Pista {track_idx} truncada") from None
+
+    if pos != end:
+        raise MidiParseError(f"El último evento de la pista {track_idx} excede su tamaño")
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def _tick_scales(tempo_events: List[Tuple[int, int]], resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Segundos por tick a partir de cada cambio de tempo (mismas reglas que pretty_midi)"""
+    scales = [(0, 60.0 / (120.0 * resolution))]
+
+    for tick, tempo in tempo_events:
+        if tick == 0:
+            # Solo cuenta el último tempo del tick 0
+            scales = [(0, 60.0 / ((6e7 / tempo) * resolution))]
+        else:
+            tick_scale = 60.0 / ((6e7 / tempo) * resolution)
+            if tick_scale != scales[-1][1]:
+                scales.append((tick, tick_scale))
+
+    ticks = np.array([tick for tick, _ in scales], dtype=np.int64)
+    return ticks, np.array([scale for _, scale in scales], dtype=np.float64)
+
+
+def _ticks_to_seconds(ticks: np.ndarray, tempo_ticks: np.ndarray,
+                      tick_scales: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convierte ticks a segundos con el mapa de tempo
+
+    Misma aritmética que la tabla tick -> tiempo de pretty_midi (inicio del
+    tramo + escala * ticks desde el inicio), así los tiempos coinciden bit a bit.
+
+    Returns:
+        Tuple: (tiempos de los ticks, tiempo de inicio de cada tramo de tempo)
+    """
+    segment_start = np.zeros(len(tempo_ticks))
+    for i in range(1, len(tempo_ticks)):
+        segment_start[i] = segment_start[i - 1] + tick_scales[i - 1] * np.float64(
+            tempo_ticks[i] - tempo_ticks[i - 1])
+
+    segment = np.searchsorted(tempo_ticks, ticks, side='right') - 1
+    times = segment_start[segment] + tick_scales[segment] * (ticks - tempo_ticks[segment]).astype(np.float64)
+    return times, segment_start
+
+
+def _build_notes(instruments: Dict[Tuple[int, int, int], list], tempo_ticks: np.ndarray,
+                 tick_scales: np.ndarray, resolution: int) -> MidiNotes:
+    """Concatena los instrumentos en columnas y calcula los tiempos"""
+    tracks = []
+    start_ticks, end_ticks, pitches = [], [], []
+    counts = []
+
+    for idx, (name, program, is_drum, starts, ends, notes) in enumerate(instruments.values()):
+        tracks.append({
+            'index': idx,
+            'name': name or f"Pista {idx}",
+            'program': program,
+            'is_drum': is_drum,
+            'note_count': len(notes),
+        })
+        counts.append(len(notes))
+        start_ticks.extend(starts)
+        end_ticks.extend(ends)
+        pitches.extend(notes)
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    start, segment_start = _ticks_to_seconds(np.asarray(start_ticks, dtype=np.int64), tempo_ticks, tick_scales)
+    end, _ = _ticks_to_seconds(np.asarray(end_ticks, dtype=np.int64), tempo_ticks, tick_scales)
+
+    for info, lo, hi in zip(tracks, offsets[:-1], offsets[1:]):
+        info['start_time'] = float(start[lo]) if hi > lo else 0
+        info['end_time'] = float(end[hi - 1]) if hi > lo else 0
+
+    return MidiNotes(
+        tracks,
+        np.asarray(pitches, dtype=np.int16),
+        start,
+        end,
+        offsets,
+        segment_start,
+        60.0 / (tick_scales * resolution),
+    )
@@ -0,0 +1,98 @@
+"""
+Notas como array estructurado de NumPy
+Transposición, ajuste de rango y recorte de silencio sin bucles de Python
+"""
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+# Mismo contenido que las tuplas (pitch, start_time, end_time) de MIDILoader
+NOTE_DTYPE = np.dtype([('pitch', '<i2'), ('start', '<f8'), ('end', '<f8')])
+
+# Rango típico del ukulele soprano: C4 (60) a E6 (88)
+UKULELE_LOW = 60
+UKULELE_HIGH = 88
+
+
+def from_tuples(notes: Iterable[Tuple[int, float, float]]) -> np.ndarray:
+    """Lista de (pitch, start, end) -> array estructurado"""
+    return np.array(list(notes), dtype=NOTE_DTYPE)
+
+
+def from_columns(pitch: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Columnas separadas (p. ej. de MidiNotes) -> array estructurado"""
+    notes = np.empty(len(pitch), dtype=NOTE_DTYPE)
+    notes['pitch'] = pitch
+    notes['start'] = start
+    notes['end'] = end
+    return notes
+
+
+def to_tuples(notes: np.ndarray) -> List[Tuple[int, float, float]]:
+    """Array estructurado -> lista de (pitch, start, end) con tipos de Python"""
+    return list(zip(notes['pitch'].tolist(), notes['start'].tolist(), notes['end'].tolist()))
+
+
+def transpose(notes: np.ndarray, octaves: int = 0) -> np.ndarray:
+    """
+    Transpone por octavas completas (limitado al rango MIDI 0-127)
+
+    Returns:
+        np.ndarray: Copia transpuesta
+    """
+    result = notes.copy()
+    if octaves:
+        result['pitch'] = np.clip(notes['pitch'].astype(np.int32) + octaves * 12, 0, 127)
+    return result
+
+
+def octaves_to_fit(min_pitch: int, max_pitch: int, low: int = UKULELE_LOW,
+                   high: int = UKULELE_HIGH) -> int:
+    """
+    Octavas que hay que transponer para que las notas entren en el rango
+
+    Forma cerrada del ajuste octava a octava: si todas las notas quedan por
+    debajo de low, las mínimas octavas para que la más aguda llegue; si todas
+    quedan por encima de high, las mínimas para que la más grave baje. En
+    cualquier otro caso no se transpone.
+
+    Returns:
+        int: Octavas (positivas hacia arriba)
+    """
+    if max_pitch < low:
+        return -((max_pitch - low) // 12)  # ceil((low - max_pitch) / 12)
+    if min_pitch > high:
+        return (high - min_pitch) // 12  # -ceil((min_pitch - high) / 12)
+    return 0
+
+
+def fit_to_range(notes: np.ndarray, low: int = UKULELE_LOW,
+                 high: int = UKULELE_HIGH) -> Tuple[np.ndarray, int]:
+    """
+    Ajusta las notas al rango del ukulele en una sola operación
+
+    Returns:
+        Tuple: (notas ajustadas, octavas transpuestas)
+    """
+    if len(notes) == 0:
+        return notes, 0
+    pitch = notes['pitch']
+    octaves = octaves_to_fit(int(pitch.min()), int(pitch.max()), low, high)
+    return transpose(notes, octaves), octaves
+
+
+def trim_silence(notes: np.ndarray) -> np.ndarray:
+    """
+    Elimina el silencio inicial (la primera nota pasa a empezar en 0)
+
+    Returns:
+        np.ndarray: Copia con los tiempos desplazados
+    """
+    result = notes.copy()
+    if len(notes):
+        offset = notes['start'][0]
+        result['start'] -= offset
+        result['end'] -= offset
+    return result
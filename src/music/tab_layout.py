@@ -0,0 +1,240 @@
+"""
+Maquetación rítmica de tablaturas ASCII
+Cuantiza los inicios a una rejilla de beats (según el mapa de tempo) y dibuja
+compases con acordes apilados, todo sobre arrays de NumPy
+"""
+
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .fingering import MAX_FRET
+
+
+DASH = ord('-')
+BAR = ord('|')
+ZERO = ord('0')
+
+
+def seconds_to_beats(times: np.ndarray, tempo: float = 120,
+                     tempo_map: Optional[Tuple[Sequence[float], Sequence[float]]] = None) -> np.ndarray:
+    """
+    Convierte tiempos en segundos a beats siguiendo los cambios de tempo
+
+    Args:
+        times (np.ndarray): Tiempos en segundos
+        tempo (float): Tempo en BPM si no hay mapa de tempo
+        tempo_map (Tuple): (instantes de cambio en segundos, BPM) como
+            MidiNotes.tempo_times / MidiNotes.tempi
+
+    Returns:
+        np.ndarray: Posición en beats de cada tiempo
+    """
+    times = np.asarray(times, dtype=np.float64)
+    change_times = np.zeros(1)
+    bpm = np.array([float(tempo)])
+    if tempo_map is not None and len(tempo_map[1]):
+        change_times = np.asarray(tempo_map[0], dtype=np.float64)
+        bpm = np.asarray(tempo_map[1], dtype=np.float64)
+        if change_times[0] > 0:  # El primer tempo rige también desde 0
+            change_times = np.concatenate(([0.0], change_times))
+            bpm = np.concatenate((bpm[:1], bpm))
+
+    # Beat en el que empieza cada tramo de tempo constante
+    beat_at_change = np.concatenate(([0.0], np.cumsum(np.diff(change_times) * bpm[:-1] / 60)))
+    segment = np.clip(np.searchsorted(change_times, times, side='right') - 1, 0, None)
+    return beat_at_change[segment] + (times - change_times[segment]) * bpm[segment] / 60
+
+
+def quantize(beats: np.ndarray, subdivision: int = 4) -> np.ndarray:
+    """Posición en beats -> casilla de la rejilla (subdivision casillas por beat)"""
+    return np.clip(np.rint(np.asarray(beats) * subdivision), 0, None).astype(np.int64)
+
+
+def coarsen(slots: np.ndarray, factor, max_refine: int) -> np.ndarray:
+    """
+    Casillas de la rejilla x max_refine -> rejilla x factor
+
+    Redondea con los empates hacia abajo, para no adelantar una nota que ya
+    se redondeó hacia arriba en la rejilla fina.
+    """
+    return (np.asarray(slots) * factor * 2 + max_refine - 1) // (2 * max_refine)
+
+
+class TabLayout:
+    """
+    Notas ya digitadas colocadas en la rejilla, listas para dibujar por sistemas
+
+    Cada casilla ocupa cell_width columnas (traste + relleno); las notas en la
+    misma casilla se apilan como acorde. Las notas nunca cambian de orden: si
+    en un compás dos notas caen en la misma cuerda y casilla, ese compás se
+    dibuja con una rejilla más fina (x2, x4... hasta max_refine y mientras
+    quepa en page_width). Si aún chocan y se conoce la afinación, la nota pasa
+    a otra cuerda libre donde se pueda tocar; si no, se omite y se cuenta en
+    dropped.
+    """
+
+    def __init__(self, string_names: Sequence[str], slots: np.ndarray, strings: np.ndarray,
+                 frets: np.ndarray, beats_per_measure: int = 4, subdivision: int = 4,
+                 page_width: int = 80, max_refine: int = 1,
+                 tuning: Optional[Sequence[int]] = None, max_fret: int = MAX_FRET):
+        """
+        Args:
+            string_names (Sequence[str]): Nombre de cada cuerda (una línea por cuerda)
+            slots (np.ndarray): Casilla de cada nota en la rejilla más fina
+                (quantize con subdivision * max_refine), en orden de inicio
+            strings (np.ndarray): Índice de cuerda de cada nota
+            frets (np.ndarray): Traste de cada nota
+            beats_per_measure (int): Beats por compás
+            subdivision (int): Casillas por beat de la rejilla base
+            page_width (int): Ancho máximo de línea en caracteres
+            max_refine (int): Máximo factor de refinado por compás (potencia de 2)
+            tuning (Sequence[int]): Pitch de cada cuerda al aire, para mover
+                notas que chocan a otra cuerda (sin ella se omiten)
+            max_fret (int): Último traste utilizable al cambiar de cuerda
+        """
+        if max_refine < 1 or max_refine & (max_refine - 1):
+            raise ValueError(f"max_refine debe ser potencia de 2: {max_refine}")
+
+        self.string_names = list(string_names)
+        self.subdivision = subdivision
+        string_count = len(self.string_names)
+        slots = np.asarray(slots, dtype=np.int64)
+        order = np.argsort(slots, kind='stable')  # Empates: orden de entrada
+        slots = slots[order]
+        strings = np.asarray(strings, dtype=np.int64)[order]
+        frets = np.asarray(frets, dtype=np.int64)[order]
+
+        self.measure_slots = beats_per_measure * subdivision
+        fine_slots = self.measure_slots * max_refine  # Casillas finas por compás
+        measures = slots // fine_slots
+        local = slots % fine_slots
+        self.measure_count = int(measures[-1]) + 1 if len(slots) else 0
+
+        max_fret_used = int(frets.max()) if len(frets) else 0
+        self.cell_width = len(str(max_fret_used)) + 1
+        self.prefix_width = max(len(name) for name in self.string_names) + 1
+
+        # Refinado máximo con el que un compás aún cabe en la línea
+        fit = 1
+        while (fit < max_refine and self.prefix_width
+               + self.measure_slots * fit * 2 * self.cell_width + 1 <= page_width):
+            fit *= 2
+
+        # Factor de cada compás: el menor con tan pocos choques como el máximo posible
+        def collisions_per_measure(factor):
+            collided = self._collisions(measures, self._cells(local, factor, max_refine),
+                                        strings, fine_slots, string_count)
+            return np.bincount(measures[collided], minlength=self.measure_count)
+
+        least = collisions_per_measure(fit)
+        self.refine = np.full(self.measure_count, fit, dtype=np.int64)
+        unresolved = np.ones(self.measure_count, dtype=bool)
+        factor = 1
+        while factor < fit:
+            settled = unresolved & (collisions_per_measure(factor) == least)
+            self.refine[settled] = factor
+            unresolved &= ~settled
+            factor *= 2
+
+        cells = self._cells(local, self.refine[measures], max_refine)
+        collided = self._collisions(measures, cells, strings, fine_slots, string_count)
+        if collided.any() and tuning is not None:
+            self._move_to_free_strings(np.flatnonzero(collided), measures, cells, strings, frets,
+                                       tuning, min(max_fret, 10 ** (self.cell_width - 1) - 1))
+            collided = self._collisions(measures, cells, strings, fine_slots, string_count)
+
+        keep = ~collided
+        self.dropped = int(collided.sum())
+        self.measures = measures[keep]
+        self.cells = cells[keep]
+        self.strings = strings[keep]
+        self.frets = frets[keep]
+        self.measure_widths = self.measure_slots * self.refine * self.cell_width + 1  # Más la barra
+
+        # Sistemas: tantos compases como quepan en page_width (al menos uno)
+        starts = [0] if self.measure_count else []
+        width = self.prefix_width
+        for measure, measure_width in enumerate(self.measure_widths.tolist()):
+            if width + measure_width > page_width and measure > starts[-1]:
+                starts.append(measure)
+                width = self.prefix_width
+            width += measure_width
+        self.system_starts = np.array(starts + [self.measure_count], dtype=np.int64)
+        self.system_count = len(self.system_starts) - 1
+
+    @staticmethod
+    def _move_to_free_strings(indices, measures, cells, strings, frets, tuning, max_fret):
+        """Pasa cada nota que choca (en orden) a otra cuerda libre de su casilla, si puede"""
+        occupied = set(zip(measures.tolist(), cells.tolist(), strings.tolist()))
+        for index in indices.tolist():
+            pitch = tuning[strings[index]] + frets[index]
+            for string, open_pitch in enumerate(tuning):
+                fret = pitch - open_pitch
+                cell = (int(measures[index]), int(cells[index]), string)
+                if 0 <= fret <= max_fret and cell not in occupied:
+                    occupied.add(cell)
+                    strings[index] = string
+                    frets[index] = fret
+                    break
+
+    def _cells(self, local: np.ndarray, factor, max_refine: int) -> np.ndarray:
+        """Casilla fina dentro del compás -> casilla en la rejilla de 'factor' (redondeando)"""
+        return np.minimum(coarsen(local, factor, max_refine), self.measure_slots * factor - 1)
+
+    @staticmethod
+    def _collisions(measures, cells, strings, fine_slots, string_count) -> np.ndarray:
+        """Notas que caen en una cuerda y casilla ya ocupada por una nota anterior"""
+        keys = (measures * (fine_slots + 1) + cells) * string_count + strings
+        _, first = np.unique(keys, return_index=True)
+        collided = np.ones(len(keys), dtype=bool)
+        collided[first] = False
+        return collided
+
+    def render_system(self, index: int) -> Sequence[str]:
+        """
+        Dibuja un sistema (grupo de compases que cabe en una línea)
+
+        Args:
+            index (int): Sistema, desde 0
+
+        Returns:
+            Sequence[str]: Regla con el número de cada compás y una línea por cuerda
+        """
+        first_measure, end_measure = self.system_starts[index:index + 2].tolist()
+        widths = self.measure_widths[first_measure:end_measure]
+        offsets = self.prefix_width + np.concatenate(([0], np.cumsum(widths)))
+        lo, hi = np.searchsorted(self.measures, [first_measure, end_measure])
+
+        buffer = np.full((len(self.string_names), int(offsets[-1])), DASH, dtype=np.uint8)
+        for row, name in enumerate(self.string_names):
+            buffer[row, :len(name)] = np.frombuffer(name.encode('ascii'), dtype=np.uint8)
+        buffer[:, self.prefix_width - 1] = BAR
+        buffer[:, offsets[1:] - 1] = BAR
+
+        # Columna de cada nota: inicio de su compás + casilla dentro del compás
+        columns = offsets[self.measures[lo:hi] - first_measure] + self.cells[lo:hi] * self.cell_width
+        rows = self.strings[lo:hi]
+        frets = self.frets[lo:hi]
+
+        # Trastes de varias cifras, cifra a cifra desde la más significativa
+        digits = np.maximum(np.floor(np.log10(np.maximum(frets, 1))).astype(np.int64) + 1, 1)
+        for position in range(int(digits.max()) if len(digits) else 0):
+            has = digits > position
+            power = 10 ** (digits[has] - position - 1)
+            buffer[rows[has], columns[has] + position] = ZERO + frets[has] // power % 10
+
+        # Regla: número de compás y, si se refinó, su rejilla
+        ruler = [" " * self.prefix_width]
+        for measure, width in zip(range(first_measure, end_measure), widths.tolist()):
+            label = str(measure + 1)
+            if self.refine[measure] > 1:
+                fine = f"{label} 1/{4 * self.subdivision * self.refine[measure]}"
+                label = fine if len(fine) < width else label
+            ruler.append(label.ljust(width))
+        return ["".join(ruler).rstrip()] + [line.tobytes().decode('ascii') for line in buffer]
+
+    def iter_systems(self) -> Iterator[Sequence[str]]:
+        """Genera los sistemas en orden (ver render_system)"""
+        for index in range(self.system_count):
+            yield self.render_system(index)
@@ -0,0 +1,138 @@
+"""
+Formato binario de tablaturas (.ukt)
+Cabecera fija + metadatos JSON + columnas NumPy alineadas, legible con np.memmap
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+
+MAGIC = b'UKTB'
+FORMAT_VERSION = 1
+BINARY_SUFFIX = '.ukt'
+
+# magic, versión, reservado, número de notas, longitud de los metadatos JSON
+HEADER = struct.Struct('<4sHHII')
+ALIGNMENT = 8  # Cada columna empieza alineada a 8 bytes
+
+# Columnas de la versión 1 (nombre, dtype little-endian)
+COLUMNS = [
+    ('start_time', '<f8'),
+    ('end_time', '<f8'),
+    ('pitch', '<i2'),
+]
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class TablatureArrays:
+    """
+    Tablatura cargada como columnas NumPy
+
+    Con mmap=True las columnas son vistas de solo lectura sobre el archivo: no
+    se copian ni se parsean notas hasta que se accede a ellas.
+    """
+
+    def __init__(self, metadata: Dict, columns: Dict[str, np.ndarray]):
+        self.metadata = metadata
+        self.columns = columns
+        self.start_time = columns['start_time']
+        self.end_time = columns['end_time']
+        self.pitch = columns['pitch']
+
+    def __len__(self):
+        return len(self.pitch)
+
+
+def encode(tablature_data: Dict) -> bytes:
+    """
+    Serializa una tablatura (estructura de TablatureManager) al formato binario
+
+    Args:
+        tablature_data (Dict): Datos con 'notes' y el resto de secciones
+
+    Returns:
+        bytes: Contenido del archivo .ukt
+    """
+    notes = tablature_data.get('notes', [])
+    count = len(notes)
+
+    metadata = {key: value for key, value in tablature_data.items() if key != 'notes'}
+    metadata['columns'] = COLUMNS
+    meta_bytes = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, len(meta_bytes)), meta_bytes]
+    offset = HEADER.size + len(meta_bytes)
+
+    for name, dtype in COLUMNS:
+        padding = _align(offset) - offset
+        parts.append(b'\0' * padding)
+        column = np.fromiter((note[name] for note in notes), dtype=dtype, count=count)
+        parts.append(column.tobytes())
+        offset += padding + column.nbytes
+
+    return b''.join(parts)
+
+
+def read_metadata(path: Union[str, Path]) -> Dict:
+    """
+    Lee solo la cabecera y los metadatos (sin tocar las columnas)
+
+    Returns:
+        Dict: Metadatos, con 'note_count'
+    """
+    with open(path, 'rb') as f:
+        magic, version, _, count, meta_length = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"No es una tablatura binaria: {path}")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Versión de tablatura no soportada: {version}")
+        metadata = json.loads(f.read(meta_length).decode('utf-8'))
+
+    metadata['note_count'] = count
+    return metadata
+
+
+def read(path: Union[str, Path], mmap: bool = True) -> TablatureArrays:
+    """
+    Carga una tablatura binaria
+
+    Args:
+        path (str): Archivo .ukt
+        mmap (bool): Mapear el archivo en memoria en vez de leerlo entero
+
+    Returns:
+        TablatureArrays: Metadatos y columnas
+    """
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    magic, version, _, count, meta_length = HEADER.unpack(buffer[:HEADER.size].tobytes())
+    if magic != MAGIC:
+        raise ValueError(f"No es una tablatura binaria: {path}")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Versión de tablatura no soportada: {version}")
+
+    offset = HEADER.size + meta_length
+    metadata = json.loads(buffer[HEADER.size:offset].tobytes().decode('utf-8'))
+    metadata['note_count'] = count
+
+    columns = {}
+    for name, dtype in metadata.get('columns', COLUMNS):
+        dtype = np.dtype(dtype)
+        offset = _align(offset)
+        end = offset + count * dtype.itemsize
+        if end > len(buffer):
+            raise ValueError(f"Tablatura binaria truncada: {path}")
+        columns[name] = buffer[offset:end].view(dtype)
+        offset = end
+
+    return TablatureArrays(metadata, columns)
@@ -0,0 +1,374 @@
+"""
+Catálogo de tablaturas - Índice de metadatos en un solo archivo
+Evita listar la carpeta y parsear cada JSON completo para mostrar o filtrar canciones
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from . import tablature_binary
+from .tablature_binary import BINARY_SUFFIX
+from .background_writer import atomic_write
+
+# Catálogos con una escritura diferida pendiente. Un Timer daemon muere con el
+# intérprete, así que se escriben al salir; el WeakSet no los mantiene vivos
+_pending_saves = weakref.WeakSet()
+
+
+def _save_pending_catalogs():
+    """Escribe al salir los catálogos con escritura diferida pendiente"""
+    for catalog in list(_pending_saves):
+        catalog._timed_save()
+
+
+atexit.register(_save_pending_catalogs)
+
+
+class TablatureCatalog:
+    """
+    Índice de las tablaturas de una carpeta
+
+    Cada entrada guarda fuente, pista, transposición, duración, número de notas,
+    rango de pitch, mtime/tamaño y hash del contenido. TablatureManager lo
+    actualiza al guardar y borrar; los cambios hechos por fuera se detectan con
+    un escaneo de mtime que solo vuelve a leer los archivos modificados.
+    """
+
+    CATALOG_FILENAME = ".catalog.json"
+    VERSION = 2
+    SAVE_DELAY = 2.0  # Segundos que se agrupan los cambios antes de escribir (schedule_save)
+    SUFFIXES = (BINARY_SUFFIX, '.json')  # En orden de prioridad si coexisten
+
+    def __init__(self, tablature_folder):
+        """
+        Inicializa el catálogo (se carga bajo demanda)
+
+        Args:
+            tablature_folder (str): Carpeta de tablaturas indexada
+        """
+        self.tablature_folder = Path(tablature_folder)
+        self.catalog_path = self.tablature_folder / self.CATALOG_FILENAME
+        self.entries: Dict[str, Dict] = {}
+        self._loaded = False
+        self._scanned = False  # Escaneo completo hecho en este proceso
+        self._folder_mtime_ns = None
+        self._dirty = False  # Cambios en memoria aún no escritos
+        self._save_timer = None  # Escritura diferida pendiente (schedule_save)
+        # Las escrituras en segundo plano actualizan el catálogo desde otro hilo
+        self._lock = threading.RLock()
+
+    def _load(self):
+        """Lee el archivo de catálogo (una sola lectura)"""
+        self._loaded = True
+        if not self.catalog_path.exists():
+            return
+
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Catálogo ilegible, se reconstruye: {e}")
+            return
+
+        if data.get("version") == self.VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        """Escribe el catálogo a disco (reemplazo atómico)"""
+        with self._lock:
+            data = {"version": self.VERSION, "entries": self.entries}
+            raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            # Sin fsync: el catálogo se reconstruye con un escaneo si se pierde
+            atomic_write(self.catalog_path, raw, fsync=False)
+            self._dirty = False
+            self._folder_mtime_ns = self.tablature_folder.stat().st_mtime_ns
+
+    def save_if_dirty(self):
+        """Escribe el catálogo solo si hay cambios pendientes"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _pending_saves.discard(self)
+            if self._dirty:
+                self.save()
+
+    def schedule_save(self, delay: float = None):
+        """
+        Programa una escritura del catálogo si hay cambios pendientes
+
+        Los cambios que lleguen antes de que venza el plazo se escriben juntos,
+        así un lote de guardados reescribe el catálogo una vez y no por archivo.
+
+        Args:
+            delay (float): Segundos de espera (por defecto SAVE_DELAY)
+        """
+        with self._lock:
+            if self._save_timer is not None or not self._dirty:
+                return
+            _pending_saves.add(self)
+            self._save_timer = threading.Timer(self.SAVE_DELAY if delay is None else delay,
+                                               self._timed_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _timed_save(self):
+        """Escritura diferida de schedule_save (también al salir)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _pending_saves.discard(self)
+            # Si la carpeta ya no existe no hay nada que indexar
+            if not self._dirty or not self.tablature_folder.is_dir():
+                return
+            try:
+                self.save()
+            except OSError as e:
+                print(f"⚠️ No se pudo escribir el catálogo: {e}")
+
+    def invalidate(self):
+        """Fuerza un escaneo completo en el próximo refresh (índice posiblemente desfasado)"""
+        with self._lock:
+            self._scanned = False
+
+    @staticmethod
+    def build_entry(tablature_data: Dict, raw: bytes, stat: os.stat_result,
+                    fmt: str = BINARY_SUFFIX) -> Dict:
+        """
+        Construye la entrada de catálogo de una tablatura
+
+        Args:
+            tablature_data (Dict): Contenido (o metadatos) de la tablatura
+            raw (bytes): Bytes del archivo (para el hash)
+            stat (os.stat_result): stat del archivo
+            fmt (str): Extensión del archivo indexado
+
+        Returns:
+            Dict: Entrada del catálogo
+        """
+        source = tablature_data.get("source", {})
+        configuration = tablature_data.get("configuration", {})
+        statistics = tablature_data.get("statistics", {})
+
+        return {
+            "midi_file": source.get("midi_file"),
+            "track_index": source.get("track_index"),
+            "octaves_transposed": configuration.get("octaves_transposed", 0),
+            "tempo": configuration.get("tempo"),
+            "duration": statistics.get("duration", 0),
+            "total_notes": statistics.get("total_notes", 0),
+            "min_pitch": statistics.get("min_pitch", 0),
+            "max_pitch": statistics.get("max_pitch", 0),
+            "format": fmt,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": hashlib.sha1(raw).hexdigest(),
+        }
+
+    def _index_file(self, path: Path, stat: os.stat_result) -> Optional[Dict]:
+        """Lee un archivo de tablatura y construye su entrada"""
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            if path.suffix == BINARY_SUFFIX:
+                data = tablature_binary.read_metadata(path)
+            else:
+                data = json.loads(raw)
+            return self.build_entry(data, raw, stat, path.suffix)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No se pudo indexar {path.name}: {e}")
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Sincroniza el catálogo con la carpeta
+
+        El primer refresh del proceso compara mtime y tamaño de cada archivo; los
+        siguientes solo listan la carpeta si cambió su mtime (archivos creados,
+        renombrados o borrados) y si no, vuelven a hacer stat de los archivos
+        indexados para detectar ediciones en el sitio.
+
+        Args:
+            force (bool): Escanear aunque la carpeta no haya cambiado
+
+        Returns:
+            bool: True si el catálogo cambió
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            try:
+                folder_mtime_ns = self.tablature_folder.stat().st_mtime_ns
+            except OSError:
+                return False
+
+            if self._scanned and not force and folder_mtime_ns == self._folder_mtime_ns:
+                return self._restat_entries()
+
+            changed = False
+            files = {}  # nombre -> DirEntry del formato con más prioridad
+
+            with os.scandir(self.tablature_folder) as it:
+                for entry in it:
+                    stem, suffix = os.path.splitext(entry.name)
+                    if suffix not in self.SUFFIXES or entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    current = files.get(stem)
+                    if current is None or self.SUFFIXES.index(suffix) < self.SUFFIXES.index(
+                            os.path.splitext(current.name)[1]):
+                        files[stem] = entry
+
+            for name, entry in files.items():
+                stat = entry.stat()
+                current = self.entries.get(name)
+                suffix = os.path.splitext(entry.name)[1]
+
+                if (current and current.get("format") == suffix
+                        and current["mtime_ns"] == stat.st_mtime_ns
+                        and current["size"] == stat.st_size):
+                    continue
+
+                new_entry = self._index_file(Path(entry.path), stat)
+                if new_entry:
+                    self.entries[name] = new_entry
+                    changed = True
+
+            for name in set(self.entries) - set(files):
+                del self.entries[name]
+                changed = True
+
+            self._scanned = True
+            self._folder_mtime_ns = folder_mtime_ns
+
+            if changed or self._dirty:
+                self.save()
+            return changed
+
+    def _restat_entries(self) -> bool:
+        """Reindexa los archivos indexados cuyo mtime o tamaño cambió (sin listar la carpeta)"""
+        changed = False
+        for name, entry in list(self.entries.items()):
+            path = self.tablature_folder / f"{name}{entry.get('format', BINARY_SUFFIX)}"
+            try:
+                stat = path.stat()
+            except OSError:
+                del self.entries[name]
+                changed = True
+                continue
+
+            if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+
+            new_entry = self._index_file(path, stat)
+            if new_entry:
+                self.entries[name] = new_entry
+                changed = True
+
+        if changed:
+            self._dirty = True
+            self.schedule_save()
+        return changed
+
+    def update(self, name: str, tablature_data: Dict, raw: bytes, path: Path, save: bool = True):
+        """
+        Registra una tablatura recién guardada
+
+        Args:
+            name (str): Nombre de la tablatura (sin extensión)
+            tablature_data (Dict): Contenido guardado
+            raw (bytes): Bytes escritos
+            path (Path): Archivo escrito
+            save (bool): Escribir el catálogo ya (False agrupa guardados en lote)
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self.entries[name] = self.build_entry(tablature_data, raw, path.stat(), path.suffix)
+            self._dirty = True
+            if save:
+                self.save()
+
+    def add_entries(self, entries: Dict[str, Dict], save: bool = True):
+        """
+        Registra entradas ya construidas con build_entry (p. ej. en otro proceso)
+
+        Args:
+            entries (Dict[str, Dict]): nombre -> entrada
+            save (bool): Escribir el catálogo ya
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self.entries.update(entries)
+            self._dirty = True
+            if save:
+                self.save()
+
+    def remove(self, name: str):
+        """Quita una tablatura borrada del catálogo"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if self.entries.pop(name, None) is not None:
+                self.save()
+
+    def get_names(self) -> List[str]:
+        """Nombres indexados, ordenados"""
+        with self._lock:
+            self.refresh()
+            return sorted(self.entries)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Entrada de una tablatura o None"""
+        with self._lock:
+            self.refresh()
+            return self.entries.get(name)
+
+    def get_sources(self) -> Set[str]:
+        """Archivos MIDI de origen con alguna tablatura indexada"""
+        with self._lock:
+            self.refresh()
+            return {entry.get("midi_file") for entry in self.entries.values()}
+
+    def filter(self, text: str = None, midi_file: str = None, max_duration: float = None,
+               min_pitch: int = None, max_pitch: int = None) -> List[str]:
+        """
+        Filtra tablaturas usando solo el catálogo
+
+        Args:
+            text (str): Subcadena del nombre (sin distinguir mayúsculas)
+            midi_file (str): MIDI de origen exacto
+            max_duration (float): Duración máxima en segundos
+            min_pitch (int): Pitch más grave permitido
+            max_pitch (int): Pitch más agudo permitido
+
+        Returns:
+            List[str]: Nombres que cumplen todos los filtros, ordenados
+        """
+        with self._lock:
+            self.refresh()
+            needle = text.lower() if text else None
+
+            result = []
+            for name, entry in self.entries.items():
+                if needle and needle not in name.lower():
+                    continue
+                if midi_file is not None and entry["midi_file"] != midi_file:
+                    continue
+                if max_duration is not None and entry["duration"] > max_duration:
+                    continue
+                if min_pitch is not None and entry["min_pitch"] < min_pitch:
+                    continue
+                if max_pitch is not None and entry["max_pitch"] > max_pitch:
+                    continue
+                result.append(name)
+
+            return sorted(result)
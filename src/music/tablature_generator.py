@@ -2,160 +2,209 @@
 Generador de tablaturas para ukulele a partir de notas MIDI
 """
 
-from typing import List, Tuple, Optional
+import io
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from . import note_array, tab_layout
+from .fingering import assign_fingering
+from .tab_layout import TabLayout
+from .instruments import get_instrument
 
 
 class UkuleleTableGenerator:
     """Genera tablaturas de ukulele a partir de notas MIDI"""
     
-    # Afinación estándar GCEA del ukulele
-    # NOTA: En MIDI, C4 = 60
-    UKULELE_TUNING = {
-        'G4': 67,  # Sol
-        'C4': 60,  # Do
-        'E4': 64,  # Mi
-        'A4': 69,  # La
-    }
+    SYSTEMS_PER_PAGE = 4  # Líneas de compases por página de la tablatura ASCII
+    MAX_GRID_REFINE = 4  # Un compás con notas demasiado juntas se dibuja hasta 4 veces más fino
     
-    # Mapa inverso: MIDI pitch -> (cuerda, traste)
-    STRING_FRETS = {}
+    def __init__(self, instrument: str = None):
+        """
+        Inicializa el generador de tablaturas
+        
+        Args:
+            instrument (str): Perfil de instruments.INSTRUMENTS (por defecto, soprano GCEA)
+        """
+        self.instrument = get_instrument(instrument)
+        self.string_names = self.instrument.string_names
+        self.tuning = self.instrument.tuning
+        # Tabla pitch MIDI -> traste por cuerda (-1 si no se puede), compartida y de solo lectura
+        self.fret_table = self.instrument.fret_table()
     
-    def __init__(self):
-        """Inicializa el generador de tablaturas"""
-        self._build_fret_map()
+    def get_positions(self, pitch: int) -> List[Tuple[str, int]]:
+        """
+        Posiciones (cuerda, traste) donde se puede tocar un pitch
+        
+        Args:
+            pitch (int): Pitch MIDI
+            
+        Returns:
+            List[Tuple[str, int]]: Posibles (nombre de cuerda, traste)
+        """
+        if not 0 <= pitch < len(self.fret_table):
+            return []
+        return [(name, fret) for name, fret in zip(self.string_names, self.fret_table[pitch].tolist())
+                if fret >= 0]
     
-    def _build_fret_map(self):
-        """Construye un mapa de pitches MIDI a trastes del ukulele"""
-        # Para cada cuerda, mapear todos los trastes disponibles
-        # Tipicamente 12-20 trastes en un ukulele
-        
-        string_names = ['G', 'C', 'E', 'A']
-        string_pitches = [
-            self.UKULELE_TUNING['G4'],  # G (cuerda 1)
-            self.UKULELE_TUNING['C4'],  # C (cuerda 2)
-            self.UKULELE_TUNING['E4'],  # E (cuerda 3)
-            self.UKULELE_TUNING['A4'],  # A (cuerda 4)
-        ]
+    def assign_fingering(self, notes: List[Tuple[int, float, float]]) -> List[Tuple[str, int]]:
+        """
+        Elige cuerda y traste de cada nota teniendo en cuenta las vecinas
         
-        # Crear mapa: pitch MIDI -> (nombre_cuerda, traste)
-        for string_idx, base_pitch in enumerate(string_pitches):
-            for fret in range(20):  # Hasta traste 20
-                pitch = base_pitch + fret
-                string_name = string_names[string_idx]
-                self.STRING_FRETS[pitch] = (string_name, fret)
+        Args:
+            notes (List[Tuple[int, float, float]]): Lista de (pitch, start_time, end_time)
+            
+        Returns:
+            List[Tuple[str, int]]: (nombre de cuerda, traste) de cada nota
+        """
+        strings, frets = assign_fingering([pitch for pitch, _, _ in notes],
+                                          [start for _, start, _ in notes],
+                                          self.tuning, self.instrument.max_fret)
+        return [(self.string_names[string], fret) for string, fret in zip(strings.tolist(), frets.tolist())]
     
     def generate_tab_from_notes(self, notes: List[Tuple[int, float, float]], 
                                 tempo: float = 120,
                                 beats_per_measure: int = 4,
-                                page_width: int = 80) -> str:
+                                page_width: int = 80,
+                                subdivision: int = 4,
+                                tempo_map: Optional[Tuple] = None) -> str:
         """
         Genera tablatura paginada a partir de notas MIDI
         
+        Los inicios se cuantizan a una rejilla de subdivision casillas por beat
+        (semicorcheas por defecto), con barras de compás y acordes apilados.
+        
         Args:
             notes (List[Tuple[int, float, float]]): Lista de (pitch, start_time, end_time)
+                                                   o array de note_array.NOTE_DTYPE
             tempo (float): Tempo en BPM (por defecto 120)
             beats_per_measure (int): Beats por compás (por defecto 4)
             page_width (int): Ancho de página en caracteres (por defecto 80)
+            subdivision (int): Casillas por beat (por defecto 4)
+            tempo_map (Tuple): (tiempos, BPM) de los cambios de tempo, p. ej.
+                               (midi.tempo_times, midi.tempi); sin él se usa tempo
             
         Returns:
             str: Tablatura paginada en formato ASCII
         """
-        if not notes:
+        if len(notes) == 0:
             return "❌ No hay notas para generar tablatura"
         
-        # Calcular duración de la canción
-        song_duration = notes[-1][2]
-        
-        # Crear lista de eventos (solo note_on)
-        events = []
-        for pitch, start, end in notes:
-            events.append((start, pitch, 'note_on'))
-        
-        # Agrupar eventos por tiempo (con pequeña tolerancia)
-        time_groups = {}
-        for time, pitch, event_type in events:
-            time_key = round(time * 100) / 100  # Redondear a 2 decimales
-            if time_key not in time_groups:
-                time_groups[time_key] = []
-            time_groups[time_key].append((pitch, event_type))
-        
-        sorted_times = sorted(time_groups.keys())
-        
-        # Ancho disponible para tablatura (menos el nombre de la cuerda)
-        tab_width = page_width - 7  # "G----|" = 6 caracteres + 1 espacio
-        
-        # Dividir tablatura en páginas
-        pages = []
-        current_page_notes = []
-        current_width = 0
-        
-        for time in sorted_times:
-            for pitch, event_type in time_groups[time]:
-                if pitch in self.STRING_FRETS:
-                    # Cada nota ocupa aproximadamente 2-3 caracteres (traste + separador)
-                    note_width = 3
-                    
-                    if current_width + note_width > tab_width and current_page_notes:
-                        # Comenzar nueva página
-                        pages.append(current_page_notes)
-                        current_page_notes = []
-                        current_width = 0
-                    
-                    current_page_notes.append((time, pitch, event_type))
-                    current_width += note_width
-        
-        if current_page_notes:
-            pages.append(current_page_notes)
-        
-        # Generar output de todas las páginas
-        tab_output = []
+        buffer = io.StringIO()
+        self.write_tab(notes, buffer, tempo, beats_per_measure, page_width, subdivision, tempo_map)
+        return buffer.getvalue()
+    
+    def write_tab(self, notes: List[Tuple[int, float, float]], output: TextIO,
+                  tempo: float = 120,
+                  beats_per_measure: int = 4,
+                  page_width: int = 80,
+                  subdivision: int = 4,
+                  tempo_map: Optional[Tuple] = None) -> int:
+        """
+        Escribe la tablatura paginada en un archivo abierto, página a página
+        
+        Mismo texto que generate_tab_from_notes sin construir el documento
+        entero en memoria.
         
-        # Header general
-        tab_output.append("═" * page_width)
-        tab_output.append("TABLATURA UKULELE - TRACK 1".center(page_width))
-        tab_output.append("═" * page_width)
-        tab_output.append("")
-        tab_output.append(f"Tempo: {tempo} BPM | Duración: {song_duration:.2f}s | Notas: {len(notes)}")
-        tab_output.append("")
-        tab_output.append("Afinación (GCEA):")
-        tab_output.append("G (4ª cuerda) | C (3ª cuerda) | E (2ª cuerda) | A (1ª cuerda)")
-        tab_output.append("─" * page_width)
-        
-        # Generar cada página
-        for page_num, page_notes in enumerate(pages, 1):
-            tab_output.append(f"\n[Página {page_num}/{len(pages)}]")
-            
-            # Inicializar líneas de tablatura
-            tab_lines_list = ["G----", "C----", "E----", "A----"]
-            
-            for time, pitch, event_type in page_notes:
-                if pitch in self.STRING_FRETS:
-                    string, fret = self.STRING_FRETS[pitch]
-                    
-                    # Mapear strings a líneas
-                    string_to_line = {'G': 0, 'C': 1, 'E': 2, 'A': 3}
-                    line_idx = string_to_line.get(string, 0)
-                    
-                    # Agregar el traste
-                    fret_str = str(fret)
-                    for i in range(len(tab_lines_list)):
-                        if i == line_idx:
-                            tab_lines_list[i] += fret_str + "-"
-                        else:
-                            tab_lines_list[i] += "--"
-            
-            # Agregar líneas al output
-            for line in tab_lines_list:
-                tab_output.append(line)
+        Args:
+            notes: Notas (lista de tuplas o array de note_array.NOTE_DTYPE)
+            output (TextIO): Destino con write (archivo, sys.stdout, StringIO...)
             
-            if page_num < len(pages):
-                tab_output.append("")
-                tab_output.append("─" * page_width)
+        Returns:
+            int: Páginas escritas
+        """
+        chunks = 0
+        for chunk in self.iter_tab_pages(notes, tempo, beats_per_measure, page_width,
+                                         subdivision, tempo_map):
+            output.write(chunk)
+            chunks += 1
+        return max(chunks - 2, 0)  # Sin contar cabecera y cierre
+    
+    def layout_notes(self, notes: List[Tuple[int, float, float]],
+                     tempo: float = 120,
+                     beats_per_measure: int = 4,
+                     page_width: int = 80,
+                     subdivision: int = 4,
+                     tempo_map: Optional[Tuple] = None) -> TabLayout:
+        """
+        Digita las notas y las coloca en la rejilla de beats
         
-        tab_output.append("")
-        tab_output.append("═" * page_width)
+        Mismos argumentos que generate_tab_from_notes.
         
-        return "\n".join(tab_output)
+        Returns:
+            TabLayout: Compases listos para dibujar por sistemas
+        """
+        if not isinstance(notes, np.ndarray):
+            notes = note_array.from_tuples(notes)
+        
+        notes = notes[np.argsort(notes['start'], kind='stable')]
+        beats = tab_layout.seconds_to_beats(notes['start'], tempo, tempo_map)
+        
+        # Casillas en la rejilla más fina: TabLayout refina los compases con choques.
+        # Se cuantiza antes de digitar: las notas de una misma casilla de la rejilla
+        # normal se digitan como acorde (cuerdas distintas)
+        slots = tab_layout.quantize(beats, subdivision * self.MAX_GRID_REFINE)
+        strings, frets = assign_fingering(notes['pitch'], notes['start'], self.tuning,
+                                          self.instrument.max_fret,
+                                          events=tab_layout.coarsen(slots, 1, self.MAX_GRID_REFINE))
+        return TabLayout(self.string_names, slots, strings, frets, beats_per_measure,
+                         subdivision, page_width, self.MAX_GRID_REFINE,
+                         self.tuning, self.instrument.max_fret)
+    
+    def iter_tab_pages(self, notes: List[Tuple[int, float, float]],
+                       tempo: float = 120,
+                       beats_per_measure: int = 4,
+                       page_width: int = 80,
+                       subdivision: int = 4,
+                       tempo_map: Optional[Tuple] = None) -> Iterator[str]:
+        """
+        Genera la tablatura por trozos: cabecera, una página cada vez y cierre
+        
+        Concatenar los trozos da exactamente el texto de generate_tab_from_notes.
+        Digitación y cuantización se calculan una vez para toda la canción; cada
+        sistema de compases se dibuja en su propio buffer, así el tiempo es
+        lineal y la memoria de texto, la de una página.
+        
+        Yields:
+            str: Trozos de texto en orden
+        """
+        if len(notes) == 0:
+            return
+        
+        if not isinstance(notes, np.ndarray):
+            notes = note_array.from_tuples(notes)
+        layout = self.layout_notes(notes, tempo, beats_per_measure, page_width, subdivision, tempo_map)
+        
+        # Header general
+        string_count = len(self.string_names)
+        header = [
+            "═" * page_width,
+            "TABLATURA UKULELE - TRACK 1".center(page_width),
+            "═" * page_width,
+            "",
+            f"Tempo: {tempo} BPM | Duración: {float(notes['end'][-1]):.2f}s | Notas: {len(notes)}",
+            f"Compás: {beats_per_measure}/4 | Rejilla: 1/{4 * subdivision} | Compases: {layout.measure_count}"
+            + (f" | Omitidas: {layout.dropped}" if layout.dropped else ""),
+            "",
+            f"Afinación ({''.join(self.string_names)}):",
+            " | ".join(f"{name} ({string_count - idx}ª cuerda)"
+                       for idx, name in enumerate(self.string_names)),
+            "─" * page_width,
+        ]
+        yield "\n".join(header)
+        
+        separator = "\n\n" + "─" * page_width
+        page_count = -(-layout.system_count // self.SYSTEMS_PER_PAGE)
+        for page_num in range(1, page_count + 1):
+            first = (page_num - 1) * self.SYSTEMS_PER_PAGE
+            systems = range(first, min(first + self.SYSTEMS_PER_PAGE, layout.system_count))
+            chunk = f"\n\n[Página {page_num}/{page_count}]\n" + "\n\n".join(
+                "\n".join(layout.render_system(index)) for index in systems)
+            if page_num < page_count:
+                chunk += separator
+            yield chunk
+        
+        yield "\n\n" + "═" * page_width
     
     def generate_simple_tab(self, notes: List[Tuple[int, float, float]]) -> str:
         """
@@ -175,17 +224,16 @@ class UkuleleTableGenerator:
         tab.append("═" * 50)
         tab.append("")
         
+        from .midi_loader import MIDILoader
+        
         # Información de cada nota
-        for idx, (pitch, start, end) in enumerate(notes, 1):
-            if pitch in self.STRING_FRETS:
-                string, fret = self.STRING_FRETS[pitch]
-                duration = end - start
-                
-                from .midi_loader import MIDILoader
-                note_name = MIDILoader.midi_note_to_name(pitch)
-                
-                tab.append(f"{idx:3d}. Cuerda {string} | Traste {fret:2d} | "
-                          f"Nota: {note_name} | Duración: {duration:.2f}s")
+        for idx, ((pitch, start, end), (string, fret)) in enumerate(
+                zip(notes, self.assign_fingering(notes)), 1):
+            duration = end - start
+            note_name = MIDILoader.midi_note_to_name(pitch)
+            
+            tab.append(f"{idx:3d}. Cuerda {string} | Traste {fret:2d} | "
+                      f"Nota: {note_name} | Duración: {duration:.2f}s")
         
         tab.append("")
         tab.append("═" * 50)
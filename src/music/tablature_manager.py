@@ -3,20 +3,43 @@ Gestor de tablaturas - Serialización y almacenamiento
 """
 
 import json
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
+
+from . import tablature_binary
+from .background_writer import BackgroundWriter, get_default_writer
+from .fingering import assign_fingering
+from .instruments import DEFAULT_INSTRUMENT, get_instrument
+from .tablature_binary import BINARY_SUFFIX, TablatureArrays
+from .tablature_catalog import TablatureCatalog
+
 
 class TablatureManager:
-    """Gestiona el guardado y carga de tablaturas configuradas"""
+    """
+    Gestiona el guardado y carga de tablaturas configuradas
+    
+    Las tablaturas se guardan en formato binario (.ukt, ver tablature_binary);
+    los .json siguen cargándose y sirven para importar/exportar.
+    
+    load_tablature, export_to_ui_format y load_ui_format comparten una cache
+    LRU acotada con clave (ruta, mtime, tamaño): los resultados devueltos son
+    compartidos y no deben modificarse.
+    """
+    
+    CACHE_SIZE = 32  # Tablaturas (y su formato UI) conservadas en memoria
     
-    def __init__(self, tablature_folder: str = None):
+    def __init__(self, tablature_folder: str = None, writer: BackgroundWriter = None):
         """
         Inicializa el gestor de tablaturas
         
         Args:
             tablature_folder (str): Ruta a carpeta para guardar tablaturas
                                    Por defecto, usa assets/tablatures
+            writer (BackgroundWriter): Escritor de archivos (por defecto, el compartido)
         """
         if tablature_folder is None:
             project_root = Path(__file__).parent.parent.parent
@@ -24,6 +47,17 @@ class TablatureManager:
         
         self.tablature_folder = Path(tablature_folder)
         self.tablature_folder.mkdir(parents=True, exist_ok=True)
+        
+        # Índice de metadatos (listar y filtrar sin abrir cada JSON)
+        self.catalog = TablatureCatalog(self.tablature_folder)
+        
+        # Escrituras atómicas en segundo plano: nombre -> Future en curso
+        self.writer = writer or get_default_writer()
+        self._pending = {}
+        
+        # Cache LRU: (ruta, mtime_ns, tamaño) -> [datos, formato UI o None]
+        self._cache = OrderedDict()
+        self._cache_keys = {}  # id(datos) -> clave, para export_to_ui_format
     
     def save_tablature(self, 
                       midi_filename: str,
@@ -31,9 +65,10 @@ class TablatureManager:
                       notes: List[Tuple[int, float, float]],
                       octaves_transposed: int = 0,
                       tempo: float = 120,
-                      metadata: Dict = None) -> str:
+                      metadata: Dict = None,
+                      instrument: str = DEFAULT_INSTRUMENT) -> str:
         """
-        Guarda una tablatura configurada
+        Guarda una tablatura configurada (espera a que esté en disco)
         
         Args:
             midi_filename (str): Nombre del archivo MIDI original
@@ -42,14 +77,72 @@ class TablatureManager:
             octaves_transposed (int): Octavas transponidas
             tempo (float): Tempo en BPM
             metadata (Dict): Datos adicionales
+            instrument (str): Perfil de instruments.INSTRUMENTS para el que se digita
             
         Returns:
             str: Nombre del archivo guardado
         """
-        # Crear nombre de archivo
+        tab_filename = self.save_tablature_async(
+            midi_filename, track_index, notes, octaves_transposed, tempo, metadata, instrument
+        ).result()
+        
+        print(f"✅ Tablatura guardada: {tab_filename}")
+        return tab_filename
+    
+    def save_tablature_async(self,
+                             midi_filename: str,
+                             track_index: int,
+                             notes: List[Tuple[int, float, float]],
+                             octaves_transposed: int = 0,
+                             tempo: float = 120,
+                             metadata: Dict = None,
+                             instrument: str = DEFAULT_INSTRUMENT) -> Future:
+        """
+        Encola el guardado de una tablatura en el escritor en segundo plano
+        
+        Mismos argumentos que save_tablature. Las lecturas posteriores de la
+        misma tablatura desde este gestor esperan a que la escritura termine.
+        
+        Returns:
+            Future: Se resuelve con el nombre del archivo guardado
+        """
+        tab_name, tablature_data = self.build_tablature_data(
+            midi_filename, track_index, notes, octaves_transposed, tempo, metadata, instrument
+        )
+        tab_filename = f"{tab_name}{BINARY_SUFFIX}"
+        
+        result = Future()
+        write = self._write_binary(tab_name, tablature_data)
+        write.add_done_callback(
+            lambda done: result.set_exception(done.exception()) if done.exception()
+            else result.set_result(tab_filename)
+        )
+        return result
+    
+    @classmethod
+    def build_tablature_data(cls,
+                             midi_filename: str,
+                             track_index: int,
+                             notes: List[Tuple[int, float, float]],
+                             octaves_transposed: int = 0,
+                             tempo: float = 120,
+                             metadata: Dict = None,
+                             instrument: str = DEFAULT_INSTRUMENT) -> Tuple[str, Dict]:
+        """
+        Construye el nombre y la estructura de una tablatura sin guardarla
+        
+        Mismos argumentos que save_tablature; no toca disco (lo usan también
+        los procesos del conversor por lotes).
+        
+        Returns:
+            Tuple[str, Dict]: (nombre sin extensión, datos de la tablatura)
+        """
+        instrument = get_instrument(instrument).name
+        
+        # Crear nombre de archivo (el instrumento solo si no es el de por defecto)
         tab_name = f"{midi_filename}_track{track_index}_oct{octaves_transposed:+d}"
-        tab_filename = f"{tab_name}.json"
-        tab_path = self.tablature_folder / tab_filename
+        if instrument != DEFAULT_INSTRUMENT:
+            tab_name += f"_{instrument}"
         
         # Convertir notas a formato serializable
         notes_data = [
@@ -57,7 +150,7 @@ class TablatureManager:
                 "pitch": pitch,
                 "start_time": start,
                 "end_time": end,
-                "note_name": self._midi_to_name(pitch)
+                "note_name": cls._midi_to_name(pitch)
             }
             for pitch, start, end in notes
         ]
@@ -71,7 +164,8 @@ class TablatureManager:
             },
             "configuration": {
                 "octaves_transposed": octaves_transposed,
-                "tempo": tempo
+                "tempo": tempo,
+                "instrument": instrument
             },
             "notes": notes_data,
             "statistics": {
@@ -83,40 +177,293 @@ class TablatureManager:
             "metadata": metadata or {}
         }
         
-        # Guardar JSON
-        with open(tab_path, 'w', encoding='utf-8') as f:
-            json.dump(tablature_data, f, indent=2, ensure_ascii=False)
+        return tab_name, tablature_data
+    
+    def _write_binary(self, tab_name: str, tablature_data: Dict) -> Future:
+        """Encola la escritura atómica del .ukt; el catálogo se actualiza al terminar"""
+        tab_path = self.tablature_folder / f"{tab_name}{BINARY_SUFFIX}"
+        raw = tablature_binary.encode(tablature_data)
+        self._invalidate(tab_name)
         
-        print(f"✅ Tablatura guardada: {tab_filename}")
-        return tab_filename
+        future = self.writer.submit(
+            tab_path, raw,
+            on_done=lambda path: self._catalog_written(tab_name, tablature_data, raw, path)
+        )
+        self._pending[tab_name] = future
+        future.add_done_callback(lambda done: self._pending.pop(tab_name, None)
+                                 if self._pending.get(tab_name) is done else None)
+        return future
+    
+    def _catalog_written(self, tab_name: str, tablature_data: Dict, raw: bytes, path: Path):
+        """
+        Registra en el catálogo una tablatura ya escrita (hilo escritor)
+        
+        El catálogo queda marcado y se escribe una vez por lote (schedule_save
+        o flush). Un fallo aquí no invalida el guardado, que ya está en disco:
+        se informa aparte y el próximo refresh reescanea la carpeta.
+        """
+        try:
+            self.catalog.update(tab_name, tablature_data, raw, path, save=False)
+            self.catalog.schedule_save()
+        except Exception as e:
+            print(f"⚠️ Tablatura guardada pero el catálogo no se actualizó ({tab_name}): {e}")
+            self.catalog.invalidate()
+    
+    def _wait_pending(self, name: str = None):
+        """Espera las escrituras en curso (de una tablatura o todas)"""
+        if name is not None:
+            future = self._pending.get(name)
+            futures = [future] if future else []
+        else:
+            futures = list(self._pending.values())
+        
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # El error se informa a quien hizo el guardado
+    
+    def flush(self):
+        """Espera a que todas las tablaturas encoladas (y el catálogo) estén en disco"""
+        self._wait_pending()
+        self.catalog.save_if_dirty()
+    
+    def register_tablatures(self, entries: Dict[str, Dict]):
+        """
+        Registra tablaturas escritas fuera del gestor (p. ej. por otro proceso)
+        
+        Args:
+            entries (Dict[str, Dict]): nombre -> entrada de TablatureCatalog.build_entry
+        """
+        for name in entries:
+            self._invalidate(name)
+        self.catalog.add_entries(entries)
+    
+    @staticmethod
+    def _strip_suffix(filename: str) -> str:
+        """Nombre de tablatura sin extensión (.json o .ukt)"""
+        for suffix in ('.json', BINARY_SUFFIX):
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
+    
+    def _find_file(self, name: str) -> Optional[Path]:
+        """Archivo de una tablatura (el binario tiene prioridad sobre el JSON)"""
+        for suffix in (BINARY_SUFFIX, '.json'):
+            tab_path = self.tablature_folder / f"{name}{suffix}"
+            if tab_path.exists():
+                return tab_path
+        return None
     
     def load_tablature(self, filename: str) -> Optional[Dict]:
         """
         Carga una tablatura guardada
         
         Args:
-            filename (str): Nombre del archivo (con o sin .json)
+            filename (str): Nombre de la tablatura (con o sin .ukt/.json)
             
         Returns:
             Dict: Datos de la tablatura o None
         """
-        if not filename.endswith('.json'):
-            filename += '.json'
+        name = self._strip_suffix(filename)
+        self._wait_pending(name)
+        tab_path = self._find_file(name)
         
-        tab_path = self.tablature_folder / filename
+        if tab_path is None:
+            print(f"❌ Archivo no encontrado: {filename}")
+            return None
         
-        if not tab_path.exists():
+        try:
+            stat = tab_path.stat()
+            key = (str(tab_path), stat.st_mtime_ns, stat.st_size)
+            entry = self._cache.get(key)
+            
+            if entry is not None and entry[0] is not None:
+                self._cache.move_to_end(key)
+                return entry[0]
+            
+            if tab_path.suffix == BINARY_SUFFIX:
+                data = self._arrays_to_dict(tablature_binary.read(tab_path, mmap=False))
+            else:
+                with open(tab_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            print(f"✅ Tablatura cargada: {tab_path.name}")
+        except Exception as e:
+            print(f"❌ Error al cargar tablatura: {e}")
+            return None
+        
+        if entry is not None:
+            # Entrada creada por load_ui_format: conservar su formato UI
+            entry[0] = data
+            self._cache_keys[id(data)] = key
+            self._cache.move_to_end(key)
+        else:
+            self._cache_put(key, data)
+        return data
+    
+    def load_ui_format(self, filename: str) -> Optional[Dict]:
+        """
+        Carga una tablatura directamente en formato UI (lo que usa el modo juego)
+        
+        Digita sobre las columnas de load_tablature_arrays (memmap) sin pasar por
+        la lista de notas, y guarda el resultado en la cache: repetir la misma
+        canción no vuelve a leer ni a digitar.
+        
+        Args:
+            filename (str): Nombre de la tablatura
+            
+        Returns:
+            Dict: Mismo formato que export_to_ui_format (compartido) o None
+        """
+        name = self._strip_suffix(filename)
+        self._wait_pending(name)
+        tab_path = self._find_file(name)
+        
+        if tab_path is None:
             print(f"❌ Archivo no encontrado: {filename}")
             return None
         
         try:
+            stat = tab_path.stat()
+        except OSError as e:
+            print(f"❌ Error al cargar tablatura: {e}")
+            return None
+        key = (str(tab_path), stat.st_mtime_ns, stat.st_size)
+        entry = self._cache.get(key)
+        
+        if entry is not None:
+            self._cache.move_to_end(key)
+            if entry[1] is None:
+                entry[1] = self._build_ui_format(entry[0])
+            return entry[1]
+        
+        arrays = self.load_tablature_arrays(name)
+        if arrays is None:
+            return None
+        
+        ui_data = self.arrays_to_ui_format(arrays)
+        self._cache_put(key, None, ui_data)
+        return ui_data
+    
+    def _cache_put(self, key, data: Optional[Dict], ui_data: Dict = None):
+        """Guarda una tablatura cargada, descartando la menos usada si hace falta"""
+        self._cache[key] = [data, ui_data]
+        if data is not None:
+            self._cache_keys[id(data)] = key
+        
+        while len(self._cache) > self.CACHE_SIZE:
+            _, (old_data, _) = self._cache.popitem(last=False)
+            if old_data is not None:
+                self._cache_keys.pop(id(old_data), None)
+    
+    def _invalidate(self, name: str):
+        """Descarta de la cache las versiones de una tablatura"""
+        paths = {str(self.tablature_folder / f"{name}{suffix}") for suffix in (BINARY_SUFFIX, '.json')}
+        for key in [key for key in self._cache if key[0] in paths]:
+            data, _ = self._cache.pop(key)
+            if data is not None:
+                self._cache_keys.pop(id(data), None)
+    
+    def clear_cache(self):
+        """Vacía la cache de tablaturas"""
+        self._cache.clear()
+        self._cache_keys.clear()
+    
+    def load_tablature_arrays(self, filename: str) -> Optional[TablatureArrays]:
+        """
+        Carga una tablatura como columnas NumPy (memmap si es binaria)
+        
+        Args:
+            filename (str): Nombre de la tablatura
+            
+        Returns:
+            TablatureArrays: Metadatos y columnas start_time/end_time/pitch o None
+        """
+        name = self._strip_suffix(filename)
+        self._wait_pending(name)
+        tab_path = self._find_file(name)
+        
+        if tab_path is None:
+            print(f"❌ Archivo no encontrado: {filename}")
+            return None
+        
+        try:
+            if tab_path.suffix == BINARY_SUFFIX:
+                return tablature_binary.read(tab_path, mmap=True)
+            
             with open(tab_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            print(f"✅ Tablatura cargada: {filename}")
-            return data
         except Exception as e:
             print(f"❌ Error al cargar tablatura: {e}")
             return None
+        notes = data.pop("notes", [])
+        columns = {
+            field: np.array([note[field] for note in notes], dtype=dtype)
+            for field, dtype in tablature_binary.COLUMNS
+        }
+        data['note_count'] = len(notes)
+        return TablatureArrays(data, columns)
+    
+    def _arrays_to_dict(self, arrays: TablatureArrays) -> Dict:
+        """Reconstruye la estructura JSON clásica a partir de las columnas"""
+        data = {key: value for key, value in arrays.metadata.items()
+                if key not in ('columns', 'note_count')}
+        data["notes"] = [
+            {
+                "pitch": pitch,
+                "start_time": start,
+                "end_time": end,
+                "note_name": self._midi_to_name(pitch)
+            }
+            for pitch, start, end in zip(arrays.pitch.tolist(), arrays.start_time.tolist(),
+                                         arrays.end_time.tolist())
+        ]
+        return data
+    
+    def export_json(self, filename: str, json_path: str = None) -> Optional[Path]:
+        """
+        Exporta una tablatura a JSON
+        
+        Args:
+            filename (str): Nombre de la tablatura
+            json_path (str): Destino (por defecto, <nombre>.json en la carpeta actual)
+            
+        Returns:
+            Path: Archivo escrito o None si la tablatura no existe
+        """
+        data = self.load_tablature(filename)
+        if data is None:
+            return None
+        
+        json_path = Path(json_path or f"{self._strip_suffix(filename)}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        print(f"✅ Tablatura exportada: {json_path}")
+        return json_path
+    
+    def import_json(self, json_path: str) -> Optional[str]:
+        """
+        Importa una tablatura JSON y la guarda en formato binario
+        
+        Args:
+            json_path (str): Archivo JSON exportado
+            
+        Returns:
+            str: Nombre de la tablatura importada o None si falla
+        """
+        json_path = Path(json_path)
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error al importar tablatura: {e}")
+            return None
+        
+        name = json_path.stem
+        self._write_binary(name, data).result()
+        print(f"✅ Tablatura importada: {name}{BINARY_SUFFIX}")
+        return name
     
     def get_saved_tablatures(self) -> List[str]:
         """
@@ -128,8 +475,22 @@ class TablatureManager:
         if not self.tablature_folder.exists():
             return []
         
-        tablatures = [f.stem for f in self.tablature_folder.glob("*.json")]
-        return sorted(tablatures)
+        self._wait_pending()
+        return self.catalog.get_names()
+    
+    def get_tablature_info(self, name: str) -> Optional[Dict]:
+        """
+        Obtiene las estadísticas de una tablatura (duración, notas, rango)
+        
+        Args:
+            name (str): Nombre de la tablatura (sin .json)
+            
+        Returns:
+            Dict: Entrada del catálogo (duration, total_notes, min/max_pitch,
+                  midi_file, track_index, ...) o None
+        """
+        self._wait_pending(name)
+        return self.catalog.get(name)
     
     def delete_tablature(self, filename: str) -> bool:
         """
@@ -141,14 +502,22 @@ class TablatureManager:
         Returns:
             bool: True si se eliminó, False si no existe
         """
-        if not filename.endswith('.json'):
-            filename += '.json'
+        name = self._strip_suffix(filename)
+        self._wait_pending(name)
+        deleted = False
+        
+        self._invalidate(name)
         
-        tab_path = self.tablature_folder / filename
+        # Borrar el binario y el JSON heredado si ambos existen
+        for suffix in (BINARY_SUFFIX, '.json'):
+            tab_path = self.tablature_folder / f"{name}{suffix}"
+            if tab_path.exists():
+                tab_path.unlink()
+                deleted = True
         
-        if tab_path.exists():
-            tab_path.unlink()
-            print(f"✅ Tablatura eliminada: {filename}")
+        if deleted:
+            self.catalog.remove(name)
+            print(f"✅ Tablatura eliminada: {name}")
             return True
         else:
             print(f"❌ Archivo no encontrado: {filename}")
@@ -162,32 +531,62 @@ class TablatureManager:
             tablature_data (Dict): Datos cargados con load_tablature
             
         Returns:
-            Dict: Formato optimizado para UI
+            Dict: Formato optimizado para UI (compartido si la tablatura vino de la cache)
         """
-        notes = tablature_data.get("notes", [])
+        key = self._cache_keys.get(id(tablature_data))
+        entry = self._cache.get(key) if key else None
+        if entry is not None and entry[0] is tablature_data:
+            if entry[1] is None:
+                entry[1] = self._build_ui_format(tablature_data)
+            return entry[1]
         
-        # Organizar notas por cuerda (string)
-        strings = {
-            'G': [],
-            'C': [],
-            'E': [],
-            'A': []
-        }
+        return self._build_ui_format(tablature_data)
+    
+    def arrays_to_ui_format(self, arrays: TablatureArrays) -> Dict:
+        """
+        Convierte columnas de load_tablature_arrays al formato para la UI del juego
         
-        for note in notes:
-            pitch = note["pitch"]
-            note_name = note["note_name"]
-            fret = self._get_fret(pitch)
-            string = self._get_string(pitch)
-            
-            # Add 1 second offset for initial silence before gameplay starts
-            start_time = note["start_time"] + 1.0
-            end_time = note["end_time"] + 1.0
+        Digita directamente sobre las columnas pitch/start_time, sin pasar por
+        la lista de notas de load_tablature. El resultado no se cachea (ver
+        load_ui_format).
+        
+        Args:
+            arrays (TablatureArrays): Tablatura cargada con load_tablature_arrays
             
-            strings[string].append({
+        Returns:
+            Dict: Mismo formato que export_to_ui_format
+        """
+        return self._build_ui_format(arrays.metadata, arrays.pitch, arrays.start_time,
+                                     arrays.end_time)
+    
+    def _build_ui_format(self, tablature_data: Dict, pitches=None, starts=None, ends=None) -> Dict:
+        """Construye el formato UI de una tablatura (de sus notas o de sus columnas)"""
+        if pitches is None:
+            notes = tablature_data.get("notes", [])
+            pitches = [note["pitch"] for note in notes]
+            starts = [note["start_time"] for note in notes]
+            ends = [note["end_time"] for note in notes]
+        
+        # Tablaturas anteriores a los perfiles: ukulele soprano
+        instrument = get_instrument(tablature_data["configuration"].get("instrument", DEFAULT_INSTRUMENT))
+        
+        # Organizar notas por cuerda (string), en orden físico
+        strings = {name: [] for name in instrument.string_names}
+        
+        # Cuerda y traste según el contexto (ver fingering.assign_fingering)
+        string_indices, frets = assign_fingering(pitches, starts, instrument.tuning, instrument.max_fret)
+        
+        # Add 1 second offset for initial silence before gameplay starts
+        starts = (np.asarray(starts, dtype=np.float64) + 1.0).tolist()
+        ends = (np.asarray(ends, dtype=np.float64) + 1.0).tolist()
+        pitches = np.asarray(pitches).tolist()
+        
+        for pitch, start_time, end_time, string_idx, fret in zip(
+                pitches, starts, ends, string_indices.tolist(), frets.tolist()):
+            strings[instrument.string_names[string_idx]].append({
                 "fret": fret,
                 "pitch": pitch,
-                "note": note_name,
+                "note": self._midi_to_name(pitch),
                 "start_time": start_time,
                 "end_time": end_time,
                 "duration": end_time - start_time
@@ -198,9 +597,10 @@ class TablatureManager:
             "track": tablature_data["source"]["track_index"],
             "tempo": tablature_data["configuration"]["tempo"],
             "octaves_transposed": tablature_data["configuration"]["octaves_transposed"],
+            "instrument": instrument.name,
             "strings": strings,
             "statistics": tablature_data["statistics"],
-            "total_notes": len(notes)
+            "total_notes": len(pitches)
         }
     
     @staticmethod
@@ -210,34 +610,3 @@ class TablatureManager:
         octave = (pitch // 12) - 1
         note_index = pitch % 12
         return f"{note_names[note_index]}{octave}"
-    
-    @staticmethod
-    def _get_string(pitch: int) -> str:
-        """Determina la cuerda para un pitch"""
-        # Afinación GCEA: G4=67, C4=60, E4=64, A4=69
-        strings_tuning = {
-            'G': 67,
-            'C': 60,
-            'E': 64,
-            'A': 69
-        }
-        
-        # Encontrar la cuerda más cercana
-        min_diff = float('inf')
-        closest_string = 'A'
-        
-        for string_name, base_pitch in strings_tuning.items():
-            # Comparar dentro del mismo rango de octavas
-            distance = abs(pitch - base_pitch)
-            if distance < min_diff:
-                min_diff = distance
-                closest_string = string_name
-        
-        return closest_string
-    
-    @staticmethod
-    def _get_fret(pitch: int) -> int:
-        """Calcula el traste para un pitch"""
-        # Usar C4 como referencia (cuerda C, traste 0)
-        base_pitch = 60  # C4
-        return pitch - base_pitch
@@ -0,0 +1,265 @@
+"""
+Reloj de juego de alta resolución sincronizable con el reloj de audio
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class AudioClockSync:
+    """
+    Relaciona el reloj del stream de audio (PortAudio) con perf_counter
+
+    El callback de audio registra cada bloque con observe_block(). El offset
+    host - stream se estima con el mínimo de una ventana de observaciones:
+    el retraso de planificación del callback solo puede sumar tiempo, así que
+    el mínimo es la estimación con menos jitter y sigue la deriva lenta entre
+    relojes a medida que la ventana avanza.
+    """
+
+    def __init__(self, window: int = 64):
+        self._offsets = deque(maxlen=window)  # host_s - stream_s
+        self._lock = threading.Lock()
+
+        self.sample_rate = None
+        self.sample_position = 0  # Samples capturados desde el inicio
+        self.last_block_end = None  # Tiempo de stream del último sample capturado
+
+    def reset(self):
+        """Descarta todas las observaciones"""
+        with self._lock:
+            self._offsets.clear()
+            self.sample_position = 0
+            self.last_block_end = None
+
+    def observe_block(self, adc_time: float, current_time: float, frames: int,
+                      sample_rate: float, host_ns: int = None):
+        """
+        Registra un bloque de audio recibido (llamar desde el callback)
+
+        Args:
+            adc_time (float): time_info.inputBufferAdcTime del callback
+            current_time (float): time_info.currentTime del callback
+            frames (int): Número de samples del bloque
+            sample_rate (float): Frecuencia de muestreo del stream
+            host_ns (int): perf_counter_ns del momento del callback
+        """
+        if host_ns is None:
+            host_ns = time.perf_counter_ns()
+
+        block_duration = frames / sample_rate
+
+        with self._lock:
+            self.sample_rate = sample_rate
+
+            if current_time and current_time > 0:
+                # El host API reporta tiempos de stream
+                stream_now = current_time
+                if adc_time and adc_time > 0:
+                    block_end = adc_time + block_duration
+                else:
+                    block_end = current_time
+            else:
+                # Sin tiempos del host API: usar el contador de samples
+                block_end = (self.sample_position + frames) / sample_rate
+                stream_now = block_end
+
+            self.sample_position += frames
+            self.last_block_end = block_end
+            self._offsets.append(host_ns / 1e9 - stream_now)
+
+    def is_synced(self) -> bool:
+        """Indica si hay observaciones suficientes para convertir tiempos"""
+        return len(self._offsets) > 0
+
+    def get_offset(self):
+        """
+        Obtiene el offset estimado entre relojes
+
+        Returns:
+            float: host_s - stream_s, o None si no hay observaciones
+        """
+        with self._lock:
+            if not self._offsets:
+                return None
+            return min(self._offsets)
+
+    def stream_to_host_ns(self, stream_time: float):
+        """
+        Convierte un tiempo del stream de audio a perf_counter_ns
+
+        Args:
+            stream_time (float): Tiempo en el reloj de PortAudio (segundos)
+
+        Returns:
+            int: Tiempo equivalente en perf_counter_ns, o None sin sincronía
+        """
+        offset = self.get_offset()
+        if offset is None:
+            return None
+        return int((stream_time + offset) * 1e9)
+
+
+class GameClock:
+    """
+    Reloj monótono del juego basado en time.perf_counter_ns
+
+    Todas las posiciones de notas, juicios y timestamps de detección se
+    expresan en segundos sobre esta misma línea de tiempo. Opcionalmente
+    puede esclavizarse a un AudioClockSync para seguir la deriva del reloj
+    de la tarjeta de sonido.
+
+    La corrección de deriva se aplica de forma gradual (como mucho
+    DRIFT_SLEW_RATE segundos por segundo de host), porque el offset estimado
+    salta cuando el mínimo sale de la ventana; now() nunca retrocede.
+    """
+
+    DRIFT_SLEW_RATE = 0.002  # 2 ms de corrección por segundo (la deriva real es de ppm)
+
+    def __init__(self, time_source=time.perf_counter_ns):
+        """
+        Inicializa el reloj
+
+        Args:
+            time_source (callable): Fuente de tiempo en nanosegundos
+        """
+        self._time_source = time_source
+        self._origin_ns = 0  # Tiempo bruto correspondiente a t=0 del juego
+        self._paused_at_ns = None
+        self._running = False
+
+        self._last_now_ns = None  # Último valor devuelto por now_ns
+
+        self.audio_sync = None
+        self._slave_to_audio = False
+        self._attach_offset = None  # Offset del audio al momento de esclavizar
+        self._applied_drift_ns = 0  # Corrección ya aplicada (sigue al offset poco a poco)
+        self._drift_updated_ns = None  # Tiempo de host de la última actualización
+
+    def attach_audio(self, audio_sync: AudioClockSync, slave: bool = True):
+        """
+        Asocia el reloj al stream de audio
+
+        Args:
+            audio_sync (AudioClockSync): Sincronizador del stream de entrada
+            slave (bool): Si es True, el reloj sigue la deriva del reloj de audio
+        """
+        self.audio_sync = audio_sync
+        self._slave_to_audio = slave
+        self._attach_offset = None
+        self._applied_drift_ns = 0
+        self._drift_updated_ns = None
+
+    def _drift_ns(self) -> int:
+        """Corrección acumulada por deriva del reloj de audio"""
+        if not self._slave_to_audio or self.audio_sync is None:
+            return 0
+
+        offset = self.audio_sync.get_offset()
+        if offset is None:
+            return self._applied_drift_ns
+
+        host_ns = self._time_source()
+        if self._attach_offset is None:
+            # Primera observación: fijar referencia para no producir saltos
+            self._attach_offset = offset
+            self._drift_updated_ns = host_ns
+
+        # Acercarse al offset objetivo sin superar DRIFT_SLEW_RATE
+        target = int((offset - self._attach_offset) * 1e9)
+        max_step = int(max(host_ns - self._drift_updated_ns, 0) * self.DRIFT_SLEW_RATE)
+        self._applied_drift_ns += min(max(target - self._applied_drift_ns, -max_step), max_step)
+        self._drift_updated_ns = host_ns
+        return self._applied_drift_ns
+
+    def _raw_ns(self, host_ns: int = None) -> int:
+        """Tiempo bruto (host corregido por deriva) en nanosegundos"""
+        if host_ns is None:
+            host_ns = self._time_source()
+        return host_ns - self._drift_ns()
+
+    def start(self, at: float = 0.0):
+        """
+        Arranca el reloj
+
+        Args:
+            at (float): Tiempo de juego inicial en segundos (puede ser negativo)
+        """
+        self._origin_ns = self._raw_ns() - int(at * 1e9)
+        self._paused_at_ns = None
+        self._last_now_ns = None
+        self._running = True
+
+    def set_time(self, seconds: float):
+        """Reposiciona el reloj para que now() devuelva 'seconds'"""
+        reference = self._paused_at_ns if self._paused_at_ns is not None else self._raw_ns()
+        self._origin_ns = reference - int(seconds * 1e9)
+        self._last_now_ns = None
+
+    def pause(self):
+        """Congela el reloj"""
+        if self._paused_at_ns is None:
+            self._paused_at_ns = self._raw_ns()
+
+    def resume(self):
+        """Reanuda el reloj descontando el tiempo en pausa"""
+        if self._paused_at_ns is not None:
+            self._origin_ns += self._raw_ns() - self._paused_at_ns
+            self._paused_at_ns = None
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused_at_ns is not None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def now_ns(self) -> int:
+        """Tiempo de juego actual en nanosegundos"""
+        if not self._running:
+            return 0
+        if self._paused_at_ns is not None:
+            return self._paused_at_ns - self._origin_ns
+
+        now_ns = self._raw_ns() - self._origin_ns
+        if self._last_now_ns is not None and now_ns < self._last_now_ns:
+            now_ns = self._last_now_ns  # Monótono aunque la corrección de deriva crezca
+        self._last_now_ns = now_ns
+        return now_ns
+
+    def now(self) -> float:
+        """Tiempo de juego actual en segundos"""
+        return self.now_ns() / 1e9
+
+    def host_to_game_time(self, host_ns: int) -> float:
+        """
+        Convierte un timestamp de perf_counter_ns a tiempo de juego
+
+        Args:
+            host_ns (int): Timestamp tomado con perf_counter_ns
+
+        Returns:
+            float: Tiempo de juego en segundos
+        """
+        return (self._raw_ns(host_ns) - self._origin_ns) / 1e9
+
+    def stream_to_game_time(self, stream_time: float):
+        """
+        Convierte un tiempo del stream de audio a tiempo de juego
+
+        Args:
+            stream_time (float): Tiempo en el reloj de PortAudio (segundos)
+
+        Returns:
+            float: Tiempo de juego en segundos, o None si no hay sincronía
+        """
+        if self.audio_sync is None:
+            return None
+
+        host_ns = self.audio_sync.stream_to_host_ns(stream_time)
+        if host_ns is None:
+            return None
+
+        return self.host_to_game_time(host_ns)
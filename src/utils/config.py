@@ -2,11 +2,24 @@
 Configuración del juego Ukulele Master
 """
 
+from pathlib import Path
+
+try:
+    from ..music.instruments import get_instrument
+except ImportError:  # Importado como utils.config (src en sys.path)
+    from music.instruments import get_instrument
+
 # Configuración de ventana
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
 WINDOW_TITLE = "Ukulele Master"
 FPS = 60
+MENU_EVENT_TIMEOUT_MS = 500  # Espera máxima de los menús por eventos (redibujan solo al cambiar)
+
+# Simulación a paso fijo (desacoplada del framerate de render)
+LOGIC_HZ = 240  # Pasos de lógica por segundo
+MAX_LOGIC_STEPS_PER_FRAME = 24  # Máximo de pasos antes de ceder al render
+MAX_FRAME_SKIP = 4  # Frames seguidos sin render cuando la lógica va atrasada
 
 # Configuración de audio
 SAMPLE_RATE = 44100
@@ -16,70 +29,53 @@ CHANNELS = 1
 # Configuración de detección de notas
 NOTE_TOLERANCE_CENTS = 10  # Tolerancia en cents (100 cents = 1 semitono)
 MIN_VOLUME_THRESHOLD = 0.01  # Umbral mínimo de volumen para detectar nota
+ONSET_ENERGY_RATIO = 1.4  # Subida de volumen (RMS) entre bloques que marca un ataque nuevo
 
-# Rango de frecuencias para análisis (Hz)
-MIN_FREQUENCY = 130    # C3 - nota más grave esperada
-MAX_FREQUENCY = 1320   # E6 - nota más aguda (armónicos)
-
-# Frecuencias de las cuerdas del ukulele (afinación estándar)
-UKULELE_STRINGS = {
-    'G4': 392.00,  # 4ª cuerda
-    'C4': 261.63,  # 3ª cuerda  
-    'E4': 329.63,  # 2ª cuerda
-    'A4': 440.00   # 1ª cuerda
+# Ventanas de juicio por dificultad (tiempo en segundos, afinación en cents)
+DEFAULT_DIFFICULTY = 'normal'
+JUDGMENT_WINDOWS = {
+    'easy': {'perfect': 0.075, 'good': 0.15, 'ok': 0.25, 'cents': 60},
+    'normal': {'perfect': 0.05, 'good': 0.1, 'ok': 0.2, 'cents': 50},
+    'hard': {'perfect': 0.035, 'good': 0.07, 'ok': 0.12, 'cents': 35},
 }
 
-# Todas las notas musicales con sus frecuencias (3ª, 4ª y 5ª octava)
-NOTE_FREQUENCIES = {
-    # 3ª octava (para trastes más graves)
-    'C3': 130.81,
-    'C#3': 138.59,
-    'D3': 146.83,
-    'D#3': 155.56,
-    'E3': 164.81,
-    'F3': 174.61,
-    'F#3': 185.00,
-    'G3': 196.00,
-    'G#3': 207.65,
-    'A3': 220.00,
-    'A#3': 233.08,
-    'B3': 246.94,
-    
-    # 4ª octava (notas principales del ukulele)
-    'C4': 261.63,
-    'C#4': 277.18,
-    'D4': 293.66,
-    'D#4': 311.13,
-    'E4': 329.63,
-    'F4': 349.23,
-    'F#4': 369.99,
-    'G4': 392.00,
-    'G#4': 415.30,
-    'A4': 440.00,
-    'A#4': 466.16,
-    'B4': 493.88,
-    
-    # 5ª octava (trastes agudos y armónicos)
-    'C5': 523.25,
-    'C#5': 554.37,
-    'D5': 587.33,
-    'D#5': 622.25,
-    'E5': 659.25,
-    'F5': 698.46,
-    'F#5': 739.99,
-    'G5': 783.99,
-    'G#5': 830.61,
-    'A5': 880.00,
-    'A#5': 932.33,
-    'B5': 987.77,
-    
-    # 6ª octava (armónicos muy agudos)
-    'C6': 1046.50,
-    'C#6': 1108.73,
-    'D6': 1174.66,
-    'D#6': 1244.51,
-    'E6': 1318.51
-}
+# Datos del usuario (calibración, puntuaciones, caches)
+USER_DATA_DIR = Path.home() / ".ukulele_hero"
+LATENCY_PROFILE_FILE = USER_DATA_DIR / "latency.json"
+
+# Puntuaciones
+SCORES_DB_FILE = USER_DATA_DIR / "scores.db"
+PLAYER_NAME = "Jugador"  # Jugador por defecto de las puntuaciones
+LEADERBOARD_SIZE = 5  # Entradas mostradas en el selector de tablaturas
+
+# Replays de partidas
+RECORD_REPLAYS = True  # Grabar cada partida del modo juego
+REPLAY_FOLDER = USER_DATA_DIR / "replays"
+REPLAY_RECORD_AUDIO = False  # Guardar también el audio crudo (float32, ~10 MB por minuto)
+REPLAY_KEEP_PER_SONG = 10  # Replays conservados por tablatura (los más antiguos se borran; 0 = todos)
+
+# Calibración de latencia de entrada
+CALIBRATION_CLICK_COUNT = 12  # Clicks en la pista de calibración
+CALIBRATION_CLICK_INTERVAL = 0.75  # Segundos entre clicks
+CALIBRATION_CLICK_FREQUENCY = 880.0  # A5: el micrófono también oye el click
+CALIBRATION_CLICK_REJECT_CENTS = 50  # Onsets a menos de esta distancia del click se ignoran
+CALIBRATION_MATCH_WINDOW = 0.35  # Máxima distancia click-onset aceptada (s)
+
+# Instrumento (ver music.instruments: soprano, low_g, tenor, baritone, guitar)
+INSTRUMENT = 'soprano'
+_PROFILE = get_instrument(INSTRUMENT)
+
+# Rango de frecuencias para análisis (Hz), según el instrumento
+# Soprano: C3 (130 Hz, una octava bajo la cuerda más grave) a E6 (1320 Hz)
+MIN_FREQUENCY = _PROFILE.min_frequency
+MAX_FREQUENCY = _PROFILE.max_frequency
+
+# Frecuencias de las cuerdas al aire, en orden físico (soprano: G4, C4, E4, A4)
+UKULELE_STRINGS = _PROFILE.string_frequencies()
+
+# Notas musicales dentro de la banda de detección con sus frecuencias
+# (soprano: de C3 a E6)
+NOTE_FREQUENCIES = _PROFILE.note_frequencies()
 
 # Colores (RGB)
 BLACK = (0, 0, 0)
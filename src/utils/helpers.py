@@ -6,12 +6,14 @@ import numpy as np
 from .config import NOTE_FREQUENCIES, NOTE_TOLERANCE_CENTS
 
 
-def frequency_to_note(frequency):
+def frequency_to_note(frequency, note_frequencies=None):
     """
     Convierte una frecuencia en Hz a la nota musical más cercana
     
     Args:
         frequency (float): Frecuencia en Hz
+        note_frequencies (dict): Tabla nota -> Hz (por defecto NOTE_FREQUENCIES;
+                                 ver InstrumentProfile.note_frequencies)
         
     Returns:
         tuple: (nota, desviacion_en_cents)
@@ -24,7 +26,10 @@ def frequency_to_note(frequency):
     closest_note = None
     deviation = 0
     
-    for note, note_freq in NOTE_FREQUENCIES.items():
+    if note_frequencies is None:
+        note_frequencies = NOTE_FREQUENCIES
+    
+    for note, note_freq in note_frequencies.items():
         # Calcular distancia en cents (100 cents = 1 semitono)
         distance_cents = 1200 * np.log2(frequency / note_freq)
         abs_distance = abs(distance_cents)
@@ -74,6 +79,22 @@ def get_tuning_status(deviation_cents, tolerance=NOTE_TOLERANCE_CENTS):
         return 'flat'   # Demasiado grave
 
 
+def frequency_to_midi(frequency):
+    """
+    Convierte una frecuencia en Hz a número MIDI fraccionario
+    
+    Args:
+        frequency (float): Frecuencia en Hz
+        
+    Returns:
+        float: Número MIDI (69.0 = A4), con los cents como parte decimal
+    """
+    if frequency <= 0:
+        return None
+    
+    return 69 + 12 * np.log2(frequency / 440.0)
+
+
 def note_to_frequency(note):
     """
     Convierte una nota musical a su frecuencia en Hz
@@ -0,0 +1,216 @@
+"""
+Instrumentación ligera de frames y etapas del pipeline
+Registra spans con perf_counter_ns en buffers circulares y exporta trazas de Chrome
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+class _Span:
+    """Context manager reutilizable para medir una etapa"""
+
+    __slots__ = ('profiler', 'stage_id', 'start_ns')
+
+    def __init__(self, profiler, stage_id):
+        self.profiler = profiler
+        self.stage_id = stage_id
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = self.profiler.time_source()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        profiler = self.profiler
+        profiler._record_span(self.stage_id, self.start_ns, profiler.time_source() - self.start_ns)
+        return False
+
+
+class FrameProfiler:
+    """
+    Perfilador de frames por etapas
+
+    Los spans se guardan en arrays NumPy preasignados usados como buffer
+    circular, así que medir no reserva memoria durante el juego.
+    """
+
+    def __init__(self, span_capacity=16384, frame_capacity=1024, time_source=time.perf_counter_ns):
+        """
+        Inicializa el perfilador
+
+        Args:
+            span_capacity (int): Spans de etapa que se conservan
+            frame_capacity (int): Frames (y latencias) que se conservan
+            time_source (callable): Fuente de tiempo en nanosegundos
+        """
+        self.time_source = time_source
+        self.enabled = True
+
+        self.stage_names = []
+        self._spans = {}  # nombre -> _Span
+
+        self.span_stage = np.zeros(span_capacity, dtype=np.int16)
+        self.span_start = np.zeros(span_capacity, dtype=np.int64)
+        self.span_duration = np.zeros(span_capacity, dtype=np.int64)
+        self.span_count = 0  # Total histórico (la posición es span_count % capacidad)
+
+        self.frame_start = np.zeros(frame_capacity, dtype=np.int64)
+        self.frame_duration = np.zeros(frame_capacity, dtype=np.int64)
+        self.frame_count = 0
+        self._frame_begin_ns = None
+
+        self.latencies = np.zeros(frame_capacity, dtype=np.float64)
+        self.latency_count = 0
+
+    def span(self, name):
+        """
+        Obtiene el medidor de una etapa para usar con 'with'
+
+        Args:
+            name (str): Nombre de la etapa (p. ej. 'render')
+
+        Returns:
+            _Span: Context manager que registra la duración de la etapa
+        """
+        span = self._spans.get(name)
+        if span is None:
+            span = _Span(self, len(self.stage_names))
+            self.stage_names.append(name)
+            self._spans[name] = span
+        return span
+
+    def _record_span(self, stage_id, start_ns, duration_ns):
+        """Escribe un span en el buffer circular"""
+        if not self.enabled:
+            return
+        idx = self.span_count % len(self.span_stage)
+        self.span_stage[idx] = stage_id
+        self.span_start[idx] = start_ns
+        self.span_duration[idx] = duration_ns
+        self.span_count += 1
+
+    def begin_frame(self):
+        """Marca el inicio de un frame"""
+        self._frame_begin_ns = self.time_source()
+
+    def end_frame(self):
+        """Marca el final del frame en curso"""
+        if self._frame_begin_ns is None or not self.enabled:
+            return
+        idx = self.frame_count % len(self.frame_start)
+        self.frame_start[idx] = self._frame_begin_ns
+        self.frame_duration[idx] = self.time_source() - self._frame_begin_ns
+        self.frame_count += 1
+
+    def record_latency(self, seconds):
+        """
+        Registra la latencia de una detección
+
+        Args:
+            seconds (float): Tiempo entre el audio analizado y su procesamiento
+        """
+        if not self.enabled:
+            return
+        self.latencies[self.latency_count % len(self.latencies)] = seconds
+        self.latency_count += 1
+
+    def get_frame_times_ms(self):
+        """
+        Obtiene las duraciones de frame conservadas, de la más antigua a la más reciente
+
+        Returns:
+            numpy.array: Duraciones en milisegundos
+        """
+        return self._ordered(self.frame_duration, self.frame_count) / 1e6
+
+    @staticmethod
+    def _ordered(buffer, count):
+        """Devuelve el contenido válido de un buffer circular en orden cronológico"""
+        capacity = len(buffer)
+        if count <= capacity:
+            return buffer[:count]
+        idx = count % capacity
+        return np.concatenate((buffer[idx:], buffer[:idx]))
+
+    def get_stats(self):
+        """
+        Calcula estadísticas de frames, etapas y latencia de detección
+
+        Returns:
+            dict: {'frame_p50', 'frame_p99', 'frame_max', 'fps', 'stages', 'latency_p50'}
+                  (tiempos en ms; 'stages' es {nombre: promedio_ms})
+        """
+        frame_times = self.get_frame_times_ms()
+        stats = {
+            'frame_p50': 0.0, 'frame_p99': 0.0, 'frame_max': 0.0, 'fps': 0.0,
+            'stages': {}, 'latency_p50': 0.0
+        }
+
+        if len(frame_times):
+            p50, p99 = np.percentile(frame_times, [50, 99])
+            stats['frame_p50'] = float(p50)
+            stats['frame_p99'] = float(p99)
+            stats['frame_max'] = float(frame_times.max())
+
+            starts = self._ordered(self.frame_start, self.frame_count)
+            if len(starts) > 1 and starts[-1] > starts[0]:
+                stats['fps'] = float((len(starts) - 1) / ((starts[-1] - starts[0]) / 1e9))
+
+        span_total = min(self.span_count, len(self.span_stage))
+        if span_total:
+            stages = self.span_stage[:span_total]
+            durations = self.span_duration[:span_total]
+            counts = np.bincount(stages, minlength=len(self.stage_names))
+            totals = np.bincount(stages, weights=durations, minlength=len(self.stage_names))
+            for stage_id, name in enumerate(self.stage_names):
+                if counts[stage_id]:
+                    stats['stages'][name] = float(totals[stage_id] / counts[stage_id] / 1e6)
+
+        latencies = self._ordered(self.latencies, self.latency_count)
+        if len(latencies):
+            stats['latency_p50'] = float(np.median(latencies) * 1000)
+
+        return stats
+
+    def export_chrome_trace(self, path):
+        """
+        Exporta los spans y frames conservados en formato Chrome trace JSON
+
+        El archivo se abre en chrome://tracing o https://ui.perfetto.dev
+
+        Args:
+            path (str): Ruta del archivo a escribir
+
+        Returns:
+            Path: Ruta escrita
+        """
+        events = []
+
+        frame_starts = self._ordered(self.frame_start, self.frame_count)
+        frame_durations = self._ordered(self.frame_duration, self.frame_count)
+        for start, duration in zip(frame_starts, frame_durations):
+            events.append({
+                'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': start / 1000.0, 'dur': duration / 1000.0
+            })
+
+        stages = self._ordered(self.span_stage, self.span_count)
+        starts = self._ordered(self.span_start, self.span_count)
+        durations = self._ordered(self.span_duration, self.span_count)
+        for stage_id, start, duration in zip(stages, starts, durations):
+            events.append({
+                'name': self.stage_names[stage_id], 'ph': 'X', 'pid': 1, 'tid': 2,
+                'ts': start / 1000.0, 'dur': duration / 1000.0
+            })
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+        print(f"✅ Traza exportada: {path}")
+        return path
@@ -5,6 +5,7 @@ Tests básicos para el sistema de audio
 import unittest
 import numpy as np
 from src.audio.frequency_analyzer import FrequencyAnalyzer
+from src.audio.latency import LatencyCalibrator, LatencyProfileStore
 from src.utils.helpers import frequency_to_note, note_to_frequency
 
 
@@ -116,5 +117,57 @@ class TestHelpers(unittest.TestCase):
         self.assertEqual(deviation, 0)
 
 
+
+class TestLatencyCalibration(unittest.TestCase):
+    """Tests para la calibración de latencia"""
+    
+    def test_offset_from_delayed_onsets(self):
+        """Test offset con onsets retrasados 80 ms y un valor atípico"""
+        clicks = [1.0 + i * 0.75 for i in range(8)]
+        calibrator = LatencyCalibrator(clicks, match_window=0.35)
+        
+        for idx, click in enumerate(clicks):
+            jitter = 0.002 if idx % 2 else -0.002
+            calibrator.add_onset(click + 0.08 + jitter)
+        calibrator.add_onset(clicks[3] + 0.3)  # Onset espurio, no es el primero de su ventana
+        calibrator.onsets[0] += 0.25  # Valor atípico
+        
+        result = calibrator.compute_offset()
+        self.assertIsNotNone(result)
+        self.assertAlmostEqual(result['offset'], 0.08, delta=0.003)
+        self.assertEqual(result['matches'], 7)
+    
+    def test_click_pitch_is_ignored(self):
+        """Test el propio click oído por el micrófono no cuenta como pulsación"""
+        clicks = [1.0 + i * 0.75 for i in range(6)]
+        calibrator = LatencyCalibrator(clicks, click_frequency=880.0)
+        
+        for click in clicks:
+            self.assertFalse(calibrator.add_onset(click + 0.03, 878.0))  # Bucle altavoz -> micrófono
+            self.assertTrue(calibrator.add_onset(click + 0.1, 392.0))  # Cuerda G
+        
+        self.assertEqual(len(calibrator.onsets), len(clicks))
+        self.assertAlmostEqual(calibrator.compute_offset()['offset'], 0.1, delta=0.001)
+    
+    def test_not_enough_onsets(self):
+        """Test sin suficientes onsets no hay resultado"""
+        calibrator = LatencyCalibrator([1.0, 2.0, 3.0, 4.0])
+        calibrator.add_onset(1.05)
+        self.assertIsNone(calibrator.compute_offset())
+    
+    def test_profile_persistence(self):
+        """Test guardar y leer offset por dispositivo"""
+        import tempfile
+        from pathlib import Path
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = LatencyProfileStore(Path(tmp) / "latency.json")
+            self.assertEqual(store.get_offset("USB Mic"), 0.0)
+            
+            store.save_offset("USB Mic", {'offset': 0.042, 'jitter': 0.003, 'matches': 10})
+            self.assertAlmostEqual(store.get_offset("USB Mic"), 0.042)
+            self.assertEqual(store.get_offset("Otro"), 0.0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Tests para la escritura atómica en segundo plano
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.music.background_writer import BackgroundWriter, atomic_write
+from src.music.tablature_manager import TablatureManager
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Tests para atomic_write, BackgroundWriter y su uso en TablatureManager"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp.name)
+        self.writer = BackgroundWriter(max_pending=4, fsync=False)
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def test_failed_replace_keeps_previous_file(self):
+        """Test un fallo a mitad de escritura no deja archivos parciales"""
+        target = self.folder / "tab.ukt"
+        atomic_write(target, b"original")
+
+        with mock.patch("src.music.background_writer.os.replace", side_effect=OSError("corte")):
+            with self.assertRaises(OSError):
+                atomic_write(target, b"nuevo contenido")
+
+        self.assertEqual(target.read_bytes(), b"original")
+        self.assertEqual(os.listdir(self.folder), ["tab.ukt"])
+
+    def test_futures_report_result_and_errors(self):
+        """Test submit devuelve futures con la ruta o la excepción"""
+        done = []
+        ok = self.writer.submit(self.folder / "a.bin", b"abc", on_done=done.append)
+        bad = self.writer.submit(self.folder / "no_existe" / "b.bin", b"abc")
+
+        self.assertEqual(ok.result(timeout=5), self.folder / "a.bin")
+        self.assertIsInstance(bad.exception(timeout=5), OSError)
+        self.assertEqual(done, [self.folder / "a.bin"])
+
+    def test_async_saves_through_manager(self):
+        """Test guardados en lote: futures, lecturas consistentes y catálogo"""
+        manager = TablatureManager(self.folder, writer=self.writer)
+        futures = [manager.save_tablature_async("cancion", track, [(60, 0.0, 1.0)])
+                   for track in range(20)]
+
+        # Leer una tablatura encolada espera a su escritura
+        self.assertEqual(len(manager.load_tablature("cancion_track19_oct+0")["notes"]), 1)
+
+        self.assertEqual(futures[0].result(timeout=5), "cancion_track0_oct+0.ukt")
+        manager.flush()
+        self.assertEqual(len(manager.get_saved_tablatures()), 20)
+        self.assertEqual(len(TablatureManager(self.folder, writer=self.writer).catalog.get_names()), 20)
+        self.assertFalse([name for name in os.listdir(self.folder) if name.endswith('.tmp')])
+
+    def test_catalog_written_once_per_batch(self):
+        """Test el catálogo se escribe al final del lote y sus fallos no anulan el guardado"""
+        manager = TablatureManager(self.folder, writer=self.writer)
+        with mock.patch.object(manager.catalog, 'save', wraps=manager.catalog.save) as save:
+            futures = [manager.save_tablature_async("cancion", track, [(60, 0.0, 1.0)])
+                       for track in range(10)]
+            for future in futures:
+                future.result(timeout=5)
+            manager.flush()
+            self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(TablatureManager(self.folder, writer=self.writer).catalog.get_names()), 10)
+
+        # El archivo llegó a disco: el error del catálogo se informa aparte
+        with mock.patch.object(manager.catalog, 'update', side_effect=OSError("catálogo")):
+            self.assertEqual(manager.save_tablature("otra", 0, [(60, 0.0, 1.0)]), "otra_track0_oct+0.ukt")
+        self.assertIn("otra_track0_oct+0", manager.get_saved_tablatures())
+
+
+if __name__ == '__main__':
+    unittest.main()
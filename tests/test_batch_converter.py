@@ -0,0 +1,91 @@
+"""
+Tests para el conversor por lotes de MIDI a tablaturas
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pretty_midi
+
+from src.music.batch_converter import convert_folder, find_midi_files, select_melodic_tracks
+from src.music.tablature_manager import TablatureManager
+
+
+def write_midi(path, melody_pitch=48):
+    """MIDI con batería, bajo y una melodía grave (una octava por debajo del ukulele)"""
+    midi = pretty_midi.PrettyMIDI(initial_tempo=100)
+    for program, is_drum, pitch, count in ((0, True, 38, 16), (33, False, 40, 20),
+                                           (0, False, melody_pitch, 12)):
+        instrument = pretty_midi.Instrument(program=program, is_drum=is_drum)
+        for i in range(count):
+            start = 1.0 + i * 0.25
+            instrument.notes.append(pretty_midi.Note(90, pitch + i % 5, start, start + 0.2))
+        midi.instruments.append(instrument)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    midi.write(str(path))
+
+
+class TestBatchConverter(unittest.TestCase):
+    """Tests para convert_folder"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.midi_root = Path(self.tmp.name) / "midi"
+        write_midi(self.midi_root / "uno.mid")
+        write_midi(self.midi_root / "rock" / "uno.mid", melody_pitch=64)
+        (self.midi_root / "rock" / "roto.midi").write_bytes(b"no es un midi")
+        self.manager = TablatureManager(Path(self.tmp.name) / "tabs")
+        self.cache_folder = Path(self.tmp.name) / "cache"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_select_melodic_tracks(self):
+        """Test descarta batería y bajo, y ordena por número de notas"""
+        tracks = [
+            {'index': 0, 'program': 0, 'is_drum': True, 'note_count': 50},
+            {'index': 1, 'program': 33, 'is_drum': False, 'note_count': 40},
+            {'index': 2, 'program': 0, 'is_drum': False, 'note_count': 10},
+            {'index': 3, 'program': 40, 'is_drum': False, 'note_count': 30},
+            {'index': 4, 'program': 0, 'is_drum': False, 'note_count': 3},
+        ]
+        self.assertEqual([t['index'] for t in select_melodic_tracks(tracks)], [3, 2])
+        # Sin melodía, el bajo es mejor que nada
+        self.assertEqual([t['index'] for t in select_melodic_tracks(tracks[:2])], [1])
+
+    def test_find_midi_files_recurses(self):
+        """Test el escaneo recorre subcarpetas"""
+        names = [path.relative_to(self.midi_root).as_posix() for path in find_midi_files(self.midi_root)]
+        self.assertEqual(names, ["rock/roto.midi", "rock/uno.mid", "uno.mid"])
+
+    def test_parallel_conversion(self):
+        """Test conversión con procesos, errores aislados y catálogo actualizado"""
+        progress = []
+        results = convert_folder(self.midi_root, self.manager, workers=2, cache_folder=self.cache_folder,
+                                 progress=lambda done, total, result: progress.append((done, total)))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(progress[-1], (3, 3))
+        by_file = {result['file']: result for result in results}
+        self.assertIsNotNone(by_file["rock__roto"]['error'])
+
+        # La melodía grave se sube una octava; la de subcarpeta no choca de nombre
+        self.assertEqual(self.manager.get_saved_tablatures(),
+                         ["rock__uno_track2_oct+0", "uno_track2_oct+1"])
+        info = self.manager.get_tablature_info("uno_track2_oct+1")
+        self.assertEqual(info['total_notes'], 12)
+        self.assertEqual(info['min_pitch'], 60)
+
+        data = self.manager.load_tablature("uno_track2_oct+1")
+        self.assertAlmostEqual(data['notes'][0]['start_time'], 0.0)
+        self.assertAlmostEqual(data['configuration']['tempo'], 100.0)
+
+        # Segunda pasada: solo se reintenta el archivo que falló
+        again = convert_folder(self.midi_root, self.manager, workers=1,
+                               cache_folder=self.cache_folder)
+        self.assertEqual([result['file'] for result in again], ["rock__roto"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests para el reloj del juego y la sincronización con el reloj de audio
+"""
+
+import unittest
+from src.utils.clock import GameClock, AudioClockSync
+
+
+class FakeTimeSource:
+    """Fuente de tiempo controlable en nanosegundos"""
+
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+    def advance(self, seconds):
+        self.ns += int(seconds * 1e9)
+
+
+class TestGameClock(unittest.TestCase):
+    """Tests para GameClock"""
+
+    def setUp(self):
+        self.source = FakeTimeSource()
+        self.clock = GameClock(time_source=self.source)
+
+    def test_start_at_negative_time(self):
+        """El reloj arranca en el tiempo indicado y avanza"""
+        self.clock.start(-4.0)
+        self.assertAlmostEqual(self.clock.now(), -4.0)
+        self.source.advance(1.5)
+        self.assertAlmostEqual(self.clock.now(), -2.5)
+
+    def test_pause_excludes_paused_time(self):
+        """El tiempo en pausa no cuenta"""
+        self.clock.start()
+        self.source.advance(1.0)
+        self.clock.pause()
+        self.source.advance(10.0)
+        self.assertAlmostEqual(self.clock.now(), 1.0)
+        self.clock.resume()
+        self.source.advance(0.5)
+        self.assertAlmostEqual(self.clock.now(), 1.5)
+
+    def test_stream_time_conversion(self):
+        """Los tiempos del stream de audio se llevan a la línea de tiempo del juego"""
+        sync = AudioClockSync()
+        self.clock.attach_audio(sync, slave=False)
+
+        self.source.advance(100.0)
+        self.clock.start()
+
+        # Stream en t=5.0 cuando el host está en 100.0 (con jitter de callback)
+        sync.observe_block(4.9, 5.0, 441, 44100, host_ns=self.source.ns + 2_000_000)
+        sync.observe_block(4.91, 5.01, 441, 44100, host_ns=self.source.ns + 15_000_000)
+
+        # El mínimo del offset descarta el jitter
+        self.assertAlmostEqual(sync.get_offset(), 95.002, places=6)
+        self.assertAlmostEqual(self.clock.stream_to_game_time(5.5), 0.502, places=6)
+
+    def test_slave_follows_audio_drift(self):
+        """Esclavizado, el reloj sigue la deriva del reloj de audio sin saltos"""
+        sync = AudioClockSync(window=1)
+        self.clock.attach_audio(sync, slave=True)
+
+        sync.observe_block(0.0, 1.0, 441, 44100, host_ns=self.source.ns)
+        self.clock.start()
+        self.assertAlmostEqual(self.clock.now(), 0.0)
+
+        # El reloj de audio avanza 0.999 s mientras el host avanza 1 s
+        self.source.advance(1.0)
+        sync.observe_block(0.0, 1.999, 441, 44100, host_ns=self.source.ns)
+        self.assertAlmostEqual(self.clock.now(), 0.999, places=6)
+
+    def test_offset_jump_is_slewed(self):
+        """Un salto del offset (el mínimo sale de la ventana) se corrige poco a poco sin retroceder"""
+        sync = AudioClockSync(window=1)
+        self.clock.attach_audio(sync, slave=True)
+
+        sync.observe_block(0.0, 1.0, 441, 44100, host_ns=self.source.ns)
+        self.clock.start()
+        self.source.advance(1.0)
+        sync.observe_block(0.0, 1.98, 441, 44100, host_ns=self.source.ns)  # Offset +20 ms
+
+        previous = self.clock.now()
+        self.assertAlmostEqual(previous, 1.0 - GameClock.DRIFT_SLEW_RATE, places=6)
+        for _ in range(200):
+            self.source.advance(0.05)
+            current = self.clock.now()
+            self.assertGreater(current, previous)
+            previous = current
+
+        # Al final se aplica la corrección completa
+        self.assertAlmostEqual(previous, 11.0 - 0.02, places=6)
+
+    def test_sample_counter_fallback(self):
+        """Sin tiempos del host API se usa el contador de samples"""
+        sync = AudioClockSync()
+        sync.observe_block(0, 0, 4410, 44100, host_ns=1_000_000_000)
+        self.assertAlmostEqual(sync.last_block_end, 0.1)
+        self.assertEqual(sync.sample_position, 4410)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests para la digitación por programación dinámica
+"""
+
+import random
+import time
+import unittest
+
+import numpy as np
+
+from src.music.fingering import (MAX_FRET, MAX_SPAN, STANDARD_TUNING, assign_fingering, fold_to_range,
+                                 fret_table)
+from src.music.tablature_generator import UkuleleTableGenerator
+
+
+def hand_movement(frets):
+    """Suma de desplazamientos entre trastes pisados consecutivos"""
+    fretted = [fret for fret in frets if fret > 0]
+    return sum(abs(a - b) for a, b in zip(fretted, fretted[1:]))
+
+
+class TestFingering(unittest.TestCase):
+    """Tests para assign_fingering"""
+
+    def assertPlayable(self, pitches, strings, frets):
+        for pitch, string, fret in zip(pitches, strings.tolist(), frets.tolist()):
+            self.assertEqual((STANDARD_TUNING[string] + fret - pitch) % 12, 0)
+            self.assertGreaterEqual(fret, 0)
+
+    def test_chord_uses_distinct_strings(self):
+        """Test las notas de un acorde van en cuerdas distintas y apertura acotada"""
+        pitches = [60, 64, 67, 72]  # C mayor (C4 E4 G4 C5)
+        starts = [0.0, 0.01, 0.0, 0.02]
+        strings, frets = assign_fingering(pitches, starts)
+
+        self.assertPlayable(pitches, strings, frets)
+        self.assertEqual(len(set(strings.tolist())), 4)
+
+        # Agrupación explícita: mismo evento = acorde aunque haya 80 ms de diferencia
+        grouped, _ = assign_fingering([69, 69], [0.0, 0.08], events=[3, 3])
+        self.assertEqual(len(set(grouped.tolist())), 2)
+        fretted = [fret for fret in frets.tolist() if fret > 0]
+        self.assertLessEqual(max(fretted) - min(fretted), MAX_SPAN)
+
+    def test_less_movement_than_nearest_string(self):
+        """Test la mano se mueve menos que eligiendo siempre el traste más bajo"""
+        rng = random.Random(7)
+        pitches = [rng.randint(60, 84) for _ in range(300)]
+        starts = [i * 0.25 for i in range(len(pitches))]
+        strings, frets = assign_fingering(pitches, starts)
+        self.assertPlayable(pitches, strings, frets)
+
+        naive = []
+        for pitch in pitches:
+            naive.append(min(pitch - open_pitch for open_pitch in STANDARD_TUNING if pitch >= open_pitch))
+        self.assertLess(hand_movement(frets.tolist()), hand_movement(naive))
+
+    def test_input_order_and_folding(self):
+        """Test el resultado sigue el orden de entrada y se pliegan las octavas"""
+        pitches = [72, 40, 100, 64]
+        starts = [1.5, 0.0, 3.0, 0.5]  # Desordenadas
+        strings, frets = assign_fingering(pitches, starts)
+        self.assertPlayable(pitches, strings, frets)
+
+        folded = fold_to_range(np.array(pitches), 60, 88).tolist()
+        self.assertEqual(folded, [72, 64, 88, 64])
+        self.assertEqual(len(assign_fingering([], [])[0]), 0)
+
+    def test_long_song_is_fast(self):
+        """Test una canción larga se digita en poco tiempo y el generador lo usa"""
+        rng = np.random.default_rng(3)
+        pitches = rng.integers(55, 90, 20000)
+        starts = np.repeat(np.arange(10000) * 0.2, 2)  # Díadas
+        begin = time.perf_counter()
+        strings, frets = assign_fingering(pitches, starts)
+        self.assertLess(time.perf_counter() - begin, 5.0)
+        self.assertPlayable(pitches, strings, frets)
+
+        generator = UkuleleTableGenerator()
+        notes = [(60, 0.0, 0.5), (64, 0.5, 1.0), (67, 1.0, 1.5)]
+        self.assertEqual(generator.assign_fingering(notes), [('C', 0), ('E', 0), ('G', 0)])
+
+    def test_fret_table_shared_and_read_only(self):
+        """Test la tabla de trastes se crea una vez por afinación y no se puede modificar"""
+        table = fret_table(STANDARD_TUNING)
+        self.assertEqual(table.shape, (128, 4))
+        self.assertIs(fret_table(list(STANDARD_TUNING)), table)
+        self.assertIsNot(fret_table((62, 67, 71, 76)), table)
+        with self.assertRaises(ValueError):
+            table[60, 0] = 3
+
+        self.assertEqual(table[60].tolist(), [-1, 0, -1, -1])
+        self.assertEqual(table[69].tolist(), [2, 9, 5, 0])
+        self.assertEqual(table[60 + MAX_FRET + 1, 1], -1)
+
+        first, second = UkuleleTableGenerator(), UkuleleTableGenerator()
+        self.assertIs(first.fret_table, second.fret_table)
+        self.assertEqual(first.get_positions(64), [('C', 4), ('E', 0)])
+        self.assertEqual(first.get_positions(30), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
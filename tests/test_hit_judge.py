@@ -0,0 +1,67 @@
+"""
+Tests para el motor de juicio de notas
+"""
+
+import unittest
+from src.game.hit_judge import HitJudge
+
+
+WINDOWS = {'perfect': 0.05, 'good': 0.1, 'ok': 0.2, 'cents': 50}
+
+
+def make_notes(*pairs):
+    """Crea notas a partir de pares (start_time, pitch)"""
+    return [{'start_time': start, 'end_time': start + 0.25, 'pitch': pitch}
+            for start, pitch in pairs]
+
+
+class TestHitJudge(unittest.TestCase):
+    """Tests para HitJudge"""
+
+    def test_grades_by_time_error(self):
+        """Test PERFECT/GOOD/OK según el error de tiempo"""
+        judge = HitJudge(make_notes((1.0, 60), (2.0, 62), (3.0, 64)), windows=WINDOWS)
+
+        self.assertEqual(judge.judge(1.02, 60.0)['grade'], HitJudge.PERFECT)
+        self.assertEqual(judge.judge(1.92, 62.1)['grade'], HitJudge.GOOD)
+
+        judgment = judge.judge(3.15, 64.0)
+        self.assertEqual(judgment['grade'], HitJudge.OK)
+        self.assertAlmostEqual(judgment['time_error'], 0.15)
+
+    def test_rejects_wrong_pitch_and_outside_window(self):
+        """Test detecciones fuera de afinación o de tiempo no acierta"""
+        judge = HitJudge(make_notes((1.0, 60)), windows=WINDOWS)
+
+        self.assertIsNone(judge.judge(1.0, 61.0))  # 100 cents
+        self.assertIsNone(judge.judge(1.3, 60.0))  # Fuera de la ventana OK
+        self.assertIsNotNone(judge.judge(1.0, 60.4))  # 40 cents
+
+    def test_each_note_judged_once(self):
+        """Test una nota acertada no vuelve a emparejarse"""
+        judge = HitJudge(make_notes((1.0, 60), (1.1, 60)), windows=WINDOWS)
+
+        first = judge.judge(1.0, 60.0)
+        second = judge.judge(1.0, 60.0)
+        third = judge.judge(1.0, 60.0)
+
+        self.assertEqual(first['index'], 0)
+        self.assertEqual(second['index'], 1)
+        self.assertIsNone(third)
+
+    def test_expire_reports_misses(self):
+        """Test las notas no acertadas expiran tras la ventana OK"""
+        judge = HitJudge(make_notes((1.0, 60), (2.0, 62), (3.0, 64)), windows=WINDOWS)
+        judge.judge(2.0, 62.0)
+
+        self.assertEqual(judge.expire(1.1), [])
+        missed = judge.expire(2.5)
+        self.assertEqual([note['pitch'] for note in missed], [60])
+
+        missed = judge.expire(10.0)
+        self.assertEqual([note['pitch'] for note in missed], [64])
+        self.assertTrue(judge.is_finished())
+
+
+if __name__ == '__main__':
+    unittest.main()
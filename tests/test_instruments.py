@@ -0,0 +1,86 @@
+"""
+Tests para los perfiles de instrumento y su uso en el pipeline
+"""
+
+import tempfile
+import unittest
+
+from src.audio.frequency_analyzer import FrequencyAnalyzer
+from src.music.instruments import INSTRUMENTS, get_instrument
+from src.music.midi_loader import MIDILoader
+from src.music.tablature_generator import UkuleleTableGenerator
+from src.music.tablature_manager import TablatureManager
+from src.utils import config
+from src.utils.helpers import frequency_to_note
+
+
+class TestInstruments(unittest.TestCase):
+    """Tests para el registro de instrumentos"""
+
+    def test_soprano_matches_legacy_constants(self):
+        """Test el perfil por defecto reproduce la configuración GCEA de siempre"""
+        soprano = get_instrument()
+        self.assertEqual(soprano.name, 'soprano')
+        self.assertEqual((soprano.min_frequency, soprano.max_frequency), (130, 1320))
+        self.assertEqual((soprano.min_pitch, soprano.max_pitch), (60, 88))
+        self.assertEqual(config.UKULELE_STRINGS, {'G4': 392.0, 'C4': 261.63, 'E4': 329.63, 'A4': 440.0})
+
+        notes = config.NOTE_FREQUENCIES
+        self.assertEqual((next(iter(notes)), list(notes)[-1], len(notes)), ('C3', 'E6', 41))
+        self.assertEqual(notes['F#4'], 369.99)
+
+    def test_registry_and_cached_tables(self):
+        """Test perfiles registrados, error con nombres desconocidos y tablas compartidas"""
+        self.assertTrue({'soprano', 'low_g', 'tenor', 'baritone', 'guitar'} <= set(INSTRUMENTS))
+        with self.assertRaises(ValueError):
+            get_instrument('banjo')
+
+        baritone = get_instrument('baritone')
+        self.assertIs(get_instrument(baritone), baritone)
+        self.assertIs(baritone.fret_table(), baritone.fret_table())
+        self.assertIs(baritone.note_frequencies(), baritone.note_frequencies())
+        self.assertEqual(baritone.fret_table()[50].tolist(), [0, -1, -1, -1])
+        self.assertEqual(get_instrument('guitar').fret_table().shape, (128, 6))
+
+    def test_detection_band(self):
+        """Test la banda de detección y las notas posibles siguen al instrumento"""
+        guitar = get_instrument('guitar')
+        analyzer = FrequencyAnalyzer(instrument='guitar')
+        self.assertEqual((analyzer.min_freq, analyzer.max_freq),
+                         (guitar.min_frequency, guitar.max_frequency))
+        self.assertEqual(FrequencyAnalyzer().min_freq, config.MIN_FREQUENCY)
+
+        self.assertIsNone(frequency_to_note(82.41)[0])  # E2 queda fuera del ukulele
+        self.assertEqual(frequency_to_note(82.41, guitar.note_frequencies())[0], 'E2')
+
+    def test_baritone_pipeline(self):
+        """Test rango, nombre, formato UI y tablatura de texto para barítono"""
+        loader = MIDILoader(use_cache=False)
+        notes = [(38, 0.0, 0.5), (43, 0.5, 1.0), (47, 1.0, 1.5)]
+        fitted, octaves = loader.adjust_to_ukulele_range(notes, 'baritone')
+        self.assertEqual((octaves, fitted[0][0]), (1, 50))
+        self.assertEqual(loader.adjust_to_ukulele_range(notes)[1], 2)
+
+        name, data = TablatureManager.build_tablature_data('cancion', 0, fitted, octaves,
+                                                           instrument='baritone')
+        self.assertEqual(name, 'cancion_track0_oct+1_baritone')
+        self.assertEqual(data['configuration']['instrument'], 'baritone')
+
+        with tempfile.TemporaryDirectory() as folder:
+            manager = TablatureManager(folder)
+            ui = manager.export_to_ui_format(data)
+            legacy = dict(data, configuration={'octaves_transposed': 1, 'tempo': 120})
+            legacy_ui = manager.export_to_ui_format(legacy)
+
+        self.assertEqual(ui['instrument'], 'baritone')
+        self.assertEqual(list(ui['strings']), ['D', 'G', 'B', 'E'])
+        self.assertEqual([note['fret'] for note in ui['strings']['D']], [0])
+        self.assertEqual(list(legacy_ui['strings']), ['G', 'C', 'E', 'A'])
+
+        tab = UkuleleTableGenerator('guitar').generate_tab_from_notes(notes)
+        self.assertIn("Afinación (EADGBe):", tab)
+        self.assertTrue(any(line.startswith("e|") for line in tab.splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests para la cache de notas MIDI
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.music.midi_loader import MIDILoader
+from src.music.midi_notes import MidiNotes
+
+
+MIDI_FOLDER = Path(__file__).parent.parent / "assets" / "midi"
+
+
+class TestMidiNoteCache(unittest.TestCase):
+    """Tests para MIDILoader.load_notes y MidiNoteCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_folder = Path(self.tmp.name) / "cache"
+        self.loader = MIDILoader(MIDI_FOLDER, cache_folder=self.cache_folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_pretty_midi(self):
+        """Test pistas y notas idénticas a las de pretty_midi, en frío y desde la cache"""
+        for name in self.loader.get_midi_files():
+            midi = self.loader.load_midi(name)
+            expected_info = self.loader.get_track_info(midi)
+            expected_notes = [self.loader.get_track_notes(midi, info['index']) for info in expected_info]
+
+            # Segunda carga con otro cargador: sale del archivo de cache
+            for loader in (self.loader, MIDILoader(MIDI_FOLDER, cache_folder=self.cache_folder)):
+                notes = loader.load_notes(name)
+                self.assertIsInstance(notes, MidiNotes)
+                self.assertEqual(loader.get_track_info(notes), expected_info)
+                self.assertEqual([loader.get_track_notes(notes, info['index']) for info in expected_info],
+                                 expected_notes)
+                self.assertAlmostEqual(notes.initial_tempo, midi.get_tempo_changes()[1][0])
+
+    def test_hits_skip_parsing(self):
+        """Test una carga repetida no parsea el archivo"""
+        name = self.loader.get_midi_files()[0]
+        self.loader.load_notes(name)
+        self.assertEqual((self.loader.cache.hits, self.loader.cache.misses), (0, 1))
+
+        loader = MIDILoader(MIDI_FOLDER, cache_folder=self.cache_folder)
+        loader._parse_notes = lambda path: self.fail("no debería parsear")
+        loader.load_notes(name)
+        self.assertEqual(loader.cache.hits, 1)
+
+    def test_keyed_by_content(self):
+        """Test una copia con otro nombre acierta; un archivo dañado en cache se regenera"""
+        source = sorted(MIDI_FOLDER.glob("*.mid"))[0]
+        copy_folder = Path(self.tmp.name) / "midi"
+        copy_folder.mkdir()
+        shutil.copy(source, copy_folder / "copia.mid")
+
+        self.loader.load_notes(source.stem)
+        loader = MIDILoader(copy_folder, cache_folder=self.cache_folder)
+        self.assertIsNotNone(loader.load_notes("copia"))
+        self.assertEqual(loader.cache.hits, 1)
+
+        for entry in self.cache_folder.rglob("*.npz"):
+            entry.write_bytes(b"basura")
+        loader = MIDILoader(copy_folder, cache_folder=self.cache_folder)
+        self.assertGreater(len(loader.get_track_info(loader.load_notes("copia"))), 0)
+        self.assertEqual(loader.cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
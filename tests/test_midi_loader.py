@@ -0,0 +1,74 @@
+"""
+Tests para el listado perezoso de MIDILoader
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.music.midi_loader import MIDILoader
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MIDI_FOLDER = PROJECT_ROOT / "assets" / "midi"
+
+
+class TestMidiLoaderScan(unittest.TestCase):
+    """Tests para el escaneo de carpetas y la importación diferida"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp.name) / "midi"
+        (self.folder / "rock").mkdir(parents=True)
+        self.source = sorted(MIDI_FOLDER.glob("*.mid"))[0]
+        shutil.copy(self.source, self.folder / "uno.mid")
+        shutil.copy(self.source, self.folder / "rock" / "dos.midi")
+        shutil.copy(self.source, self.folder / "rock" / "tres.Mid")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_import_does_not_load_pretty_midi(self):
+        """Test importar el cargador y leer notas no importa pretty_midi"""
+        code = (
+            "import sys; sys.path.insert(0, 'src')\n"
+            "from music.midi_loader import MIDILoader\n"
+            f"loader = MIDILoader({str(MIDI_FOLDER)!r}, use_cache=False)\n"
+            "loader.load_notes(loader.get_midi_files()[0])\n"
+            "print('pretty_midi' in sys.modules)\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "False")
+
+    def test_lazy_and_incremental_listing(self):
+        """Test la carpeta se lista al usarse y se relista solo si cambia"""
+        loader = MIDILoader(self.folder)
+        self.assertIsNone(loader._files)
+        self.assertEqual(loader.get_midi_files(), ["uno"])
+
+        listing = loader.midi_files
+        self.assertIs(loader.midi_files, listing)  # Sin cambios: misma lista
+
+        shutil.copy(self.source, self.folder / "tres.mid")
+        stat = os.stat(self.folder)
+        os.utime(self.folder, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(loader.get_midi_files(), ["tres", "uno"])
+
+    def test_recursive_names_load(self):
+        """Test el modo recursivo nombra por ruta relativa y carga esos nombres"""
+        loader = MIDILoader(self.folder, recursive=True, use_cache=False)
+        self.assertEqual(loader.get_midi_files(), ["rock/dos", "rock/tres", "uno"])
+        self.assertIsNotNone(loader.load_notes("rock/dos"))
+        self.assertIsNotNone(loader.load_notes("rock/tres"))  # Extensión en mayúsculas
+
+        shutil.rmtree(self.folder / "rock")
+        self.assertEqual(loader.get_midi_files(), ["uno"])
+
+
+if __name__ == '__main__':
+    unittest.main()
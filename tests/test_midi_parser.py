@@ -0,0 +1,108 @@
+"""
+Tests para el lector rápido de MIDI (comparado con pretty_midi)
+"""
+
+import io
+import struct
+import unittest
+from pathlib import Path
+
+import mido
+import numpy as np
+import pretty_midi
+
+from src.music.midi_notes import MidiNotes
+from src.music.midi_parser import MidiParseError, parse_midi_bytes
+
+
+MIDI_FOLDER = Path(__file__).parent.parent / "assets" / "midi"
+
+
+def smf(*tracks, resolution=96):
+    """Archivo SMF tipo 1 a partir de los bytes de cada pista"""
+    chunks = [b'MThd' + struct.pack('>IhhH', 6, 1, len(tracks), resolution)]
+    for events in tracks:
+        chunks.append(b'MTrk' + struct.pack('>I', len(events)) + events)
+    return b''.join(chunks)
+
+
+class TestMidiParser(unittest.TestCase):
+    """Tests para parse_midi_bytes"""
+
+    def assertSameNotes(self, data):
+        expected = MidiNotes.from_pretty_midi(pretty_midi.PrettyMIDI(io.BytesIO(data)))
+        notes = parse_midi_bytes(data)
+
+        self.assertEqual(notes.tracks, expected.tracks)
+        for name in ('pitch', 'start', 'end', 'offsets', 'tempo_times', 'tempi'):
+            np.testing.assert_array_equal(getattr(notes, name), getattr(expected, name), err_msg=name)
+        return notes
+
+    def test_corpus_matches_pretty_midi(self):
+        """Test los MIDI del proyecto dan exactamente el mismo resultado"""
+        for path in sorted(MIDI_FOLDER.glob("*.mid")):
+            with self.subTest(path.name):
+                self.assertSameNotes(path.read_bytes())
+
+    def test_tempo_changes_programs_and_channels(self):
+        """Test cambios de tempo, programas, percusión y notas superpuestas"""
+        midi = mido.MidiFile(ticks_per_beat=480)
+        conductor = mido.MidiTrack([
+            mido.MetaMessage('set_tempo', tempo=600000, time=0),
+            mido.MetaMessage('set_tempo', tempo=400000, time=960),
+            mido.MetaMessage('set_tempo', tempo=400000, time=100),  # Repetido: se ignora
+            mido.MetaMessage('set_tempo', tempo=750000, time=500),
+        ])
+        melody = mido.MidiTrack([mido.MetaMessage('track_name', name='Melodía', time=0)])
+        for i in range(40):
+            melody.append(mido.Message('note_on', note=60 + i % 12, velocity=80, time=120))
+            melody.append(mido.Message('note_on', note=64, velocity=70, channel=1, time=0))
+            melody.append(mido.Message('note_off', note=60 + i % 12, time=100))
+            melody.append(mido.Message('note_on', note=64, velocity=0, channel=1, time=20))
+            if i == 20:
+                melody.append(mido.Message('program_change', program=40, time=0))
+        drums = mido.MidiTrack([
+            mido.Message('note_on', channel=9, note=38, velocity=100, time=10),
+            mido.Message('note_on', channel=9, note=38, velocity=100, time=30),  # Doble note-on
+            mido.Message('note_off', channel=9, note=38, time=30),
+            mido.Message('note_off', channel=9, note=40, time=5),  # Note-off sin note-on
+        ])
+        midi.tracks.extend([conductor, melody, drums])
+
+        buffer = io.BytesIO()
+        midi.save(file=buffer)
+        notes = self.assertSameNotes(buffer.getvalue())
+        self.assertEqual(len(notes.tempi), 3)
+
+    def test_running_status_and_same_tick_retrigger(self):
+        """Test running status, sysex y note-off/note-on en el mismo tick"""
+        track = bytes([
+            0x00, 0xFF, 0x03, 0x03]) + b'Uke' + bytes([
+            0x00, 0xF0, 0x03, 0x7E, 0x01, 0xF7,         # Sysex
+            0x00, 0x90, 60, 100,                        # note-on C4
+            0x10, 62, 100,                              # Running status: note-on D4
+            0x10, 60, 0,                                # note-off C4 (velocidad 0)
+            0x00, 60, 90,                               # Re-ataque en el mismo tick
+            0x20, 0xB0, 7, 100,                         # Control change
+            0x00, 62, 0,                                # Running status de 0xB0 (CC)
+            0x10, 0x80, 62, 0,                          # note-off D4
+            0x10, 60, 0,                                # note-off C4
+            0x00, 0xFF, 0x2F, 0x00,
+        ])
+        notes = self.assertSameNotes(smf(track))
+        self.assertEqual(notes.tracks[0]['name'], 'Uke')
+        self.assertEqual(notes.pitch.tolist(), [60, 62, 60])
+
+    def test_rejects_unsupported(self):
+        """Test errores propios para lo que no se interpreta"""
+        with self.assertRaises(MidiParseError):
+            parse_midi_bytes(b"no es un midi")
+        with self.assertRaises(MidiParseError):
+            parse_midi_bytes(smf(bytes([0x00, 0x90, 60, 100, 0x10]))[:-1] + b'')
+        smpte = smf(bytes([0x00, 0xFF, 0x2F, 0x00]), resolution=0xE728)
+        with self.assertRaises(MidiParseError):
+            parse_midi_bytes(smpte)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests para las transformaciones vectorizadas de notas
+"""
+
+import unittest
+
+import numpy as np
+
+from src.music import note_array
+from src.music.midi_loader import MIDILoader
+
+
+def fit_loop(notes, low=60, high=88):
+    """Ajuste octava a octava (implementación anterior) como referencia"""
+    pitches = [pitch for pitch, _, _ in notes]
+    octaves = 0
+    if max(pitches) < low:
+        while max(pitches) < low:
+            octaves += 1
+            pitches = [min(127, pitch + 12) for pitch in pitches]
+    elif min(pitches) > high:
+        while min(pitches) > high:
+            octaves -= 1
+            pitches = [max(0, pitch - 12) for pitch in pitches]
+    return pitches, octaves
+
+
+class TestNoteArray(unittest.TestCase):
+    """Tests para note_array y su uso desde MIDILoader"""
+
+    def setUp(self):
+        self.loader = MIDILoader(use_cache=False)
+
+    def test_closed_form_matches_loop(self):
+        """Test octaves_to_fit da lo mismo que transponer octava a octava"""
+        for low_pitch in range(0, 128, 3):
+            for span in (0, 5, 12, 30):
+                high_pitch = min(low_pitch + span, 127)
+                notes = [(low_pitch, 0.0, 0.5), (high_pitch, 0.5, 1.0)]
+                pitches, octaves = fit_loop(notes)
+
+                array, fitted = note_array.fit_to_range(note_array.from_tuples(notes))
+                self.assertEqual(fitted, octaves, (low_pitch, high_pitch))
+                self.assertEqual(array['pitch'].tolist(), pitches)
+
+    def test_loader_accepts_arrays(self):
+        """Test transponer, ajustar y recortar dan lo mismo con listas y arrays"""
+        notes = [(40, 2.0, 2.5), (47, 2.5, 3.0), (43, 3.25, 4.0)]
+        array = note_array.from_tuples(notes)
+
+        trimmed = self.loader.trim_silence(array)
+        self.assertEqual(note_array.to_tuples(trimmed), self.loader.trim_silence(notes))
+        self.assertEqual(array['start'][0], 2.0)  # El original no se modifica
+
+        fitted, octaves = self.loader.adjust_to_ukulele_range(trimmed)
+        expected, expected_octaves = self.loader.adjust_to_ukulele_range(self.loader.trim_silence(notes))
+        self.assertEqual((note_array.to_tuples(fitted), octaves), (expected, expected_octaves))
+        self.assertEqual(octaves, 2)
+
+        self.assertEqual(note_array.to_tuples(self.loader.transpose_notes(array, 9)),
+                         self.loader.transpose_notes(notes, 9))
+        self.assertEqual(self.loader.get_notes_range(array), (40, 47))
+
+    def test_empty(self):
+        """Test listas y arrays vacíos no fallan"""
+        empty = np.empty(0, dtype=note_array.NOTE_DTYPE)
+        self.assertEqual(self.loader.adjust_to_ukulele_range([]), ([], 0))
+        self.assertEqual(len(self.loader.adjust_to_ukulele_range(empty)[0]), 0)
+        self.assertEqual(len(self.loader.trim_silence(empty)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
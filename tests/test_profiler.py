@@ -0,0 +1,72 @@
+"""
+Tests para la instrumentación de frames
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.profiler import FrameProfiler
+
+
+class FakeTimeSource:
+    """Fuente de tiempo controlable en nanosegundos"""
+
+    def __init__(self):
+        self.ns = 0
+
+    def __call__(self):
+        return self.ns
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Tests para FrameProfiler"""
+
+    def setUp(self):
+        self.source = FakeTimeSource()
+        self.profiler = FrameProfiler(span_capacity=8, frame_capacity=4, time_source=self.source)
+
+    def _frame(self, update_ms, render_ms):
+        self.profiler.begin_frame()
+        with self.profiler.span('update'):
+            self.source.ns += int(update_ms * 1e6)
+        with self.profiler.span('render'):
+            self.source.ns += int(render_ms * 1e6)
+        self.profiler.end_frame()
+
+    def test_stage_and_frame_stats(self):
+        """Test percentiles de frame y promedios por etapa"""
+        for _ in range(3):
+            self._frame(2, 8)
+        self._frame(2, 38)
+
+        stats = self.profiler.get_stats()
+        self.assertAlmostEqual(stats['frame_p50'], 10.0)
+        self.assertAlmostEqual(stats['frame_max'], 40.0)
+        self.assertAlmostEqual(stats['stages']['update'], 2.0)
+        self.assertAlmostEqual(stats['stages']['render'], 15.5)
+
+    def test_ring_buffer_keeps_latest(self):
+        """Test el buffer circular conserva solo los frames más recientes"""
+        for ms in range(1, 7):
+            self._frame(0, ms)
+
+        self.assertEqual(list(self.profiler.get_frame_times_ms()), [3.0, 4.0, 5.0, 6.0])
+
+    def test_chrome_trace_export(self):
+        """Test exportación en formato Chrome trace"""
+        self._frame(1, 2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.profiler.export_chrome_trace(Path(tmp) / "trace.json")
+            with open(path, 'r', encoding='utf-8') as f:
+                events = json.load(f)['traceEvents']
+
+        names = [event['name'] for event in events]
+        self.assertEqual(names, ['frame', 'update', 'render'])
+        self.assertEqual(events[0]['dur'], 3000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests para la grabación y reproducción de replays
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.audio.recorded_source import RecordedAudioSource
+from src.game.hit_judge import HitJudge
+from src.game.replay import ReplayWriter, ReplayPlayer, MISS, notes_to_metadata, prune_replays
+from src.game.simulation import DETECTION_LATENCY, HeadlessSimulation, synthesize_performance
+from src.music.tablature_manager import TablatureManager
+
+
+WINDOWS = {'perfect': 0.05, 'good': 0.1, 'ok': 0.2, 'cents': 50}
+NOTES = [{'start_time': t, 'end_time': t + 0.25, 'pitch': p, 'string': 'A', 'fret': p - 69}
+         for t, p in ((1.0, 69), (2.0, 71), (3.0, 72))]
+
+
+class TestReplay(unittest.TestCase):
+    """Tests para ReplayWriter y ReplayPlayer"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "session.ukr"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_session(self, **kwargs):
+        writer = ReplayWriter(self.path, {'windows': WINDOWS, 'latency_offset': 0.0,
+                                          'notes': notes_to_metadata(NOTES)}, **kwargs)
+        writer.record_detection(0.9, 1.03, 69.1, 0.8, True)
+        writer.record_detection(0.95, 1.05, 69.1, 0.8, False)
+        writer.record_judgment(0.9, {'grade': HitJudge.PERFECT, 'note': NOTES[0], 'index': 0,
+                                     'time_error': 0.03, 'cents_error': 10.0})
+        writer.record_key(1.5, 32, mod=1)
+        writer.record_miss(2.3, 1, NOTES[1])
+        writer.record_detection(3.1, 3.12, 72.0, 0.9, True)
+        writer.record_judgment(3.1, {'grade': HitJudge.OK, 'note': NOTES[2], 'index': 2,
+                                     'time_error': 0.12, 'cents_error': 0.0})
+        return writer
+
+    def test_round_trip_and_rejudge(self):
+        """Test los registros se leen tal cual y el rejuicio coincide"""
+        self._write_session().close(clock=3.5)
+
+        player = ReplayPlayer(self.path)
+        self.assertEqual(len(player.get_detections()), 3)
+        self.assertEqual(len(player.get_detections(onsets_only=True)), 2)
+        self.assertEqual(int(player.get_key_events()['value'][0]), 32)
+        self.assertEqual(player.get_end_clock(), 3.5)
+        self.assertEqual(player.get_recorded_outcomes(),
+                         {0: HitJudge.PERFECT, 1: MISS, 2: HitJudge.OK})
+
+        result = player.rejudge()
+        self.assertEqual(result['differences'], [])
+        self.assertEqual(result['hits'], 2)
+        self.assertEqual(result['misses'], 1)
+
+        # Con otra latencia el primer onset queda fuera de la ventana
+        self.assertIn(0, player.rejudge(latency_offset=0.3)['differences'])
+
+    def test_truncated_replay_is_readable(self):
+        """Test un replay sin cerrar ignora el registro final incompleto"""
+        writer = self._write_session()
+        writer.flush()
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01\x02\x03')
+
+        player = ReplayPlayer(self.path)
+        self.assertEqual(len(player.records), 7)
+        self.assertIsNone(player.get_end_clock())
+
+    def test_audio_track(self):
+        """Test la pista de audio crudo se guarda como float32"""
+        writer = ReplayWriter(self.path, {'notes': []}, record_audio=True)
+        writer.on_audio_block(np.ones(4), 0.1)
+        writer.on_audio_block(np.zeros(4), 0.2)
+        writer.close(clock=1.0)
+
+        player = ReplayPlayer(self.path)
+        np.testing.assert_array_equal(player.get_audio(), [1, 1, 1, 1, 0, 0, 0, 0])
+
+    def test_retention_keeps_latest_per_song(self):
+        """Test al cerrar se borran los replays más antiguos de la misma tablatura"""
+        folder = self.path.parent
+        for day in range(1, 6):
+            (folder / f"cancion_2026010{day}_120000.ukr").write_bytes(b"")
+        (folder / "cancion_20260101_120000.pcm").write_bytes(b"")
+        (folder / "cancion_baritone_20260101_120000.ukr").write_bytes(b"")  # Otra tablatura
+
+        writer = ReplayWriter(folder / "cancion_20260106_120000.ukr", {'notes': []})
+        writer.tablature_name, writer.keep_last = "cancion", 3
+        writer.close(clock=1.0)
+
+        self.assertEqual(sorted(path.name for path in folder.iterdir()), [
+            "cancion_20260104_120000.ukr", "cancion_20260105_120000.ukr",
+            "cancion_20260106_120000.ukr", "cancion_baritone_20260101_120000.ukr",
+        ])
+        self.assertEqual(prune_replays(folder, "cancion", 3), [])
+
+    def test_simulated_session_rejudges_identically(self):
+        """Test el replay de una partida completa reproduce sus juicios"""
+        name = "escala_ejemplo_track0_oct+0"
+        manager = TablatureManager()
+        ui_data = manager.export_to_ui_format(manager.load_tablature(name))
+        notes = [note for string_notes in ui_data['strings'].values() for note in string_notes]
+
+        simulation = HeadlessSimulation(name, RecordedAudioSource(synthesize_performance(notes)),
+                                        latency_offset=DETECTION_LATENCY, replay_path=self.path)
+        report = simulation.run()
+
+        result = ReplayPlayer(self.path).rejudge()
+        self.assertEqual(result['differences'], [])
+        self.assertEqual(result['hits'], report['hits'])
+        self.assertEqual(result['misses'], report['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests para el almacén de puntuaciones
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.game.score_store import ScoreStore
+
+
+def make_result(score, accuracy=90.0):
+    """Crea un resultado como los de TablatureGameMode.get_results"""
+    return {'score': score, 'accuracy': accuracy, 'max_combo': 10, 'hits': 9, 'misses': 1,
+            'grades': {'PERFECT': 5, 'GOOD': 3, 'OK': 1}}
+
+
+class TestScoreStore(unittest.TestCase):
+    """Tests para ScoreStore"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ScoreStore(Path(self.tmp.name) / "scores.db")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_top_scores_ordered_and_filtered(self):
+        """Test el top-N se ordena por score y filtra por tablatura y dificultad"""
+        for player, score in (("ana", 500), ("luis", 900), ("ana", 700), ("eva", 100)):
+            self.store.submit("cancion", player, "normal", make_result(score))
+        self.store.submit("cancion", "eva", "hard", make_result(5000))
+        self.store.submit("otra", "eva", "normal", make_result(9000))
+        self.store.flush()
+
+        top = self.store.top_scores("cancion", "normal", limit=3)
+        self.assertEqual([entry['score'] for entry in top], [900, 700, 500])
+        self.assertEqual(top[0]['player'], "luis")
+        self.assertEqual(top[0]['perfect'], 5)
+        self.assertEqual(self.store.count_results("cancion"), 5)
+
+    def test_personal_best(self):
+        """Test la mejor marca personal"""
+        self.store.submit("cancion", "ana", "normal", make_result(500))
+        self.store.submit("cancion", "ana", "normal", make_result(800, accuracy=95.0))
+        self.store.flush()
+
+        best = self.store.personal_best("cancion", "ana", "normal")
+        self.assertEqual(best['score'], 800)
+        self.assertEqual(best['accuracy'], 95.0)
+        self.assertIsNone(self.store.personal_best("cancion", "luis", "normal"))
+
+    def test_results_survive_reopen(self):
+        """Test close guarda lo pendiente en disco"""
+        self.store.submit("cancion", "ana", "normal", make_result(300))
+        self.store.close()
+
+        self.store = ScoreStore(Path(self.tmp.name) / "scores.db")
+        self.assertEqual(self.store.count_results(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests de la simulación headless del pipeline completo (detección + juicio)
+"""
+
+import tempfile
+import unittest
+from src.audio.recorded_source import RecordedAudioSource
+from src.game.simulation import DETECTION_LATENCY, HeadlessSimulation, synthesize_performance
+from src.music.tablature_manager import TablatureManager
+
+
+class TestHeadlessSimulation(unittest.TestCase):
+    """Tests para HeadlessSimulation"""
+
+    TABLATURE = "escala_ejemplo_track0_oct+0"
+
+    def _synthesized_source(self):
+        manager = TablatureManager()
+        ui_data = manager.export_to_ui_format(manager.load_tablature(self.TABLATURE))
+        notes = [note for string_notes in ui_data['strings'].values() for note in string_notes]
+        return RecordedAudioSource(synthesize_performance(notes))
+
+    def test_perfect_performance_hits_every_note(self):
+        """Test una interpretación sintetizada acierta todas las notas"""
+        simulation = HeadlessSimulation(self.TABLATURE, self._synthesized_source(),
+                                        latency_offset=DETECTION_LATENCY)
+        report = simulation.run()
+
+        self.assertEqual(report['hits'], report['total_notes'])
+        self.assertEqual(report['misses'], 0)
+        self.assertLess(report['time_error_ms']['mean_abs'], 50)
+        self.assertGreater(report['speedup'], 1.0)
+
+    def test_silence_misses_every_note(self):
+        """Test sin audio todas las notas se pierden"""
+        import numpy as np
+        simulation = HeadlessSimulation(self.TABLATURE, RecordedAudioSource(np.zeros(44100)))
+        report = simulation.run()
+
+        self.assertEqual(report['hits'], 0)
+        self.assertEqual(report['misses'], report['total_notes'])
+
+    def test_repeated_note_with_sustain(self):
+        """Test la misma nota pulsada varias veces sin silencio entre medias acierta cada ataque"""
+        with tempfile.TemporaryDirectory() as folder:
+            manager = TablatureManager(folder)
+            notes = [(69, 0.5 * i, 0.5 * (i + 1)) for i in range(6)]  # A4 sostenida, 6 ataques
+            name = manager.save_tablature('repetida', 0, notes)
+            ui_data = manager.export_to_ui_format(manager.load_tablature(name))
+            ui_notes = [note for string_notes in ui_data['strings'].values() for note in string_notes]
+
+            simulation = HeadlessSimulation(name, RecordedAudioSource(synthesize_performance(ui_notes)),
+                                            latency_offset=DETECTION_LATENCY, tab_manager=manager)
+            report = simulation.run()
+
+        self.assertEqual(report['total_notes'], 6)
+        self.assertEqual(report['hits'], 6)
+        self.assertEqual(report['misses'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests para el formato binario de tablaturas
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.music import tablature_binary
+from src.music.tablature_manager import TablatureManager
+
+
+NOTES = [(60, 0.0, 0.5), (64, 0.5, 1.0), (67, 1.0, 2.0)]
+
+
+class TestTablatureBinary(unittest.TestCase):
+    """Tests para tablature_binary y su uso en TablatureManager"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp.name)
+        self.manager = TablatureManager(self.folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_matches_json_structure(self):
+        """Test guardar en binario y cargar devuelve la estructura clásica"""
+        filename = self.manager.save_tablature("cancion", 0, NOTES, tempo=90,
+                                               metadata={"description": "ñandú"})
+        self.assertEqual(filename, "cancion_track0_oct+0.ukt")
+
+        data = self.manager.load_tablature("cancion_track0_oct+0")
+        self.assertEqual(data["configuration"]["tempo"], 90)
+        self.assertEqual(data["metadata"]["description"], "ñandú")
+        self.assertEqual([(n["pitch"], n["start_time"], n["end_time"]) for n in data["notes"]], NOTES)
+        self.assertEqual(data["notes"][1]["note_name"], "E4")
+
+    def test_memmap_columns_are_aligned_and_read_only(self):
+        """Test las columnas se mapean sin copiar y no se pueden escribir"""
+        self.manager.save_tablature("cancion", 0, NOTES)
+
+        arrays = self.manager.load_tablature_arrays("cancion_track0_oct+0")
+        self.assertEqual(len(arrays), 3)
+        np.testing.assert_array_equal(arrays.pitch, [60, 64, 67])
+        np.testing.assert_array_equal(arrays.end_time, [0.5, 1.0, 2.0])
+        self.assertFalse(arrays.start_time.flags.writeable)
+        self.assertTrue(arrays.start_time.flags.aligned)
+        self.assertEqual(arrays.metadata["statistics"]["total_notes"], 3)
+
+        # El juego digita directamente sobre las columnas: mismo formato UI
+        ui_data = self.manager.arrays_to_ui_format(arrays)
+        self.assertEqual(ui_data, self.manager.export_to_ui_format(
+            self.manager.load_tablature("cancion_track0_oct+0")))
+        self.assertEqual(ui_data["strings"]["C"][0]["start_time"], 1.0)
+
+    def test_json_import_export(self):
+        """Test JSON como formato de intercambio"""
+        self.manager.save_tablature("cancion", 0, NOTES)
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            json_path = self.manager.export_json("cancion_track0_oct+0",
+                                                 Path(export_dir) / "cancion_export.json")
+            self.manager.delete_tablature("cancion_track0_oct+0")
+            self.assertEqual(self.manager.get_saved_tablatures(), [])
+
+            name = self.manager.import_json(json_path)
+
+        self.assertEqual(name, "cancion_export")
+        self.assertTrue((self.folder / "cancion_export.ukt").exists())
+        self.assertEqual(len(self.manager.load_tablature(name)["notes"]), 3)
+
+    def test_rejects_foreign_files(self):
+        """Test un archivo que no es .ukt da ValueError"""
+        bogus = self.folder / "bogus.ukt"
+        bogus.write_bytes(b"x" * 64)
+        with self.assertRaises(ValueError):
+            tablature_binary.read(bogus)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests para la cache de tablaturas de TablatureManager
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.music.fingering import assign_fingering
+from src.music.tablature_manager import TablatureManager
+
+
+NOTES = [(60, 0.0, 0.5), (64, 0.5, 1.0)]
+
+
+class TestTablatureCache(unittest.TestCase):
+    """Tests para la cache LRU de load_tablature / export_to_ui_format"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = TablatureManager(self.tmp.name)
+        self.manager.save_tablature("cancion", 0, NOTES)
+        self.name = "cancion_track0_oct+0"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hits_return_shared_objects(self):
+        """Test cargas repetidas reutilizan datos y formato UI"""
+        data = self.manager.load_tablature(self.name)
+        self.assertIs(self.manager.load_tablature(self.name + ".ukt"), data)
+
+        ui_data = self.manager.export_to_ui_format(data)
+        self.assertIs(self.manager.export_to_ui_format(data), ui_data)
+
+        # Datos que no vienen de la cache se convierten siempre
+        copy = dict(data)
+        self.assertIsNot(self.manager.export_to_ui_format(copy), ui_data)
+
+    def test_save_and_delete_invalidate(self):
+        """Test guardar o borrar descarta la versión cacheada"""
+        data = self.manager.load_tablature(self.name)
+
+        self.manager.save_tablature("cancion", 0, NOTES + [(67, 1.0, 2.0)])
+        reloaded = self.manager.load_tablature(self.name)
+        self.assertIsNot(reloaded, data)
+        self.assertEqual(len(reloaded["notes"]), 3)
+
+        self.manager.delete_tablature(self.name)
+        self.assertIsNone(self.manager.load_tablature(self.name))
+
+    def test_external_change_misses_by_mtime(self):
+        """Test un archivo cambiado por fuera no se sirve desde la cache"""
+        data = self.manager.load_tablature(self.name)
+        os.utime(Path(self.tmp.name) / f"{self.name}.ukt", ns=(1, 1))
+        self.assertIsNot(self.manager.load_tablature(self.name), data)
+
+    def test_cache_is_bounded(self):
+        """Test la cache descarta la tablatura menos usada"""
+        self.manager.CACHE_SIZE = 2
+        for track in range(1, 4):
+            self.manager.save_tablature("cancion", track, NOTES)
+
+        first = self.manager.load_tablature("cancion_track1_oct+0")
+        self.manager.load_tablature("cancion_track2_oct+0")
+        self.manager.load_tablature("cancion_track3_oct+0")
+
+        self.assertEqual(len(self.manager._cache), 2)
+        self.assertIsNot(self.manager.load_tablature("cancion_track1_oct+0"), first)
+
+    def test_game_retry_skips_fingering(self):
+        """Test el modo juego reintenta la misma canción sin volver a digitar"""
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from src.audio.note_detector import NoteDetector
+        from src.audio.recorded_source import RecordedAudioSource
+        from src.game.tablature_mode import TablatureGameMode
+
+        pygame.font.init()
+        game = TablatureGameMode(pygame.Surface((320, 240)), tab_manager=self.manager,
+                                 note_detector=NoteDetector(RecordedAudioSource(np.zeros(4096))))
+
+        with mock.patch("src.music.tablature_manager.assign_fingering",
+                        wraps=assign_fingering) as fingering:
+            self.assertTrue(game.load_tablature(self.name))
+            first = game.current_tablature
+            self.assertTrue(game.load_tablature(self.name))
+            self.assertEqual(fingering.call_count, 1)
+            self.assertIs(game.current_tablature, first)
+
+            # Guardar de nuevo invalida también el formato UI
+            self.manager.save_tablature("cancion", 0, NOTES + [(67, 1.0, 2.0)])
+            self.assertTrue(game.load_tablature(self.name))
+            self.assertEqual(game.current_tablature['total_notes'], 3)
+            self.assertEqual(fingering.call_count, 2)
+
+        # La estructura clásica se carga aparte y reutiliza el formato UI cacheado
+        data = self.manager.load_tablature(self.name)
+        self.assertIs(self.manager.export_to_ui_format(data), game.current_tablature)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests para el catálogo de tablaturas
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import weakref
+from pathlib import Path
+
+from src.music.tablature_manager import TablatureManager
+from src.music import tablature_catalog
+from src.music.tablature_catalog import TablatureCatalog
+
+
+NOTES = [(60, 0.0, 0.5), (64, 0.5, 1.0), (67, 1.0, 2.0)]
+
+
+class TestTablatureCatalog(unittest.TestCase):
+    """Tests para TablatureCatalog"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp.name)
+        self.manager = TablatureManager(self.folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_and_delete_update_catalog(self):
+        """Test guardar y borrar mantienen el índice"""
+        self.manager.save_tablature("cancion", 0, NOTES)
+        self.manager.save_tablature("otra", 1, NOTES[:1], octaves_transposed=-1)
+
+        self.assertEqual(self.manager.get_saved_tablatures(),
+                         ["cancion_track0_oct+0", "otra_track1_oct-1"])
+
+        info = self.manager.get_tablature_info("cancion_track0_oct+0")
+        self.assertEqual(info['total_notes'], 3)
+        self.assertEqual(info['duration'], 2.0)
+        self.assertEqual((info['min_pitch'], info['max_pitch']), (60, 67))
+        self.assertEqual(len(info['hash']), 40)
+
+        self.manager.delete_tablature("otra_track1_oct-1")
+        self.assertEqual(self.manager.get_saved_tablatures(), ["cancion_track0_oct+0"])
+
+        # El catálogo en disco no aparece como tablatura
+        self.assertTrue((self.folder / TablatureCatalog.CATALOG_FILENAME).exists())
+
+    def test_reopen_reads_catalog_without_parsing(self):
+        """Test un gestor nuevo lista desde el catálogo sin abrir las tablaturas"""
+        self.manager.save_tablature("cancion", 0, NOTES)
+        self.manager.flush()  # El catálogo se escribe por lotes
+
+        catalog = TablatureManager(self.folder).catalog
+        catalog._index_file = lambda path, stat: self.fail("no debería releer " + path.name)
+        self.assertEqual(catalog.get_names(), ["cancion_track0_oct+0"])
+
+    def test_incremental_scan_detects_external_changes(self):
+        """Test el escaneo por mtime reindexa solo lo que cambió"""
+        self.manager.save_tablature("cancion", 0, NOTES)
+        self.manager.get_saved_tablatures()
+
+        # JSON copiado a mano (sin pasar por el gestor)
+        external = self.folder / "externa.json"
+        self.manager.export_json("cancion_track0_oct+0", external)
+        self.assertEqual(TablatureManager(self.folder).get_saved_tablatures(),
+                         ["cancion_track0_oct+0", "externa"])
+
+        # Modificación externa del mismo archivo
+        data = json.loads(external.read_text(encoding='utf-8'))
+        data['statistics']['total_notes'] = 99
+        external.write_text(json.dumps(data), encoding='utf-8')
+        os.utime(external, ns=(1, 1))
+
+        catalog = TablatureManager(self.folder).catalog
+        self.assertEqual(catalog.get("externa")['total_notes'], 99)
+        self.assertEqual(catalog.get("externa")['format'], ".json")
+
+        # Edición en el sitio con el mtime de la carpeta intacto: se detecta igual
+        folder_stat = self.folder.stat()
+        data['statistics']['total_notes'] = 7
+        external.write_text(json.dumps(data), encoding='utf-8')
+        os.utime(external, ns=(2, 2))
+        os.utime(self.folder, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+        self.assertEqual(catalog.get("externa")['total_notes'], 7)
+
+    def test_pending_save_runs_at_exit_without_keeping_catalog_alive(self):
+        """Test la escritura diferida se hace al salir y no retiene catálogos ya escritos"""
+        catalog = TablatureCatalog(self.folder)
+        catalog._dirty = True
+        catalog.schedule_save(delay=60)
+        timer = catalog._save_timer
+        self.assertIn(catalog, tablature_catalog._pending_saves)
+
+        tablature_catalog._save_pending_catalogs()
+        timer.join()
+        self.assertFalse(catalog._dirty)
+        self.assertNotIn(catalog, tablature_catalog._pending_saves)
+        self.assertTrue((self.folder / TablatureCatalog.CATALOG_FILENAME).exists())
+
+        ref = weakref.ref(catalog)
+        del catalog, timer
+        self.assertIsNone(ref())
+
+    def test_filter(self):
+        """Test filtros por texto, duración y rango"""
+        self.manager.save_tablature("grave", 0, [(48, 0.0, 1.0)])
+        self.manager.save_tablature("larga", 0, [(60, 0.0, 300.0)])
+        self.manager.save_tablature("normal", 0, NOTES)
+
+        catalog = self.manager.catalog
+        self.assertEqual(catalog.filter(min_pitch=60, max_duration=60), ["normal_track0_oct+0"])
+        self.assertEqual(catalog.filter(text="LAR"), ["larga_track0_oct+0"])
+        self.assertEqual(catalog.filter(midi_file="grave"), ["grave_track0_oct+0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests para la tablatura ASCII rítmica de UkuleleTableGenerator
+"""
+
+import io
+import random
+import time
+import unittest
+
+import numpy as np
+
+from src.music import note_array
+from src.music.tab_layout import TabLayout, quantize, seconds_to_beats
+from src.music.tablature_generator import UkuleleTableGenerator
+
+
+def random_song(count, seed=5):
+    rng = random.Random(seed)
+    notes = []
+    start = 0.0
+    for _ in range(count):
+        start += rng.choice([0.0, 0.125, 0.25, 0.5])
+        notes.append((rng.randint(55, 90), start, start + 0.3))
+    rng.shuffle(notes)
+    return notes
+
+
+class TestTabLayout(unittest.TestCase):
+    """Tests para la rejilla de beats y el dibujo de compases"""
+
+    def test_tempo_map(self):
+        """Test segundos -> beats con cambios de tempo"""
+        times = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_allclose(seconds_to_beats(times, tempo=90), times * 1.5)
+
+        # 120 BPM hasta 2 s (4 beats), luego 60 BPM
+        tempo_map = ([0.0, 2.0], [120.0, 60.0])
+        np.testing.assert_allclose(seconds_to_beats(times, tempo_map=tempo_map), [0, 2, 4, 5, 6])
+        # Mapa que empieza tarde: el primer tempo vale desde 0
+        np.testing.assert_allclose(seconds_to_beats([1.0, 3.0], tempo_map=([2.0], [60.0])), [1, 3])
+
+        self.assertEqual(quantize([0.0, 0.13, 0.37, 1.99, -0.1], subdivision=4).tolist(), [0, 1, 1, 8, 0])
+
+    def test_measures_and_chords(self):
+        """Test barras de compás, acordes apilados y trastes de dos cifras"""
+        layout = TabLayout(('G', 'C', 'E', 'A'),
+                           slots=[0, 2, 2, 2, 5, 9], strings=[1, 1, 2, 0, 3, 0], frets=[0, 4, 3, 12, 1, 2],
+                           beats_per_measure=2, subdivision=2, page_width=40)
+        self.assertEqual((layout.measure_count, layout.system_count), (3, 2))
+        self.assertEqual(layout.system_starts.tolist(), [0, 2, 3])
+
+        self.assertEqual(layout.render_system(0), [
+            "  1            2",
+            "G|------12----|------------|",
+            "C|0-----4-----|------------|",
+            "E|------3-----|------------|",
+            "A|------------|---1--------|",
+        ])
+        self.assertEqual(layout.render_system(1)[1], "G|---2--------|")
+
+    def test_collisions_refine_the_measure_in_order(self):
+        """Test notas seguidas en la misma cuerda y casilla: el compás se dibuja más fino, sin reordenar"""
+        layout = TabLayout(('G', 'C'), slots=[0, 1, 2, 3, 8], strings=[1, 1, 1, 1, 0],
+                           frets=[3, 5, 7, 8, 2], beats_per_measure=2, subdivision=2, max_refine=2)
+        self.assertEqual((layout.refine.tolist(), layout.dropped), ([2, 1], 0))
+        self.assertEqual(layout.render_system(0), [
+            "  1 1/16           2",
+            "G|----------------|2-------|",
+            "C|3-5-7-8---------|--------|",
+        ])
+
+    def test_simultaneous_collisions_change_string_or_drop(self):
+        """Test notas a la vez en la misma cuerda: pasan a otra cuerda libre o se omiten"""
+        args = dict(slots=[0, 0], strings=[1, 1], frets=[3, 7], beats_per_measure=1, subdivision=2)
+        dropped = TabLayout(('G', 'C'), **args)
+        self.assertEqual(dropped.dropped, 1)
+        self.assertEqual(dropped.render_system(0)[1:], ["G|----|", "C|3---|"])
+
+        moved = TabLayout(('G', 'C'), tuning=(67, 60), **args)
+        self.assertEqual(moved.dropped, 0)
+        self.assertEqual(moved.render_system(0)[1:], ["G|0---|", "C|3---|"])
+
+
+class TestTablatureRenderer(unittest.TestCase):
+    """Tests para generate_tab_from_notes, write_tab e iter_tab_pages"""
+
+    def setUp(self):
+        self.generator = UkuleleTableGenerator()
+
+    def test_timing_is_reflected(self):
+        """Test la posición de cada nota depende de su tiempo y del tempo"""
+        notes = [(60, 0.0, 0.5), (64, 0.5, 1.0), (67, 2.0, 2.5), (72, 2.0, 2.5)]
+        tab = self.generator.generate_tab_from_notes(notes, tempo=120, beats_per_measure=4)
+        self.assertIn("Compás: 4/4 | Rejilla: 1/16 | Compases: 2", tab)
+        # Beat 1 a dos columnas por semicorchea; el acorde del beat 4 abre el compás 2
+        self.assertIn("\n".join([
+            "  1                                2",
+            "G|--------------------------------|0-------------------------------|",
+            "C|0-------------------------------|--------------------------------|",
+            "E|--------0-----------------------|--------------------------------|",
+            "A|--------------------------------|3-------------------------------|",
+        ]), tab)
+
+        # Separadas más de 30 ms pero en la misma casilla: se digitan como acorde
+        chord = self.generator.layout_notes([(69, 0.0, 1.0), (69, 0.05, 1.0), (60, 0.06, 1.0)])
+        self.assertEqual(chord.cells.tolist(), [0, 0, 0])
+        self.assertEqual((len(set(chord.strings.tolist())), chord.dropped), (3, 0))
+
+        # Notas rápidas que solo caben en una cuerda: el compás pasa a 1/32, en orden
+        fast = [(60 + i % 3, i * 0.0625, i * 0.0625 + 0.06) for i in range(16)]
+        tab = self.generator.generate_tab_from_notes(fast)
+        self.assertIn("\n  1 1/32\n", tab)
+        self.assertIn("\nC|" + "-".join("012" * 5 + "0") + "-" * 33 + "|\n", tab)
+
+        slow = self.generator.generate_tab_from_notes(notes, tempo=60)
+        self.assertIn("Compases: 1", slow)
+        self.assertIn("\nE|----0---------------------------|\n", slow)
+        self.assertEqual(self.generator.generate_tab_from_notes([]), "❌ No hay notas para generar tablatura")
+
+    def test_streaming(self):
+        """Test write_tab escribe por páginas y acepta arrays de notas"""
+        notes = random_song(500)
+        expected = self.generator.generate_tab_from_notes(notes)
+
+        output = io.StringIO()
+        pages = self.generator.write_tab(note_array.from_tuples(notes), output)
+        self.assertEqual(output.getvalue(), expected)
+        self.assertEqual(pages, expected.count("[Página "))
+
+        # Solo se omiten notas simultáneas sin cuerda libre, y se cuentan en la cabecera
+        layout = self.generator.layout_notes(notes)
+        self.assertEqual(len(layout.frets) + layout.dropped, len(notes))
+        self.assertLess(layout.dropped, 10)
+        self.assertIn(f"| Omitidas: {layout.dropped}\n", expected)
+        self.assertTrue(np.all(np.diff(layout.measures) >= 0))
+
+        chunks = list(self.generator.iter_tab_pages(notes))
+        self.assertEqual(len(chunks), pages + 2)
+        self.assertTrue(all(len(chunk) < 2000 for chunk in chunks))
+        self.assertTrue(all(len(line) <= 80 for line in expected.splitlines()))
+
+    def test_long_song_is_fast(self):
+        """Test una canción muy larga se maqueta en poco tiempo"""
+        notes = random_song(50000)
+        begin = time.perf_counter()
+        pages = self.generator.write_tab(notes, io.StringIO())
+        self.assertLess(time.perf_counter() - begin, 5.0)
+        self.assertGreater(pages, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
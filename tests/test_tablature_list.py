@@ -0,0 +1,68 @@
+"""
+Tests para la lista virtualizada de tablaturas (búsqueda y paginación)
+"""
+
+import unittest
+import pygame
+
+from src.game.ui.tablature_list import TablatureList
+
+
+NAMES = [f"song_{idx:04d}_track0_oct+0" for idx in range(1000)]
+
+
+def key(code, unicode=''):
+    """Crea un evento KEYDOWN"""
+    return pygame.event.Event(pygame.KEYDOWN, key=code, mod=0, unicode=unicode)
+
+
+class TestTablatureList(unittest.TestCase):
+    """Tests para TablatureList"""
+
+    def setUp(self):
+        # 10 filas visibles + barra de búsqueda
+        self.tab_list = TablatureList(NAMES, (0, 0, 400, TablatureList.ROW_HEIGHT * 11))
+
+    def test_paging_keeps_selection_visible(self):
+        """Test la ventana visible sigue a la selección"""
+        tab_list = self.tab_list
+        self.assertEqual(tab_list.visible_rows, 10)
+
+        tab_list.handle_key(key(pygame.K_PAGEDOWN))
+        tab_list.handle_key(key(pygame.K_PAGEDOWN))
+        self.assertEqual(tab_list.selected, 20)
+        self.assertEqual(tab_list.top, 11)
+
+        tab_list.handle_key(key(pygame.K_END))
+        self.assertEqual(tab_list.get_selected(), NAMES[-1])
+        self.assertEqual(tab_list.top, 990)
+
+        tab_list.handle_key(key(pygame.K_HOME))
+        self.assertEqual((tab_list.selected, tab_list.top), (0, 0))
+
+    def test_type_to_search(self):
+        """Test escribir filtra y ESC limpia la búsqueda antes de salir"""
+        tab_list = self.tab_list
+        for char in "09 t":
+            tab_list.handle_key(key(pygame.K_a, char))
+
+        self.assertEqual(len(tab_list.matches), 10)  # song_0009, song_0109, ... ("_" se busca como espacio)
+        self.assertEqual(tab_list.get_selected(), "song_0009_track0_oct+0")
+
+        tab_list.handle_key(key(pygame.K_BACKSPACE))
+        self.assertEqual(tab_list.query, "09 ")
+        self.assertEqual(len(tab_list.matches), 10)
+
+        self.assertTrue(tab_list.handle_key(key(pygame.K_ESCAPE)))
+        self.assertEqual(len(tab_list.matches), len(NAMES))
+        self.assertEqual(tab_list.handle_key(key(pygame.K_ESCAPE)), TablatureList.BACK)
+
+    def test_no_matches(self):
+        """Test sin resultados no hay selección"""
+        self.tab_list.set_query("zzz")
+        self.assertIsNone(self.tab_list.get_selected())
+        self.assertFalse(self.tab_list.handle_key(key(pygame.K_RETURN)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Herramienta de conversión por lotes: carpeta de MIDI -> tablaturas
+Versión no interactiva de create_tablature.py para bibliotecas grandes
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from music.batch_converter import convert_folder
+from music.instruments import DEFAULT_INSTRUMENT, instrument_names
+from music.tablature_manager import TablatureManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte un árbol de archivos MIDI en tablaturas")
+    parser.add_argument("midi_folder", help="Carpeta raíz con archivos .mid/.midi (se recorre entera)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Carpeta de tablaturas (por defecto, assets/tablatures)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--max-tracks", type=int, default=1,
+                        help="Pistas melódicas a convertir por archivo")
+    parser.add_argument("--min-notes", type=int, default=8,
+                        help="Notas mínimas para considerar una pista")
+    parser.add_argument("--force", action="store_true",
+                        help="Reconvertir archivos que ya tienen tablatura")
+    parser.add_argument("--no-fsync", action="store_true",
+                        help="No forzar cada tablatura a disco (más rápido)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="No usar la cache de notas MIDI")
+    parser.add_argument("--instrument", choices=instrument_names(), default=DEFAULT_INSTRUMENT,
+                        help="Instrumento para el que se digitan las tablaturas")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Mostrar la traza completa de los errores")
+    args = parser.parse_args()
+
+    manager = TablatureManager(args.output)
+    errors = []
+    started = time.perf_counter()
+
+    def progress(done, total, result):
+        if result['error']:
+            errors.append(result)
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0
+        print(f"\r⏳ {done}/{total} archivos | {len(errors)} errores | {rate:.1f} archivos/s",
+              end="", flush=True)
+
+    results = convert_folder(
+        args.midi_folder,
+        manager=manager,
+        workers=args.workers,
+        max_tracks=args.max_tracks,
+        min_notes=args.min_notes,
+        skip_existing=not args.force,
+        fsync=not args.no_fsync,
+        use_cache=not args.no_cache,
+        instrument=args.instrument,
+        progress=progress,
+    )
+    print()
+
+    converted = sum(len(result['tablatures']) for result in results)
+    print(f"\n✅ {converted} tablaturas creadas a partir de {len(results)} archivos "
+          f"en {time.perf_counter() - started:.1f} s")
+
+    if errors:
+        print(f"\n⚠️ {len(errors)} archivos sin convertir:")
+        for result in errors:
+            print(f"   {result['file']}: {result['error']}")
+            if args.verbose and result.get('traceback'):
+                print(result['traceback'])
+
+    return 1 if errors and not converted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,7 +48,7 @@ def main():
         print("❌ Opción inválida")
     
     # Cargar MIDI
-    midi = loader.load_midi(midi_file)
+    midi = loader.load_notes(midi_file)
     if not midi:
         return
     
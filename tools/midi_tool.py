@@ -59,7 +59,7 @@ def main():
     
     # Cargar el MIDI
     print(f"\n⏳ Cargando {selected_file}...")
-    midi = loader.load_midi(selected_file)
+    midi = loader.load_notes(selected_file)
     
     if not midi:
         return
@@ -162,8 +162,10 @@ def main():
     show_full = input("\n¿Mostrar tablatura completa? (s/n): ").strip().lower()
     
     if show_full == 's':
-        full_tab = tab_generator.generate_tab_from_notes(notes, tempo=120)
-        print(full_tab)
+        # Página a página, sin construir el documento entero
+        tab_generator.write_tab(notes, sys.stdout, tempo=midi.initial_tempo,
+                                tempo_map=(midi.tempo_times, midi.tempi))
+        print()
     
     print("\n✅ ¡Herramienta completada!")
 
@@ -0,0 +1,80 @@
+"""
+Herramienta CLI para simular una partida sin ventana ni hardware de audio
+Reproduce una tablatura contra una grabación WAV/NumPy y muestra el reporte
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Agregar src al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from audio.recorded_source import RecordedAudioSource
+from game.simulation import HeadlessSimulation, synthesize_performance
+from music.tablature_manager import TablatureManager
+from utils.config import JUDGMENT_WINDOWS, DEFAULT_DIFFICULTY, SAMPLE_RATE
+
+
+def load_audio_source(args):
+    """Crea la fuente de audio según los argumentos"""
+    if args.audio is None:
+        # Sin grabación: sintetizar una interpretación perfecta de la tablatura
+        manager = TablatureManager()
+        tab_data = manager.load_tablature(args.tablature)
+        if not tab_data:
+            return None
+
+        ui_data = manager.export_to_ui_format(tab_data)
+        notes = [note for string_notes in ui_data['strings'].values() for note in string_notes]
+        return RecordedAudioSource(synthesize_performance(notes), SAMPLE_RATE)
+
+    audio_path = Path(args.audio)
+    if audio_path.suffix == '.npy':
+        return RecordedAudioSource(np.load(audio_path), args.sample_rate)
+    return RecordedAudioSource.from_wav(audio_path)
+
+
+def main():
+    """Ejecuta la simulación y emite el reporte en JSON"""
+    parser = argparse.ArgumentParser(description="Simulación headless de Ukulele Hero")
+    parser.add_argument("tablature", help="Nombre de la tablatura guardada")
+    parser.add_argument("audio", nargs="?", help="Grabación .wav o .npy (por defecto: sintetizada)")
+    parser.add_argument("--difficulty", default=DEFAULT_DIFFICULTY, choices=sorted(JUDGMENT_WINDOWS))
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE, help="Frecuencia de un .npy")
+    parser.add_argument("--audio-start", type=float, default=0.0,
+                        help="Tiempo de juego (s) del primer sample de la grabación")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia a compensar (ms)")
+    parser.add_argument("--render", action="store_true", help="Dibujar cada frame (driver dummy)")
+    parser.add_argument("--output", help="Guardar el reporte JSON en este archivo")
+    args = parser.parse_args()
+
+    source = load_audio_source(args)
+    if source is None:
+        sys.exit(1)
+
+    simulation = HeadlessSimulation(
+        args.tablature,
+        source,
+        difficulty=args.difficulty,
+        audio_start=args.audio_start,
+        latency_offset=args.latency / 1000.0,
+        render=args.render
+    )
+    report = simulation.run()
+    if report is None:
+        sys.exit(1)
+
+    report_json = json.dumps(report, indent=2, ensure_ascii=False)
+    print(report_json)
+
+    if args.output:
+        Path(args.output).write_text(report_json, encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
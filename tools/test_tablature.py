@@ -16,7 +16,7 @@ from music.tablature_generator import UkuleleTableGenerator
 def main():
     # Cargar el MIDI de ejemplo
     loader = MIDILoader()
-    midi = loader.load_midi('escala_ejemplo')
+    midi = loader.load_notes('escala_ejemplo')
     
     if not midi:
         return
@@ -24,7 +24,7 @@ def main():
     midi_file = midi_files[1] if len(midi_files) > 1 else midi_files[0]
     
     print(f"\nCargando: {midi_file}")
-    midi = loader.load_midi(midi_file)
+    midi = loader.load_notes(midi_file)
     
     if not midi:
         return